@@ -1,13 +1,7 @@
 import streamlit as st
-import yfinance as yf
-import pandas as pd
-import numpy as np
-from fpdf import FPDF
-import base64
 from datetime import datetime
-import json
+from functools import partial
 import os
-import plotly.graph_objects as go
 
 # --- 1. CONFIGURARE PAGINĂ ---
 st.set_page_config(page_title="PRIME Terminal", page_icon="🛡️", layout="wide")
@@ -39,6 +33,13 @@ def check_access_password():
 if not check_access_password():
     st.stop()
 
+# Modulele grele (pandas, nucleul PRIME) se încarcă abia după login;
+# yfinance, plotly și fpdf și mai târziu, la prima utilizare
+import pandas as pd
+from prime import data, favorites, fetch, indicators, live, metadata, metrics, ohlc, portfolio, prefetch, screener, throttle
+from prime.news import get_news_sentiment, watchlist_sentiment
+from prime.scoring import calculate_prime_score, calculate_risk_metrics, calculate_rsi, get_verdict
+
 # =========================================================
 # AICI ÎNCEPE APLICAȚIA
 # =========================================================
@@ -57,363 +58,472 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
-# --- SISTEM SALVARE (JSON) ---
-DB_FILE = "prime_favorites.json"
-
-def load_db():
-    if os.path.exists(DB_FILE):
-        try:
-            with open(DB_FILE, "r") as f:
-                return json.load(f)
-        except:
-            return {"favorites": [], "names": {}}
-    return {"favorites": [], "names": {}}
-
-def save_db(fav_list, fav_names):
-    with open(DB_FILE, "w") as f:
-        json.dump({"favorites": fav_list, "names": fav_names}, f)
-
 # --- INIȚIALIZARE STATE ---
-if 'db_loaded' not in st.session_state:
-    data = load_db()
-    st.session_state.favorites = data.get("favorites", [])
-    st.session_state.favorite_names = data.get("names", {})
-    st.session_state.db_loaded = True
+if 'watchlist' not in st.session_state:
+    st.session_state.watchlist = favorites.DEFAULT_LIST
+
+def sync_favorites():
+    # Recitim lista doar dacă baza s-a schimbat (alt admin, altă sesiune) sau s-a ales altă listă
+    fav_store = favorites.get_store()
+    if (st.session_state.get('fav_version') != fav_store.version()
+            or st.session_state.get('fav_list') != st.session_state.watchlist):
+        db = fav_store.load(st.session_state.watchlist)
+        st.session_state.favorites = db["favorites"]
+        st.session_state.favorite_names = db["names"]
+        st.session_state.fav_version = db["version"]
+        st.session_state.fav_list = st.session_state.watchlist
+
+sync_favorites()
 
 if 'active_ticker' not in st.session_state: 
     st.session_state.active_ticker = "NVDA"
 
-# --- FUNCȚII UTILITARE & CALCUL ---
+# Cronometrul rerun-ului (nu face nimic dacă instrumentarea e oprită)
+metrics.begin_run('main', st.session_state.active_ticker)
+# Termenul comun al rerun-ului pentru sursă: după el desenăm din ultimele date bune
+page_deadline = data.deadline()
 
-def calculate_rsi(data, window=14):
-    delta = data.diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-    rs = gain / loss
-    return 100 - (100 / (1 + rs))
+# --- FUNCȚII UTILITARE & CALCUL ---
 
 # --- FUNCȚIA REPARATĂ (ROBUSTĂ) ---
+def download_safe_data(ticker, period, until=None):
+    # Istoricul canonic al simbolului stă în memorie (prime.store), comun tuturor sesiunilor;
+    # perioada e doar o felie din el, deci mutarea slider-ului nu descarcă și nu copiază nimic.
+    # Sursa are un termen (`until`): dacă întârzie, primim ultimele date bune din depozit / cache
+    return data.load_stock_data(ticker, period, until)
+
 @st.cache_data(ttl=60, show_spinner=False)
-def download_safe_data(ticker, period):
-    # Această parte descarcă datele grele și le ține minte 60 secunde
-    # REPARATIE: Separăm istoric de info. Dacă info crapă, istoricul rămâne.
-    stock = yf.Ticker(ticker)
-    
-    # 1. Istoric (Critic)
-    try:
-        h = stock.history(period=period)
-    except:
-        h = pd.DataFrame()
+def download_comparison(tickers, period="1y"):
+    # Un singur download în lot pentru prețuri, `.info` în paralel
+    metrics.count('page_cache_misses_total', fn='download_comparison')
+    return fetch.fetch_many(list(tickers), period)
+
+@st.cache_resource(show_spinner=False)
+def get_live_session(ticker, interval):
+    # O singură serie intraday per (simbol, interval), comună tuturor sesiunilor
+    return live.LiveSession(ticker, interval)
+
+@st.cache_resource(show_spinner=False)
+def get_prefetcher():
+    # Un singur planificator pe procesul serverului: ține favoritele din toate listele "calde"
+    return prefetch.Prefetcher(lambda: favorites.get_store().all_tickers()).start()
+
+@st.fragment(run_every=live.REFRESH_SECONDS)
+def live_panel(ticker, interval):
+    # Doar acest fragment se re-rulează la timer; restul paginii rămâne neatins
+    session = get_live_session(ticker, interval)
+    session.refresh()
+    bars, snap = session.snapshot()
+    if bars.empty:
+        st.info("Fără bare intraday (piața e închisă sau simbolul nu are date).")
+        return
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Preț", f"${bars['Close'].iloc[-1]:.2f}")
+    c2.metric("RSI (14)", f"{snap['rsi']:.2f}")
+    c3.metric("Risc (Vol)", f"{snap['volatility']:.1f}%")
+    c4.metric("Max Drawdown", f"{snap['max_dd']:.1f}%")
+    st.line_chart(ohlc.lttb(bars['Close']))
+    st.caption(f"{snap['bars']} bare {interval} | Sharpe {snap['sharpe']:.2f} | "
+               f"{'Peste' if snap['above_sma'] else 'Sub'} SMA200 | actualizare la {live.REFRESH_SECONDS}s")
 
-    # 2. Info (Opțional dar important)
-    try:
-        i = stock.info
-    except:
-        i = {}
-        
-    return h, i
+@st.cache_data(ttl=60, show_spinner=False)
+def watchlist_news(tickers):
+    # Știrile sunt în cache 15 minute și scorurile per știre rămân în memorie: doar știrile noi costă
+    return watchlist_sentiment(tickers)
 
-def get_stock_data(ticker, period="5y"):
+@st.cache_data(show_spinner=False)
+def load_screener_results(path, mtime):
+    # `mtime` face parte din cheie: fișierul nou de la rularea de noapte invalidează cache-ul
+    return pd.read_csv(path)
+
+def get_stock_data(ticker, period="5y", until=None):
     # Aceasta este funcția principală care leagă totul
     try:
-        # 1. Recreăm obiectul rapid (pentru știri/calendar)
-        stock = yf.Ticker(ticker)
-        
-        # 2. Luăm datele grele din "seif" (cache) sau le descărcăm dacă au trecut 60s
-        history, info = download_safe_data(ticker, period)
+        # Luăm datele grele din "seif" (memorie / depozit) sau aducem doar barele noi
+        with metrics.timer('data'):
+            history, info = download_safe_data(ticker, period, until)
         
         if history is None or history.empty:
-            return None, None, None
+            return None, None
             
-        return stock, history, info
-    except:
-        return None, None, None
+        return history, info
+    except Exception:
+        return None, None
+
+def staleness_notice(ticker):
+    # Datele vechi nu se ascund: spunem de când sunt și dacă sursa e momentan ocolită
+    s = data.staleness(ticker)
+    if s['retry_in']:
+        st.warning(f"⚠️ Yahoo nu răspunde: afișăm ultimele date bune (sincronizate {data.age_label(s['history'])}). "
+                   f"Reîncercăm în {s['retry_in']:.0f}s.")
+    elif data.STALE_AFTER < s['history'] < float('inf'):
+        state = "se actualizează în fundal" if s['syncing'] or prefetch.ENABLED else "reîncarcă pagina pentru date noi"
+        st.caption(f"⏳ Date sincronizate {data.age_label(s['history'])}; {state}.")
 
-def calculate_risk_metrics(history):
-    if history.empty: return 0, 0, 0
-    
-    daily_ret = history['Close'].pct_change().dropna()
-    
-    # 1. Volatilitate
-    volatility = daily_ret.std() * np.sqrt(252) * 100
-    
-    # 2. Max Drawdown
-    max_dd = ((history['Close'] / history['Close'].cummax()) - 1).min() * 100
-    
-    # 3. Sharpe Ratio
-    risk_free_rate = 0.04
-    mean_return = daily_ret.mean() * 252
-    std_dev = daily_ret.std() * np.sqrt(252)
-    
-    if std_dev == 0: sharpe = 0
-    else: sharpe = (mean_return - risk_free_rate) / std_dev
-    
-    return volatility, max_dd, sharpe
+@st.cache_data(ttl=60, show_spinner=False)
+def chart_series(ticker, period, mode, _history):
+    # (seria redusă, rezoluția) pentru grafic, ținută separat pe (simbol, perioadă, tip de grafic).
+    # Istoricul e cel deja adus de rerun (nu intră în cheie): graficul nu mai așteaptă sursa încă o dată
+    history = _history
+    if mode == "Linie":
+        return ohlc.lttb(history['Close']), 'linie'
+    return ohlc.downsample_ohlc(history)
+
+def build_price_chart(bars, ticker):
+    # Plotly se încarcă abia când desenăm primul grafic
+    import plotly.graph_objects as go
+    if isinstance(bars, pd.Series):
+        # Linie: WebGL (Scattergl), punctele deja reduse cu LTTB
+        trace = go.Scattergl(x=bars.index, y=bars.values, mode='lines', name=ticker)
+    else:
+        # Candlestick nu are variantă WebGL în Plotly; numărul de lumânări e plafonat de ohlc.MAX_CANDLES
+        trace = go.Candlestick(
+            x=bars.index,
+            open=bars['Open'],
+            high=bars['High'],
+            low=bars['Low'],
+            close=bars['Close'],
+            name=ticker
+        )
+    fig = go.Figure(data=[trace])
+    fig.update_layout(
+        yaxis_title='Preț ($)',
+        xaxis_rangeslider_visible=False,
+        template="plotly_dark",
+        height=500,
+        margin=dict(l=0, r=0, t=20, b=0)
+    )
+    return fig
 
-def calculate_prime_score(info, history):
-    score = 0
-    reasons = []
-    
-    if not info: info = {} # Protectie daca info e gol
-    
-    # 1. TREND
-    if not history.empty:
-        if len(history) > 200:
-            sma = history['Close'].rolling(window=200).mean().iloc[-1]
-            trend_name = "SMA200"
-        else:
-            sma = history['Close'].mean()
-            trend_name = "Media Perioadei"
-            
-        current = history['Close'].iloc[-1]
-        if current > sma:
-            score += 20
-            reasons.append(f"Trend Ascendent (Peste {trend_name})")
-
-    # 2. EVALUARE
-    peg = info.get('pegRatio')
-    if peg is not None and 0 < peg < 2.0:
-        score += 20
-        reasons.append(f"Preț Bun pt Creștere (PEG: {peg:.2f})")
-    elif info.get('trailingPE', 100) < 25: 
-        score += 10
-        reasons.append("P/E Decent (<25)")
-
-    # 3. EFICIENȚĂ
-    roe = info.get('returnOnEquity', 0) or 0
-    if roe > 0.15:
-        score += 20
-        reasons.append(f"Management Eficient (ROE: {roe*100:.1f}%)")
-
-    # 4. CREȘTERE
-    rg = info.get('revenueGrowth', 0) or 0
-    if rg > 0.10: 
-        score += 20
-        reasons.append(f"Creștere Venituri: {rg*100:.1f}%")
-
-    # 5. SIGURANȚĂ
-    fcf = info.get('freeCashflow')
-    if fcf is not None and fcf > 0:
-        score += 20
-        reasons.append("Generează Cash (FCF Pozitiv)")
-    elif (info.get('totalCash', 0) > info.get('totalDebt', 0)):
-        score += 20
-        reasons.append("Bilanț Solid (Cash > Datorii)")
-
-    return score, reasons
-
-def get_news_sentiment(stock):
-    try:
-        news = stock.news
-        headlines = []
-        if news:
-            for n in news[:5]:
-                t = n.get('title', '')
-                if t and t not in headlines: headlines.append(t)
-        if not headlines: return "Neutru", ["Fara stiri recente."]
-        pos = ['beat', 'rise', 'jump', 'buy', 'growth', 'strong', 'record', 'profit']
-        neg = ['miss', 'fall', 'drop', 'sell', 'weak', 'loss', 'crash', 'risk']
-        val = 0
-        for h in headlines:
-            if any(x in h.lower() for x in pos): val += 1
-            if any(x in h.lower() for x in neg): val -= 1
-        sent = "Pozitiv 🟢" if val > 0 else "Negativ 🔴" if val < 0 else "Neutru ⚪"
-        return sent, headlines
-    except:
-        return "Indisponibil", []
-
-# --- FUNCȚIE CURĂȚARE TEXT ---
-def clean_text_for_pdf(text):
-    """Transformă diacriticele în caractere simple pentru a nu crăpa PDF-ul."""
-    if text is None: return ""
-    text = str(text)
-    replacements = {
-        'ă': 'a', 'â': 'a', 'î': 'i', 'ș': 's', 'ț': 't',
-        'Ă': 'A', 'Â': 'A', 'Î': 'I', 'Ș': 'S', 'Ț': 'T',
-        '🔴': '[RISC]', '🟢': '[BUN]', '🟡': '[NEUTRU]', '⚪': '-',
-        '💎': '[GEM]', '🛡️': '[SCUT]', '📈': '[UP]', '📉': '[DOWN]'
+@st.cache_data(ttl=60, show_spinner=False)
+def portfolio_frontier(tickers, period, samples=portfolio.SAMPLES):
+    # Monte Carlo pe ponderi, o singură dată per (listă, perioadă); prețurile vin din același cache ca Vs
+    closes, _, _ = download_comparison(tickers, period)
+    return portfolio.frontier(closes, samples)
+
+def build_frontier_chart(result, current=None, max_points=5_000):
+    import plotly.graph_objects as go
+    table = result['samples']
+    # Norul desenat e plafonat; punctele de pe frontieră se desenează toate
+    cloud = table.sample(min(len(table), max_points), random_state=0)
+    edge = table[table['efficient']].sort_values('volatility')
+    fig = go.Figure([
+        go.Scattergl(x=cloud['volatility'], y=cloud['return'], mode='markers', name='Portofolii',
+                     marker=dict(size=4, color=cloud['sharpe'], colorscale='Viridis', showscale=True,
+                                 colorbar=dict(title='Sharpe')),
+                     customdata=cloud['max_dd'],
+                     hovertemplate='Vol %{x:.1f}% | Rand. %{y:.1f}% | DD %{customdata:.1f}%<extra></extra>'),
+        go.Scattergl(x=edge['volatility'], y=edge['return'], mode='lines', name='Frontiera eficientă',
+                     line=dict(color='#00cc00', width=2)),
+    ])
+    best = table.loc[[table['sharpe'].idxmax(), table['volatility'].idxmin()]]
+    fig.add_trace(go.Scatter(x=best['volatility'], y=best['return'], mode='markers+text', name='Repere',
+                             text=['Sharpe max', 'Vol. minimă'], textposition='top center',
+                             marker=dict(size=12, symbol='star', color='gold')))
+    if current is not None:
+        fig.add_trace(go.Scatter(x=[current['volatility']], y=[current['return']], mode='markers+text',
+                                 name='Ponderile tale', text=['Tu'], textposition='top center',
+                                 marker=dict(size=12, symbol='x', color='red')))
+    fig.update_layout(xaxis_title='Volatilitate anuală (%)', yaxis_title='Randament anual (%)',
+                      template="plotly_dark", height=500, margin=dict(l=0, r=0, t=20, b=0))
+    return fig
+
+def build_correlation_chart(corr):
+    import plotly.graph_objects as go
+    fig = go.Figure(go.Heatmap(z=corr.to_numpy(), x=list(corr.columns), y=list(corr.index),
+                               zmin=-1, zmax=1, colorscale='RdBu_r'))
+    fig.update_layout(template="plotly_dark", height=max(400, 14 * len(corr)), margin=dict(l=0, r=0, t=20, b=0))
+    return fig
+
+@st.cache_data(ttl=60, show_spinner=False)
+def risk_series(ticker, window):
+    # Pe tot istoricul, o dată per (simbol, fereastră); perioada aleasă e doar o felie la afișare
+    history = data.load_history(ticker, 'max')
+    if history.empty:
+        return pd.DataFrame()
+    bench = data.load_history(data.BENCHMARK, 'max') if ticker != data.BENCHMARK else pd.DataFrame()
+    return indicators.rolling_risk(history['Close'], (window,), None if bench.empty else bench['Close'])
+
+def build_risk_chart(series):
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+    fig = make_subplots(rows=len(series.columns), cols=1, shared_xaxes=True, vertical_spacing=0.04,
+                        subplot_titles=[name for name, _ in series.columns])
+    for row, col in enumerate(series.columns, start=1):
+        # Fiecare serie redusă separat cu LTTB: 30 de ani rămân ~1000 de puncte pe grafic
+        points = ohlc.lttb(series[col])
+        fig.add_trace(go.Scattergl(x=points.index, y=points.values, mode='lines', name=col[0]), row=row, col=1)
+    fig.update_layout(template="plotly_dark", height=180 * len(series.columns), showlegend=False,
+                      margin=dict(l=0, r=0, t=30, b=0))
+    return fig
+
+def build_audit_pdf(**kwargs):
+    # fpdf se încarcă doar când cineva chiar descarcă raportul
+    from prime.report import create_extended_pdf
+    with metrics.timer('pdf'):
+        pdf = create_extended_pdf(**kwargs)
+    metrics.payload('pdf', pdf)
+    return pdf
+
+def diagnostics_panel():
+    # Doar pentru admin: timpi pe etape, contoare și cache, pentru tot procesul
+    with st.sidebar.expander("📈 Diagnostic"):
+        on = st.toggle("Instrumentare", value=metrics.ENABLED, help="Comun tuturor sesiunilor din acest proces")
+        if on != metrics.ENABLED:
+            metrics.enable(on)
+        if not metrics.ENABLED:
+            st.caption("Oprită. Pornește-o aici sau cu PRIME_METRICS=1.")
+            return
+        runs = list(metrics.REGISTRY.runs)
+        if runs:
+            last = runs[-1]
+            st.caption(f"Ultimul rerun: {last['total'] * 1000:.0f} ms ({last['ticker']})")
+            st.dataframe(pd.Series(last['stages'], name='ms').mul(1000).round(1))
+        summary = metrics.REGISTRY.summary_table()
+        if not summary.empty:
+            st.dataframe(summary, hide_index=True)
+        counters = metrics.REGISTRY.counter_table()
+        if not counters.empty:
+            st.dataframe(counters, hide_index=True)
+        cache = metadata.CACHE.stats()
+        st.caption(f"Cache metadate: {cache['entries']} intrări, {cache['bytes'] / 1e6:.1f} MB")
+        lim, fl = throttle.LIMITER.stats(), throttle.FLIGHTS.stats()
+        st.caption(f"Upstream: {lim['tokens']:.0f}/{lim['burst']:.0f} jetoane, coadă {lim['queue_depth']} "
+                   f"(max {lim['max_depth']}), {fl['shared']} cereri comasate din {fl['leaders'] + fl['shared']}")
+        if lim['waits']:
+            st.dataframe(pd.DataFrame(lim['waits']).T, use_container_width=True)
+        breakers = throttle.stats()['breakers']
+        if breakers:
+            st.caption(f"Întrerupătoare (după {throttle.BREAKER_FAILURES} erori, pauză {throttle.BREAKER_COOLDOWN:.0f}s); "
+                       f"termen pagină {data.DEADLINE:.1f}s, SLO {metrics.SLO_SECONDS:.1f}s")
+            st.dataframe(pd.DataFrame(breakers).T, use_container_width=True)
+        if prefetch.ENABLED:
+            pf = get_prefetcher().status()
+            last = datetime.fromtimestamp(pf['last_run']).strftime('%H:%M:%S') if pf['last_run'] else "-"
+            st.caption(f"Prefetch: {pf['tickers']} simboluri la {last} ({pf['last_duration']:.1f}s), "
+                       f"următorul în {pf['interval']:.0f}s, bursa {'deschisă' if pf['market_open'] else 'închisă'}")
+        st.download_button("⬇️ Prometheus", data=metrics.REGISTRY.prometheus_text,
+                           file_name="prime_metrics.prom", mime="text/plain", on_click="ignore")
+        if st.button("Resetează contoarele"):
+            metrics.REGISTRY.reset()
+
+def score_history(history, info):
+    volatility, max_dd, sharpe = calculate_risk_metrics(history)
+    score, reasons = calculate_prime_score(info, history)
+    verdict, style = get_verdict(score, max_dd, sharpe)
+    return {
+        'volatility': volatility, 'max_dd': max_dd, 'sharpe': sharpe,
+        'score': score, 'reasons': reasons, 'verdict': verdict, 'style': style,
+        'rsi': calculate_rsi(history['Close']).iloc[-1],
     }
-    for k, v in replacements.items():
-        text = text.replace(k, v)
-    
-    # Eliminăm orice alt caracter ciudat care nu e latin-1
-    return text.encode('latin-1', 'ignore').decode('latin-1')
-
-# --- GENERATORUL DE RAPORT COMPLEX ---
-def create_extended_pdf(ticker, full_name, price, score, reasons, verdict, risk, info, rsi_val):
-    if not info: info = {}
-    pdf = FPDF()
-    pdf.set_auto_page_break(auto=True, margin=15)
-    
-    # --- PAGINA 1: REZUMAT ---
-    pdf.add_page()
-    
-    # Titlu
-    pdf.set_font("Arial", 'B', 24)
-    pdf.cell(0, 20, f"RAPORT DE ANALIZA: {clean_text_for_pdf(ticker)}", ln=True, align='C')
-    
-    pdf.set_font("Arial", '', 10)
-    pdf.cell(0, 10, f"Generat automat de PRIME Terminal | Data: {datetime.now().strftime('%Y-%m-%d')}", ln=True, align='C')
-    pdf.ln(10)
-
-    # 1. SCOR ȘI VERDICT
-    pdf.set_fill_color(240, 240, 240)
-    pdf.set_font("Arial", 'B', 16)
-    pdf.cell(0, 12, "1. VERDICT GENERAL", ln=True, fill=True)
-    pdf.ln(5)
-    
-    pdf.set_font("Arial", 'B', 14)
-    pdf.cell(50, 10, f"SCOR PRIME: {score}/100", ln=False)
-    pdf.cell(0, 10, f"CALIFICATIV: {clean_text_for_pdf(verdict)}", ln=True)
-    
-    pdf.set_font("Arial", '', 11)
-    pdf.ln(5)
-    pdf.multi_cell(0, 6, clean_text_for_pdf(
-        f"Compania {full_name} se tranzactioneaza la pretul de ${price:.2f}. "
-        f"Pe baza algoritmului nostru, aceasta prezinta un profil de risc cu volatilitate anuala de {risk['vol']:.1f}% "
-        f"si un Sharpe Ratio de {risk.get('sharpe', 0):.2f} (un numar mai mare de 1 indica un randament bun ajustat la risc)."
-    ))
-
-    pdf.ln(10)
-    pdf.set_font("Arial", 'B', 14)
-    pdf.cell(0, 10, "PUNCTE CHEIE (PRO/CONTRA)", ln=True)
-    pdf.set_font("Arial", '', 11)
-    
-    if reasons:
-        for r in reasons:
-            pdf.cell(5, 8, "-", ln=False)
-            pdf.multi_cell(0, 8, clean_text_for_pdf(r))
-    else:
-        pdf.cell(0, 8, "Nu au fost identificate semnale majore automate.", ln=True)
-
-    # --- PAGINA 2: ANALIZA FUNDAMENTALĂ DETALIATĂ ---
-    pdf.add_page()
-    pdf.set_font("Arial", 'B', 16)
-    pdf.cell(0, 12, "2. ANALIZA FUNDAMENTALA DETALIATA", ln=True, fill=True)
-    pdf.ln(5)
-
-    # A. EVALUARE (VALUATION)
-    pe = info.get('trailingPE')
-    peg = info.get('pegRatio')
-    pb = info.get('priceToBook')
-    
-    # Interpretare Textuala Evaluare
-    interp_val = "Date insuficiente."
-    if pe:
-        if pe < 15: interp_val = "Compania este considerata ieftina (Sub-evaluata)."
-        elif pe < 30: interp_val = "Evaluarea este corecta (Fair Value)."
-        else: interp_val = "Pretul include asteptari mari de crestere (Supra-evaluata)."
-    
-    pdf.set_font("Arial", 'B', 12)
-    pdf.cell(0, 8, f"A. Evaluare (Cat platesti?): {clean_text_for_pdf(interp_val)}", ln=True)
-    pdf.set_font("Arial", '', 11)
-    
-    col_w = 60
-    pdf.cell(col_w, 8, f"P/E Ratio: {pe if pe else 'N/A'}", border=1)
-    pdf.cell(col_w, 8, f"PEG Ratio: {peg if peg else 'N/A'}", border=1)
-    pdf.cell(col_w, 8, f"P/Book: {pb if pb else 'N/A'}", border=1, ln=True)
-    pdf.ln(5)
-
-    # B. PROFITABILITATE
-    mg = info.get('profitMargins', 0)
-    roe = info.get('returnOnEquity', 0)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_analysis(ticker, period, _history, _info):
+    # Cheia e doar (simbol, perioadă): datele deja încărcate nu se mai hash-uiesc
+    return score_history(_history, _info)
+
+def analyze(ticker, period, history, info):
+    # Scorul, riscul, verdictul și RSI-ul: o singură dată per (simbol, perioadă), citite de orice tab,
+    # din datele deja aduse de rerun. Fără `info` (sursa n-a răspuns la timp) nu punem scorul în cache,
+    # altfel ar rămâne calculat fără fundamentale tot TTL-ul
+    if not info:
+        return score_history(history, info)
+    return _cached_analysis(ticker, period, history, info)
+
+# Fragmentele de mai jos: o schimbare într-un widget re-rulează doar secțiunea lui, nu toată pagina
+
+@st.fragment
+def price_chart_panel(ticker, period, history):
+    chart_mode = st.radio("Grafic:", ["Lumânări", "Linie"], horizontal=True, label_visibility="collapsed")
+    n_bars = len(history)
+    with metrics.timer('chart'):
+        bars, resolution = chart_series(ticker, period, chart_mode, history)
+        fig = build_price_chart(bars, ticker)
+    metrics.payload('candlestick', fig)
+    st.plotly_chart(fig, use_container_width=True)
+    if len(bars) < n_bars:
+        st.caption(f"{n_bars} zile afișate ca {len(bars)} puncte ({resolution})")
+
+@st.fragment
+def risk_panel(ticker, start):
+    risk_window = st.radio("Fereastra:", [30, 90, 252], index=2, horizontal=True,
+                           format_func=lambda w: f"{w} zile", key='risk_window')
+    with metrics.timer('risk_series'):
+        series = risk_series(ticker, risk_window)
+    if not series.empty:
+        series = series.iloc[series.index.searchsorted(start):].dropna(how='all')
+    if series.empty:
+        st.info(f"Istoric prea scurt pentru o fereastră de {risk_window} zile.")
+        return
+    fig = build_risk_chart(series)
+    metrics.payload('risk_chart', fig)
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption(f"Volatilitate și Sharpe pe ultimele {risk_window} randamente zilnice; drawdown față de "
+               f"vârful aceleiași ferestre; beta față de {data.BENCHMARK}.")
+
+@st.fragment
+def watchlist_news_panel(tickers):
+    if st.toggle("🌐 Sentiment pe toată lista", help="Știrile tuturor favoritelor, scorate într-o singură trecere"):
+        if tickers:
+            with metrics.timer('news_watchlist'):
+                summary, series = watchlist_news(tuple(tickers))
+            st.dataframe(summary, use_container_width=True)
+            if not series.empty:
+                st.line_chart(series)
+        else:
+            st.info("Lista este goală.")
+
+@st.fragment
+def dividend_panel(info, curr_price):
+    # 1. PRELUARE DATE AUTOMATE
+    div_rate = info.get('dividendRate', 0)
+    div_yield_raw = info.get('dividendYield', 0)
     
-    # Interpretare Textuala Profit
-    interp_prof = "Compania are probleme de profitabilitate."
-    if mg is not None:
-        if mg > 0.15: interp_prof = "Compania este o masina de bani (Marje foarte bune)."
-        elif mg > 0.05: interp_prof = "Profitabilitate stabila si normala."
+    # Dacă lipsește yield-ul dat de Yahoo, îl calculăm noi brut
+    if (div_yield_raw is None or div_yield_raw == 0) and (div_rate and div_rate > 0):
+         div_yield_raw = div_rate / curr_price
+
+    # Standardizare: Yahoo dă de obicei 0.05 pentru 5%. Noi vrem procentul (5.0).
+    if div_yield_raw is None: 
+        auto_yield = 0.0
     else:
-        mg = 0
-    
-    pdf.set_font("Arial", 'B', 12)
-    pdf.cell(0, 8, f"B. Profitabilitate: {clean_text_for_pdf(interp_prof)}", ln=True)
-    pdf.set_font("Arial", '', 11)
-    
-    pdf.cell(col_w, 8, f"Marja Profit: {mg*100:.1f}%", border=1)
-    pdf.cell(col_w, 8, f"ROE (Randament): {roe*100:.1f}%", border=1)
-    pdf.cell(col_w, 8, f"Revenue Growth: {info.get('revenueGrowth', 0)*100:.1f}%", border=1, ln=True)
-    pdf.ln(5)
-
-    # C. BILANT SI DATORII
-    cash = info.get('totalCash', 0)
-    debt = info.get('totalDebt', 0)
-    current_ratio = info.get('currentRatio', 0)
-    
-    interp_health = "Situatie financiara riscanta."
-    if cash is None: cash = 0
-    if debt is None: debt = 0
-    if current_ratio is None: current_ratio = 0
+        auto_yield = div_yield_raw * 100
 
-    if cash > debt: interp_health = "Bilant FORTAREATA (Mai multi bani decat datorii)."
-    elif current_ratio > 1.5: interp_health = "Stabilitate buna pe termen scurt."
-    
-    pdf.set_font("Arial", 'B', 12)
-    pdf.cell(0, 8, f"C. Sanatate Financiara: {clean_text_for_pdf(interp_health)}", ln=True)
-    pdf.set_font("Arial", '', 11)
-    
-    pdf.cell(col_w, 8, f"Cash Total: ${cash/1e9:.1f}B", border=1)
-    pdf.cell(col_w, 8, f"Datorie Totala: ${debt/1e9:.1f}B", border=1)
-    pdf.cell(col_w, 8, f"Lichiditate (Curr): {current_ratio:.2f}", border=1, ln=True)
-
-    # --- PAGINA 3: TEHNIC, DIVIDENDE SI DISCLAIMER ---
-    pdf.add_page()
-    pdf.set_font("Arial", 'B', 16)
-    pdf.cell(0, 12, "3. ANALIZA TEHNICA & DIVIDENDE", ln=True, fill=True)
-    pdf.ln(5)
-
-    # RSI
-    interp_rsi = "Momentum Neutru."
-    if rsi_val > 70: interp_rsi = "Supra-cumparat (Posibila corectie)."
-    elif rsi_val < 30: interp_rsi = "Supra-vandut (Posibila revenire)."
-    
-    pdf.set_font("Arial", 'B', 12)
-    pdf.cell(0, 8, f"Indicator RSI (14 zile): {rsi_val:.2f} -> {clean_text_for_pdf(interp_rsi)}", ln=True)
+    # 2. ZONA DE CONTROL MANUAL
+    col_info, col_edit = st.columns([2, 1])
     
-    # Dividende
-    div_yield = info.get('dividendYield', 0)
-    if div_yield and div_yield < 1: div_yield = div_yield * 100 # Corectie
+    with col_info:
+        # Afișăm ce a găsit sistemul
+        st.write(f"Yield detectat automat: **{auto_yield:.2f}%**")
+        st.caption(f"Plată anuală (est): ${div_rate if div_rate else 0}")
+
+    with col_edit:
+        # Aici e soluția ta: BUTONUL DE MODIFICARE
+        override = st.checkbox("✏️ Corectează Manual")
     
-    pdf.ln(5)
-    pdf.set_font("Arial", 'B', 12)
-    pdf.cell(0, 8, "Politica de Dividende:", ln=True)
-    pdf.set_font("Arial", '', 11)
-    if div_yield and div_yield > 0:
-        pdf.multi_cell(0, 6, clean_text_for_pdf(
-            f"Compania plateste dividende. Randamentul anual curent este de {div_yield:.2f}%. "
-            f"Rata de plata (Payout Ratio) este de {info.get('payoutRatio', 0)*100:.1f}%, ceea ce indica cat din profit se intoarce la investitori."
-        ))
+    if override:
+        # Dacă bifezi, tu decizi cât e randamentul
+        final_yield = st.number_input("Introdu Randamentul Corect (%):", value=float(auto_yield), step=0.1, format="%.2f")
+        st.success(f"Folosim randamentul manual: {final_yield}%")
     else:
-        pdf.multi_cell(0, 6, "Compania NU plateste dividende in prezent. Profitul este reinvestit.")
+        # Dacă nu bifezi, mergem pe mâna robotului
+        final_yield = auto_yield
 
-    # TABEL DATE BRUTE SUPLIMENTARE
-    pdf.ln(10)
-    pdf.set_font("Arial", 'B', 12)
-    pdf.cell(0, 8, "Alte Date Relevante (Snapshot):", ln=True)
-    pdf.set_font("Arial", '', 10)
-    
-    extra_data = [
-        ("Sector", info.get('sector', 'N/A')),
-        ("Industrie", info.get('industry', 'N/A')),
-        ("Angajati", info.get('fullTimeEmployees', 'N/A')),
-        ("Target Pret Analisti", f"${info.get('targetMeanPrice', 'N/A')}"),
-        ("Beta (Volatilitate vs Piata)", f"{info.get('beta', 'N/A')}")
-    ]
-    
-    for label, val in extra_data:
-        pdf.cell(60, 6, clean_text_for_pdf(label), border=1)
-        pdf.cell(0, 6, clean_text_for_pdf(str(val)), border=1, ln=True)
+    st.markdown("---")
 
-    # DISCLAIMER FINAL
-    pdf.ln(20)
-    pdf.set_font("Arial", 'I', 8)
-    pdf.multi_cell(0, 5, clean_text_for_pdf(
-        "DISCLAIMER: Acest raport este generat automat de un algoritm software si are scop pur informativ. "
-        "Nu reprezinta un sfat financiar, juridic sau fiscal. Performantele trecute nu garanteaza rezultate viitoare. "
-        "Consultati un specialist inainte de a investi."
-    ))
+    # 3. CALCULATOR VENIT PASIV (Folosește final_yield)
+    if final_yield > 0:
+        st.subheader("🧮 Calculator Venit Pasiv")
+        st.write("Câți bani vrei să investești?")
+        
+        inv = st.number_input("Suma Investită ($)", min_value=1.0, value=1000.0, step=100.0, key="inv_calc")
+        
+        # Calcul matematic: (Suma * Procent) / 100
+        venit_anual = inv * (final_yield / 100)
+        venit_lunar = venit_anual / 12
+        
+        # Afișare rezultate
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Investiție", f"${inv:,.0f}")
+        c2.metric("Venit Lunar", f"${venit_lunar:.2f}")
+        c3.metric("Venit Anual", f"${venit_anual:.2f}")
+        
+        # Proiecție pe 10 ani (fără reinvestire, simplu)
+        st.progress(min(int(final_yield * 2), 100)) # O bară vizuală pentru cât de mare e yield-ul
+        st.caption(f"La un randament de {final_yield}%, îți recuperezi investiția din dividende în aproximativ {100/final_yield:.1f} ani (fără creșterea prețului).")
+        
+    else:
+        st.info("Această companie nu pare să plătească dividende (0%). Dacă greșesc, bifează 'Corectează Manual' sus.")
+
+@st.fragment
+def vs_panel(favs, period):
+    favs = list(favs)
+    if len(favs) < 2:
+        st.info("Adaugă minim 2 companii la favorite pentru a activa comparația.")
+    elif st.radio("Mod:", ["🏁 Cursa prețului", "📐 Portofoliu"], horizontal=True, key='vs_mode') == "🏁 Cursa prețului":
+        st.subheader("🏁 Cursa Prețului (1 An)")
+        sel = st.multiselect("Alege companii:", favs, default=favs[:2])
+        
+        if sel:
+            metrics.count('page_cache_calls_total', fn='download_comparison')
+            with metrics.timer('compare'):
+                closes, infos, errors = download_comparison(tuple(sel), "1y")
+            df_chart = (closes / closes.bfill().iloc[0] - 1) * 100 if not closes.empty else closes
+            comp_data = [] 
+            
+            for t in sel:
+                i = infos.get(t) or {}
+                if not i and t not in closes: continue
+                comp_data.append({
+                    "Simbol": t,
+                    "Preț": i.get('currentPrice'),
+                    "P/E (Evaluare)": i.get('trailingPE'),
+                    "PEG (Creștere)": i.get('pegRatio'),
+                    "Marja Profit": f"{(i.get('profitMargins') or 0)*100:.1f}%",
+                    "Datorie/Cash": "🟢 Bun" if (i.get('totalCash') or 0) > (i.get('totalDebt') or 0) else "🔴 Risc"
+                })
+            
+            for t, err in errors.items():
+                st.caption(f"⚠️ {t}: {err}")
+            
+            metrics.payload('compare_chart', df_chart)
+            st.line_chart(df_chart)
+            
+            st.markdown("---")
+            st.subheader("⚖️ Comparație Fundamentală")
+            if comp_data:
+                df_table = pd.DataFrame(comp_data).set_index("Simbol")
+                st.dataframe(df_table.style.highlight_max(axis=0, color='#004d00'), use_container_width=True)
+                st.caption("*Verde închis indică valoarea cea mai mare din coloană.")
+    else:
+        st.subheader(f"📐 Portofoliu ({period})")
+        sel = st.multiselect("Companii în portofoliu:", favs,
+                             default=favs, key='pf_tickers')
+        if len(sel) >= 2:
+            weights = st.data_editor(
+                pd.DataFrame({'Pondere (%)': round(100 / len(sel), 2)}, index=pd.Index(sel, name='Simbol')),
+                use_container_width=True, key=f"pf_weights_{hash(tuple(sel))}")['Pondere (%)']
+            with metrics.timer('portfolio'):
+                closes, _, errors = download_comparison(tuple(sel), period)
+                result = portfolio_frontier(tuple(sel), period)
+            for t, err in errors.items():
+                st.caption(f"⚠️ {t}: {err}")
+
+            p_vol, p_dd, p_sharpe = portfolio.portfolio_metrics(closes, weights.to_dict())
+            returns = portfolio.daily_returns(closes)
+            mu, cov = portfolio.covariance(returns)
+            w = weights.reindex(returns.columns).fillna(0).to_numpy()
+            current = None
+            if w.sum() > 0:
+                current = {k: v[0] for k, v in portfolio.evaluate(returns.to_numpy(), mu, cov, w / w.sum()).items()}
+            c1, c2, c3, c4 = st.columns(4)
+            c1.metric("Randament anual", f"{current['return']:.1f}%" if current else "-")
+            c2.metric("Volatilitate", f"{p_vol:.1f}%")
+            c3.metric("Sharpe", f"{p_sharpe:.2f}")
+            c4.metric("Max Drawdown", f"{p_dd:.1f}%")
+
+            fig = build_frontier_chart(result, current)
+            metrics.payload('frontier_chart', fig)
+            st.plotly_chart(fig, use_container_width=True)
+            st.caption(f"{len(result['samples']):,} portofolii aleatoare (long-only), "
+                       f"{int(result['samples']['efficient'].sum())} pe frontieră; "
+                       f"{len(returns)} zile comune tuturor simbolurilor.")
+
+            c_best, c_min = st.columns(2)
+            with c_best:
+                st.markdown("**⭐ Sharpe maxim**")
+                st.dataframe((result['max_sharpe'] * 100).round(1).rename('Pondere (%)'), use_container_width=True)
+            with c_min:
+                st.markdown("**🛡️ Volatilitate minimă**")
+                st.dataframe((result['min_volatility'] * 100).round(1).rename('Pondere (%)'), use_container_width=True)
+
+            with st.expander("🔗 Matricea de corelație"):
+                st.plotly_chart(build_correlation_chart(result['correlation']), use_container_width=True)
+        else:
+            st.info("Alege minim 2 companii.")
 
-    return pdf.output(dest='S').encode('latin-1', 'ignore')
+if prefetch.ENABLED:
+    get_prefetcher()
 
 # --- SIDEBAR (SEARCH) ---
 st.sidebar.title(f"🔍 {st.session_state.active_ticker}")
@@ -443,19 +553,44 @@ if IS_ADMIN:
         ticker_to_add = st.session_state.active_ticker
         if ticker_to_add not in st.session_state.favorites:
             try:
-                t_info = yf.Ticker(ticker_to_add).info
+                t_info = metadata.get_info(ticker_to_add)
                 long_name = t_info.get('longName', ticker_to_add)
-                st.session_state.favorites.append(ticker_to_add)
-                st.session_state.favorite_names[ticker_to_add] = long_name
-                save_db(st.session_state.favorites, st.session_state.favorite_names)
+                favorites.get_store().add(ticker_to_add, long_name, st.session_state.watchlist)
                 st.sidebar.success("Salvat!")
                 st.rerun()
             except Exception: st.sidebar.error("Eroare!")
+    diagnostics_panel()
 else:
     if st.session_state.active_ticker not in st.session_state.favorites:
         st.sidebar.info("🔒 Loghează-te ca Admin pentru a adăuga.")
 
 st.sidebar.subheader("Lista Mea")
+watchlists = favorites.get_store().watchlists()
+if st.session_state.watchlist not in watchlists:
+    st.session_state.watchlist = favorites.DEFAULT_LIST
+if len(watchlists) > 1 or IS_ADMIN:
+    st.sidebar.selectbox("Lista", watchlists, key="watchlist", on_change=sync_favorites, label_visibility="collapsed")
+if IS_ADMIN:
+    # Lista activă e cheia selectbox-ului de mai sus: o schimbăm doar din callback-uri,
+    # care rulează înaintea widget-ului la rerun-ul următor
+    def create_watchlist():
+        name = st.session_state.new_watchlist.strip()
+        if name:
+            favorites.get_store().create_watchlist(name)
+            st.session_state.watchlist = name
+            sync_favorites()
+
+    def delete_watchlist():
+        favorites.get_store().delete_watchlist(st.session_state.watchlist)
+        st.session_state.watchlist = favorites.DEFAULT_LIST
+        sync_favorites()
+
+    with st.sidebar.form(key='watchlist_form', clear_on_submit=True):
+        st.text_input("Listă nouă", placeholder="ex. Dividende", key="new_watchlist")
+        st.form_submit_button("➕ Creează", on_click=create_watchlist)
+    if st.session_state.watchlist != favorites.DEFAULT_LIST:
+        st.sidebar.button("🗑️ Șterge lista", on_click=delete_watchlist)
+
 if st.session_state.favorites:
     for fav in st.session_state.favorites:
         full_n = st.session_state.favorite_names.get(fav, fav)
@@ -466,8 +601,8 @@ if st.session_state.favorites:
         
         def set_fav(f=fav): st.session_state.active_ticker = f
         def del_fav(f=fav): 
-            st.session_state.favorites.remove(f)
-            save_db(st.session_state.favorites, st.session_state.favorite_names)
+            favorites.get_store().remove(f, st.session_state.watchlist)
+            sync_favorites()
 
         if IS_ADMIN:
             c1.button(f"{fav}", key=f"btn_{fav}", on_click=set_fav, help=full_n)
@@ -483,211 +618,157 @@ if st.sidebar.button("🔒 Logout Site"):
     st.rerun()
 
 # --- MAIN APP (PUBLIC DUPA ACCES) ---
-temp_stock = yf.Ticker(st.session_state.active_ticker)
-try: temp_name = temp_stock.info.get('longName', st.session_state.active_ticker)
-except: temp_name = st.session_state.active_ticker
-
 st.title(f"🛡️ {st.session_state.active_ticker}")
-st.caption(f"{temp_name}")
+# Numele și vechimea datelor se completează după ce istoricul și `info` au venit (în paralel)
+name_slot = st.empty()
+notice = st.empty()
 
 optiuni_ani = ['1mo', '3mo', '6mo', '1y', '2y', '3y', '5y', 'max']
 perioada = st.select_slider("Perioada:", options=optiuni_ani, value='1y')
 
-tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
-    "📊 Analiză", "📈 Tehnic", "📅 Calendar", "📰 Știri", "💰 Dividende", "📋 Audit (PDF)", "⚔️ Vs"
-])
+# Cu `on_change="rerun"` Streamlit știe ce tab e deschis (`.open`): calculăm doar pentru el
+tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9 = st.tabs([
+    "📊 Analiză", "📈 Tehnic", "📅 Calendar", "📰 Știri", "💰 Dividende", "📋 Audit (PDF)", "⚔️ Vs", "⏱️ Live",
+    "🔎 Screener"
+], key='main_tab', on_change="rerun")
 
-stock, history, info = get_stock_data(st.session_state.active_ticker, period=perioada)
+history, info = get_stock_data(st.session_state.active_ticker, period=perioada, until=page_deadline)
+# Fără istoric, get_stock_data nu întoarce `info`: îl cerem separat, în limita aceluiași termen
+temp_name = (info or data.load_info(st.session_state.active_ticker, page_deadline)).get('longName', st.session_state.active_ticker)
+name_slot.caption(f"{temp_name}")
 
-if stock is not None and history is not None and not history.empty:
+if history is not None and not history.empty:
     curr_price = history['Close'].iloc[-1]
-    
-    volatility, max_dd, sharpe = calculate_risk_metrics(history)
-    score, reasons = calculate_prime_score(info, history)
-    
-    if max_dd < -50: verdict = "Prăbușire Istorică 🔴"; style = "error"
-    elif sharpe > 1.0 and score > 70: verdict = "💎 GEM (Oportunitate)"; style = "success"
-    elif score > 60: verdict = "Solid 🟢"; style = "success"
-    else: verdict = "Neutru / Riscant 🟡"; style = "warning"
+    with notice.container():
+        staleness_notice(st.session_state.active_ticker)
 
     with tab1:
-        c1, c2, c3, c4 = st.columns(4)
-        c1.metric("Preț", f"${curr_price:.2f}")
-        c2.metric("Scor PRIME", f"{score}/100")
-        c3.metric("Risc (Vol)", f"{volatility:.1f}%")
-        c4.metric("Sharpe Ratio", f"{sharpe:.2f}")
+        if tab1.open:
+            with metrics.timer('score'):
+                a = analyze(st.session_state.active_ticker, perioada, history, info)
+            c1, c2, c3, c4 = st.columns(4)
+            # Prețul curent din cache-ul de cotații (TTL de secunde); fără el, ultima închidere
+            quote = data.load_quote(st.session_state.active_ticker, page_deadline)
+            c1.metric("Preț", f"${quote or curr_price:.2f}")
+            c2.metric("Scor PRIME", f"{a['score']}/100")
+            c3.metric("Risc (Vol)", f"{a['volatility']:.1f}%")
+            c4.metric("Sharpe Ratio", f"{a['sharpe']:.2f}")
         
-        if style == "success": st.success(verdict)
-        elif style == "warning": st.warning(verdict)
-        else: st.error(verdict)
+            if a['style'] == "success": st.success(a['verdict'])
+            elif a['style'] == "warning": st.warning(a['verdict'])
+            else: st.error(a['verdict'])
         
-        fig = go.Figure(data=[go.Candlestick(
-            x=history.index,
-            open=history['Open'],
-            high=history['High'],
-            low=history['Low'],
-            close=history['Close'],
-            name=st.session_state.active_ticker
-        )])
-        fig.update_layout(
-            yaxis_title='Preț ($)',
-            xaxis_rangeslider_visible=False,
-            template="plotly_dark",
-            height=500,
-            margin=dict(l=0, r=0, t=20, b=0)
-        )
-        st.plotly_chart(fig, use_container_width=True)
-
-    with tab2: 
-        st.subheader("RSI Momentum")
-        rsi_val = calculate_rsi(history['Close']).iloc[-1]
-        st.metric("RSI (14)", f"{rsi_val:.2f}")
-        if rsi_val > 70: st.warning("Supra-cumparat (>70)")
-        elif rsi_val < 30: st.success("Supra-vandut (<30)")
-        st.markdown("---")
-        st.subheader("Insider Trading")
-        try:
-            ins = stock.insider_transactions
-            if ins is not None and not ins.empty: st.dataframe(ins.head(10)[['Start Date', 'Insider', 'Shares', 'Text']])
-            else: st.info("Fara date insideri.")
-        except: st.info("Indisponibil.")
+            price_chart_panel(st.session_state.active_ticker, perioada, history)
+
+    with tab2:
+        if tab2.open:
+            st.subheader("RSI Momentum")
+            rsi_val = analyze(st.session_state.active_ticker, perioada, history, info)['rsi']
+            st.metric("RSI (14)", f"{rsi_val:.2f}")
+            if rsi_val > 70: st.warning("Supra-cumparat (>70)")
+            elif rsi_val < 30: st.success("Supra-vandut (<30)")
+            st.markdown("---")
+            st.subheader("📉 Risc în timp")
+            risk_panel(st.session_state.active_ticker, history.index[0])
+            st.markdown("---")
+            st.subheader("Insider Trading")
+            try:
+                with metrics.timer('insider'):
+                    ins = metadata.get_insider(st.session_state.active_ticker)
+                if ins is not None and not ins.empty: st.dataframe(ins.head(10)[['Start Date', 'Insider', 'Shares', 'Text']])
+                else: st.info("Fara date insideri.")
+            except: st.info("Indisponibil.")
 
     with tab3:
-        try:
-            cal = stock.calendar
-            if cal is not None and not cal.empty: st.dataframe(cal)
-            else: st.write("Fara date calendar.")
-        except: st.error("Eroare.")
+        if tab3.open:
+            try:
+                with metrics.timer('calendar'):
+                    cal = metadata.get_calendar(st.session_state.active_ticker)
+                if cal is not None and not cal.empty: st.dataframe(cal)
+                else: st.write("Fara date calendar.")
+            except: st.error("Eroare.")
 
     with tab4:
-        s, heads = get_news_sentiment(stock)
-        st.write(f"Sentiment: **{s}**")
-        for h in heads: st.markdown(f"- {h}")
-
-    with tab5:
-        st.subheader("💰 Dividende & Venit Pasiv")
-        
-        # 1. PRELUARE DATE AUTOMATE
-        div_rate = info.get('dividendRate', 0)
-        div_yield_raw = info.get('dividendYield', 0)
-        
-        # Dacă lipsește yield-ul dat de Yahoo, îl calculăm noi brut
-        if (div_yield_raw is None or div_yield_raw == 0) and (div_rate and div_rate > 0):
-             div_yield_raw = div_rate / curr_price
-
-        # Standardizare: Yahoo dă de obicei 0.05 pentru 5%. Noi vrem procentul (5.0).
-        if div_yield_raw is None: 
-            auto_yield = 0.0
-        else:
-            auto_yield = div_yield_raw * 100
-
-        # 2. ZONA DE CONTROL MANUAL
-        col_info, col_edit = st.columns([2, 1])
-        
-        with col_info:
-            # Afișăm ce a găsit sistemul
-            st.write(f"Yield detectat automat: **{auto_yield:.2f}%**")
-            st.caption(f"Plată anuală (est): ${div_rate if div_rate else 0}")
-
-        with col_edit:
-            # Aici e soluția ta: BUTONUL DE MODIFICARE
-            override = st.checkbox("✏️ Corectează Manual")
-        
-        if override:
-            # Dacă bifezi, tu decizi cât e randamentul
-            final_yield = st.number_input("Introdu Randamentul Corect (%):", value=float(auto_yield), step=0.1, format="%.2f")
-            st.success(f"Folosim randamentul manual: {final_yield}%")
-        else:
-            # Dacă nu bifezi, mergem pe mâna robotului
-            final_yield = auto_yield
+        if tab4.open:
+            with metrics.timer('news'):
+                s, heads = get_news_sentiment(st.session_state.active_ticker)
+            st.write(f"Sentiment: **{s}**")
+            for h in heads: st.markdown(f"- {h}")
 
-        st.markdown("---")
+            st.markdown("---")
+            watchlist_news_panel(tuple(st.session_state.favorites))
 
-        # 3. CALCULATOR VENIT PASIV (Folosește final_yield)
-        if final_yield > 0:
-            st.subheader("🧮 Calculator Venit Pasiv")
-            st.write("Câți bani vrei să investești?")
-            
-            inv = st.number_input("Suma Investită ($)", min_value=1.0, value=1000.0, step=100.0, key="inv_calc")
-            
-            # Calcul matematic: (Suma * Procent) / 100
-            venit_anual = inv * (final_yield / 100)
-            venit_lunar = venit_anual / 12
-            
-            # Afișare rezultate
-            c1, c2, c3 = st.columns(3)
-            c1.metric("Investiție", f"${inv:,.0f}")
-            c2.metric("Venit Lunar", f"${venit_lunar:.2f}")
-            c3.metric("Venit Anual", f"${venit_anual:.2f}")
-            
-            # Proiecție pe 10 ani (fără reinvestire, simplu)
-            st.progress(min(int(final_yield * 2), 100)) # O bară vizuală pentru cât de mare e yield-ul
-            st.caption(f"La un randament de {final_yield}%, îți recuperezi investiția din dividende în aproximativ {100/final_yield:.1f} ani (fără creșterea prețului).")
-            
-        else:
-            st.info("Această companie nu pare să plătească dividende (0%). Dacă greșesc, bifează 'Corectează Manual' sus.")
+    with tab5:
+        if tab5.open:
+            st.subheader("💰 Dividende & Venit Pasiv")
+            dividend_panel(info, curr_price)
 
     with tab6:
-        st.write("Genereaza un raport complet.")
-        if st.button("📄 Descarca Raport Complet"):
-            try:
-                curr_rsi = calculate_rsi(history['Close']).iloc[-1]
-                risk_data = {'vol': volatility, 'dd': max_dd, 'sharpe': sharpe}
-                
-                pdf_bytes = create_extended_pdf(
-                    ticker=st.session_state.active_ticker,
-                    full_name=temp_name,
-                    price=curr_price,
-                    score=score,
-                    reasons=reasons,
-                    verdict=verdict,
-                    risk=risk_data,
-                    info=info,
-                    rsi_val=curr_rsi
-                )
-                b64 = base64.b64encode(pdf_bytes).decode()
-                href = f'<a href="data:application/octet-stream;base64,{b64}" download="Raport_Audit_{st.session_state.active_ticker}.pdf">📥 Descarca PDF</a>'
-                st.markdown(href, unsafe_allow_html=True)
-            except Exception as e: 
-                st.error(f"Eroare generare PDF: {str(e)}")
+        if tab6.open:
+            st.write("Genereaza un raport complet.")
+            a = analyze(st.session_state.active_ticker, perioada, history, info)
+            risk_data = {'vol': a['volatility'], 'dd': a['max_dd'], 'sharpe': a['sharpe']}
+        
+            # PDF-ul se generează doar la click (într-un thread separat) și se servește ca fișier binar,
+            # nu ca base64 inline trimis prin websocket la fiecare rerun
+            build_pdf = partial(
+                build_audit_pdf,
+                ticker=st.session_state.active_ticker,
+                full_name=temp_name,
+                price=curr_price,
+                score=a['score'],
+                reasons=a['reasons'],
+                verdict=a['verdict'],
+                risk=risk_data,
+                info=info,
+                rsi_val=a['rsi']
+            )
+            st.download_button(
+                "📄 Descarca Raport Complet",
+                data=build_pdf,
+                file_name=f"Raport_Audit_{st.session_state.active_ticker}.pdf",
+                mime="application/pdf",
+                on_click="ignore"
+            )
 
     with tab7:
-        if len(st.session_state.favorites) >= 2:
-            st.subheader("🏁 Cursa Prețului (1 An)")
-            sel = st.multiselect("Alege companii:", st.session_state.favorites, default=st.session_state.favorites[:2])
-            
-            if sel:
-                df_chart = pd.DataFrame()
-                comp_data = [] 
-                
-                for t in sel:
-                    try:
-                        s_tmp = yf.Ticker(t)
-                        h = s_tmp.history(period="1y")['Close']
-                        i = s_tmp.info
-                        
-                        if not h.empty: df_chart[t] = (h/h.iloc[0]-1)*100
-                        
-                        comp_data.append({
-                            "Simbol": t,
-                            "Preț": i.get('currentPrice'),
-                            "P/E (Evaluare)": i.get('trailingPE'),
-                            "PEG (Creștere)": i.get('pegRatio'),
-                            "Marja Profit": f"{i.get('profitMargins', 0)*100:.1f}%",
-                            "Datorie/Cash": "🟢 Bun" if i.get('totalCash', 0) > i.get('totalDebt', 0) else "🔴 Risc"
-                        })
-                    except: pass
-                
-                st.line_chart(df_chart)
-                
-                st.markdown("---")
-                st.subheader("⚖️ Comparație Fundamentală")
-                if comp_data:
-                    df_table = pd.DataFrame(comp_data).set_index("Simbol")
-                    st.dataframe(df_table.style.highlight_max(axis=0, color='#004d00'), use_container_width=True)
-                    st.caption("*Verde închis indică valoarea cea mai mare din coloană.")
-        else:
-            st.info("Adaugă minim 2 companii la favorite pentru a activa comparația.")
+        if tab7.open:
+            vs_panel(tuple(st.session_state.favorites), perioada)
+
+    with tab8:
+        if tab8.open:
+            st.subheader("⏱️ Live Intraday")
+            c_int, c_on = st.columns(2)
+            with c_int:
+                live_interval = st.radio("Interval:", ['1m', '5m'], horizontal=True)
+            with c_on:
+                live_on = st.toggle("Pornește Live")
+            if live_on:
+                live_panel(st.session_state.active_ticker, live_interval)
+            else:
+                st.caption("Pornește modul live pentru bare intraday actualizate automat.")
+
+    with tab9:
+        if tab9.open:
+            st.subheader("🔎 Screener (clasament PRIME)")
+            if os.path.exists(screener.RESULTS_FILE):
+                mtime = os.path.getmtime(screener.RESULTS_FILE)
+                df_scr = load_screener_results(screener.RESULTS_FILE, mtime)
+                metrics.payload('screener_table', df_scr)
+                st.dataframe(df_scr, use_container_width=True, hide_index=True)
+                st.caption(f"{len(df_scr)} simboluri | actualizat {datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M')}")
+            else:
+                st.info("Nu există încă un clasament. Rulează `python -m prime.screener univers.csv` (ex. noaptea, din cron).")
 
 else:
-    st.error(f"Nu am găsit date pentru {st.session_state.active_ticker}. Verifică simbolul.")
+    status = data.staleness(st.session_state.active_ticker)
+    if status['retry_in']:
+        st.warning(f"Sursa de date nu răspunde și nu avem încă istoric pentru {st.session_state.active_ticker}. "
+                   f"Reîncercăm în {status['retry_in']:.0f}s.")
+    elif status['syncing']:
+        st.info(f"Descărcăm istoricul pentru {st.session_state.active_ticker} (sursa răspunde greu). "
+                "Reîncarcă pagina în câteva secunde.")
+    else:
+        st.error(f"Nu am găsit date pentru {st.session_state.active_ticker}. Verifică simbolul.")
+
+metrics.end_run()
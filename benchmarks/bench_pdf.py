@@ -0,0 +1,65 @@
+"""Timp CPU și memorie de vârf per raport PDF (și per linie curățată).
+
+    python benchmarks/bench_pdf.py [--reports 200]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prime.report import clean_text_for_pdf, create_extended_pdf  # noqa: E402
+
+INFO = {
+    'longName': 'Ștefănescu Holding Î.S.', 'trailingPE': 22.4, 'pegRatio': 1.3, 'priceToBook': 4.1,
+    'profitMargins': 0.21, 'returnOnEquity': 0.27, 'revenueGrowth': 0.12, 'totalCash': 3.2e10,
+    'totalDebt': 1.1e10, 'currentRatio': 1.8, 'dividendYield': 0.012, 'payoutRatio': 0.25,
+    'sector': 'Tehnologie', 'industry': 'Semiconductori', 'fullTimeEmployees': 26000,
+    'targetMeanPrice': 155.0, 'beta': 1.4,
+}
+REASONS = [
+    "Trend Ascendent (Peste SMA200)", "Preț Bun pt Creștere (PEG: 1.30)",
+    "Management Eficient (ROE: 27.0%)", "Creștere Venituri: 12.0%", "Generează Cash (FCF Pozitiv)",
+]
+LINE = "Compania Ștefănescu 🛡️ are un profil 📈 solid, dar riscul 🔴 rămâne — verdict 💎 GEM în România."
+
+
+def one_report():
+    return create_extended_pdf(
+        ticker="TEST", full_name=INFO['longName'], price=123.45, score=80, reasons=REASONS,
+        verdict="💎 GEM (Oportunitate)", risk={'vol': 31.2, 'dd': -22.5, 'sharpe': 1.35},
+        info=INFO, rsi_val=55.1,
+    )
+
+
+def measure(fn, n):
+    """CPU per apel (fără tracemalloc, care încetinește) și vârful de memorie al unui apel."""
+    fn()  # încălzire
+    cpu = time.process_time()
+    for _ in range(n):
+        fn()
+    cpu = time.process_time() - cpu
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cpu / n, peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reports", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    per_line, _ = measure(lambda: clean_text_for_pdf(LINE), args.reports * 100)
+    per_report, peak = measure(one_report, args.reports)
+    size = len(one_report())
+    print(f"clean_text_for_pdf: {per_line * 1e6:.2f} µs/linie")
+    print(f"create_extended_pdf: {per_report * 1e3:.2f} ms CPU/raport, vârf memorie {peak / 1024:.0f} KiB")
+    print(f"mărime PDF: {size} octeți (base64 inline ar fi {4 * ((size + 2) // 3)} octeți)")
+
+
+if __name__ == "__main__":
+    main()
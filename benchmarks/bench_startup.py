@@ -0,0 +1,88 @@
+"""Pornire la rece și timpul unui rerun al paginii, fără rețea (date sintetice).
+
+    python benchmarks/bench_startup.py [--reruns 20]
+
+Fiecare măsurătoare rulează într-un interpretor nou, ca importurile să fie cu adevărat la rece.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_CHILD = r'''
+import json, sys, time
+t0 = time.perf_counter()
+sys.path.insert(0, ROOT)
+import numpy as np
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+from prime import metadata, store
+
+idx = pd.date_range('2015-01-01', periods=2500, freq='B', tz='America/New_York')
+close = 100 * np.exp(np.cumsum(np.random.default_rng(0).normal(0.0005, 0.02, len(idx))))
+FULL = pd.DataFrame({'Open': close, 'High': close * 1.01, 'Low': close * 0.99, 'Close': close,
+                     'Volume': 1e6, 'Dividends': 0.0, 'Stock Splits': 0.0}, index=idx)
+INFO = {'longName': 'Fake Inc', 'pegRatio': 1.2, 'trailingPE': 20, 'profitMargins': 0.2,
+        'returnOnEquity': 0.3, 'revenueGrowth': 0.1, 'dividendYield': 0.01, 'dividendRate': 1.0}
+store.get_history = lambda t, p='max', revalidate=None: store.slice_period(FULL, p)
+store.sync_history = lambda t: FULL
+metadata.CACHE.loaders.update({
+    'info': lambda t: dict(INFO), 'calendar': lambda t: None, 'insider': lambda t: None,
+    'news': lambda t: [], 'quote': lambda t: 100.0,
+})
+
+at = AppTest.from_file(ROOT + '/AAPP.py', default_timeout=120)
+at.secrets['ACCESS_PASSWORD'] = 'x'
+at.secrets['ADMIN_PASSWORD'] = 'y'
+if LOGGED_IN:
+    at.session_state['access_granted'] = True
+
+runs = []
+for _ in range(RERUNS):
+    t = time.perf_counter()
+    at.run()
+    runs.append(time.perf_counter() - t)
+    assert not at.exception, [e.value for e in at.exception]
+
+heavy = [m for m in ('yfinance', 'plotly', 'fpdf', 'pandas') if m in sys.modules]
+print(json.dumps({'first': runs[0], 'rerun': sorted(runs[1:])[len(runs[1:]) // 2] if len(runs) > 1 else None,
+                  'total': time.perf_counter() - t0, 'heavy': heavy}))
+'''
+
+
+def run_child(logged_in, reruns):
+    code = _CHILD.replace('ROOT', repr(ROOT)).replace('LOGGED_IN', str(logged_in)).replace('RERUNS', str(reruns))
+    # Modulele din harness (numpy/pandas pentru datele false) nu trebuie să mascheze ce importă pagina
+    if not logged_in:
+        code = code.replace('import numpy as np\nimport pandas as pd\n', '', 1)
+        code = code[:code.index('idx = ')] + code[code.index('at = AppTest'):]
+        code = code.replace('from prime import metadata, store\n', '')
+    # Bază de favorite goală, separată de cea reală; fără planificator în fundal
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, PRIME_FAVORITES_DB=os.path.join(tmp, 'favorites.db'), PRIME_PREFETCH='0')
+        out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, cwd=ROOT, env=env)
+    if out.returncode:
+        raise SystemExit(out.stderr)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reruns", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    login = run_child(False, args.reruns)
+    page = run_child(True, args.reruns)
+    print(f"login: prima rulare {login['first'] * 1e3:.0f} ms, rerun {login['rerun'] * 1e3:.1f} ms, "
+          f"module grele încărcate: {login['heavy'] or 'niciunul'}")
+    print(f"pagina principală: prima rulare {page['first'] * 1e3:.0f} ms, rerun {page['rerun'] * 1e3:.1f} ms, "
+          f"module grele încărcate: {page['heavy']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Înlocuitor local pentru modulul `yfinance` (Ticker, download), fără rețea.
+
+`install()` îl pune în `sys.modules`, deci `prime.yfinance()` îl primește în locul celui real.
+"""
+import sys
+import time
+import types
+
+import pandas as pd
+
+from benchmarks.fixtures import SIZES, make_history, make_info
+
+# Cel mai lung istoric "disponibil" la Yahoo-ul fals
+MAX_BARS = SIZES['30y']
+PERIODS = {'1d': 1, '5d': 5, '1mo': 21, '3mo': 63, '6mo': 126, '1y': 252, '2y': 504,
+           '3y': 756, '5y': 1260, '10y': 2520, 'max': MAX_BARS}
+
+calls = []          # (metodă, simbol) - pentru a număra cererile "la rețea"
+latency = 0.0       # secunde adăugate fiecărei cereri, pentru a simula rețeaua
+
+
+def _hit(kind, ticker):
+    calls.append((kind, ticker))
+    if latency:
+        time.sleep(latency)
+
+
+def _history(ticker, period=None, start=None, **kwargs):
+    full = make_history(ticker, MAX_BARS)
+    if start is not None:
+        start = pd.Timestamp(start)
+        if start.tz is None:
+            start = start.tz_localize(full.index.tz)
+        return full[full.index >= start]
+    return full.iloc[-PERIODS.get(period or '1mo', MAX_BARS):]
+
+
+class FakeTicker:
+    def __init__(self, ticker, session=None):
+        self.ticker = ticker.upper()
+
+    def history(self, period=None, start=None, **kwargs):
+        _hit('history', self.ticker)
+        return _history(self.ticker, period, start, **kwargs)
+
+    @property
+    def info(self):
+        _hit('info', self.ticker)
+        return make_info(self.ticker)
+
+    @property
+    def fast_info(self):
+        _hit('quote', self.ticker)
+        return types.SimpleNamespace(last_price=make_history(self.ticker, 1)['Close'].iloc[-1])
+
+    @property
+    def calendar(self):
+        _hit('calendar', self.ticker)
+        return {'Earnings Date': [pd.Timestamp('2026-02-01').date()]}
+
+    @property
+    def insider_transactions(self):
+        _hit('insider', self.ticker)
+        return pd.DataFrame({'Start Date': [pd.Timestamp('2025-12-01')], 'Insider': ['J. Doe'],
+                             'Shares': [1000], 'Text': ['Sale at price 100.00']})
+
+    @property
+    def news(self):
+        _hit('news', self.ticker)
+        return [{'uuid': f"{self.ticker}-{i}", 'title': t} for i, t in enumerate((
+            f"{self.ticker} beats estimates on record profit",
+            f"{self.ticker} shares fall as growth slows",
+            f"Analysts rate {self.ticker} a buy",
+        ))]
+
+
+def download(tickers, period=None, start=None, group_by='column', **kwargs):
+    if isinstance(tickers, str):
+        tickers = tickers.split()
+    frames = {}
+    for t in tickers:
+        _hit('download', t)
+        frames[t] = _history(t.upper(), period, start)
+    out = pd.concat(frames, axis=1)
+    if group_by != 'ticker':
+        out = out.swaplevel(0, 1, axis=1).sort_index(axis=1)
+    return out
+
+
+def install():
+    """Înlocuiește `yfinance` pentru restul procesului și returnează modulul fals."""
+    module = sys.modules[__name__]
+    mod = types.ModuleType('yfinance')
+    mod.Ticker = FakeTicker
+    mod.download = download
+    mod.__fake__ = module
+    sys.modules['yfinance'] = mod
+    return module
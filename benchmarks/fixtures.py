@@ -0,0 +1,75 @@
+"""Date sintetice deterministe: istorii OHLCV, dicționare `info` și universuri de simboluri."""
+import zlib
+
+import numpy as np
+import pandas as pd
+
+# Număr de bare zilnice pentru fiecare orizont
+SIZES = {'1mo': 21, '1y': 252, '5y': 1260, '30y': 7560}
+END = pd.Timestamp('2026-01-02', tz='America/New_York')
+
+
+def _rng(ticker, salt=0):
+    # Același simbol dă mereu aceleași date, indiferent de proces sau de PYTHONHASHSEED
+    return np.random.default_rng(zlib.crc32(ticker.encode()) + salt)
+
+
+def make_history(ticker='TEST', bars=SIZES['5y'], end=END):
+    """Istoric zilnic în formatul `yf.Ticker.history()` (index cu fus orar, Dividends, Stock Splits)."""
+    rng = _rng(ticker)
+    idx = pd.bdate_range(end=end.tz_localize(None), periods=bars).tz_localize(end.tz)
+    close = 50 * np.exp(np.cumsum(rng.normal(0.0004, 0.018, bars)))
+    spread = np.abs(rng.normal(0, 0.01, bars))
+    open_ = close * (1 + rng.normal(0, 0.005, bars))
+    return pd.DataFrame({
+        'Open': open_,
+        'High': np.maximum(open_, close) * (1 + spread),
+        'Low': np.minimum(open_, close) * (1 - spread),
+        'Close': close,
+        'Volume': rng.integers(1e5, 5e7, bars).astype('int64'),
+        'Dividends': 0.0,
+        'Stock Splits': 0.0,
+    }, index=idx)
+
+
+def make_info(ticker='TEST'):
+    """Un dicționar `info` plauzibil, cu toate câmpurile folosite de scor și de raport."""
+    rng = _rng(ticker, 1)
+    return {
+        'symbol': ticker,
+        'longName': f"{ticker} Holdings Inc.",
+        'currentPrice': float(rng.uniform(5, 500)),
+        'trailingPE': float(rng.uniform(5, 60)),
+        'pegRatio': float(rng.uniform(0.3, 4)),
+        'priceToBook': float(rng.uniform(0.5, 20)),
+        'profitMargins': float(rng.uniform(-0.1, 0.4)),
+        'returnOnEquity': float(rng.uniform(-0.1, 0.5)),
+        'revenueGrowth': float(rng.uniform(-0.2, 0.5)),
+        'freeCashflow': float(rng.uniform(-1e9, 1e10)),
+        'totalCash': float(rng.uniform(1e8, 5e10)),
+        'totalDebt': float(rng.uniform(1e8, 5e10)),
+        'currentRatio': float(rng.uniform(0.5, 3)),
+        'dividendYield': float(rng.choice([0, rng.uniform(0.005, 0.06)])),
+        'dividendRate': float(rng.uniform(0, 5)),
+        'payoutRatio': float(rng.uniform(0, 0.8)),
+        'sector': 'Technology',
+        'industry': 'Semiconductors',
+        'fullTimeEmployees': int(rng.integers(100, 200000)),
+        'targetMeanPrice': float(rng.uniform(5, 600)),
+        'beta': float(rng.uniform(0.3, 2.5)),
+    }
+
+
+def make_universe(n):
+    return [f"T{i:04d}" for i in range(n)]
+
+
+def make_close_matrix(tickers, bars=SIZES['5y'], staggered=True):
+    """Matrice date × simboluri; cu `staggered`, o parte din simboluri sunt listate mai târziu (NaN la început)."""
+    cols = {}
+    for i, t in enumerate(tickers):
+        c = make_history(t, bars)['Close']
+        if staggered and i % 4 == 3:
+            c.iloc[:bars // 3] = np.nan
+        cols[t] = c
+    return pd.DataFrame(cols)
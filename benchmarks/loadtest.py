@@ -0,0 +1,195 @@
+"""Load-test: N sesiuni simulate care schimbă simboluri, perioade și tab-uri, pe date înregistrate.
+
+    # 1. Înregistrare (o dată): de la Yahoo, sau din Yahoo-ul fals cu --synthetic
+    python -m benchmarks.loadtest record rec/ --tickers NVDA AAPL MSFT GOOGL AMZN
+    # 2. Redare cu latență și erori injectate
+    python -m benchmarks.loadtest run rec/ --sessions 20 --duration 60 --latency 0.2 --jitter 0.2 --errors 0.02
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "AAPP.py")
+PERIODS = ['1mo', '3mo', '6mo', '1y', '2y', '3y', '5y', 'max']
+DEFAULT_TICKERS = ['NVDA', 'AAPL', 'MSFT', 'GOOGL', 'AMZN', 'META', 'TSLA', 'JPM']
+# Tab-urile paginii (cheia `main_tab`): doar tab-ul deschis se calculează, deci sesiunea trebuie să le deschidă
+TABS = ["📊 Analiză", "📈 Tehnic", "📅 Calendar", "📰 Știri", "💰 Dividende", "📋 Audit (PDF)", "⚔️ Vs", "⏱️ Live",
+        "🔎 Screener"]
+# Acțiune -> (tab-ul în care stă widget-ul, tipul lui, text din etichetă)
+WIDGETS = {
+    'dividend': ("💰 Dividende", 'checkbox', 'Manual'),
+    'compare': ("⚔️ Vs", 'multiselect', 'companii'),
+}
+
+
+def record(directory, tickers, synthetic=False):
+    """Înregistrează tot ce cere pagina pentru fiecare simbol."""
+    if synthetic:
+        from benchmarks import fake_yf
+        fake_yf.install()
+    from prime import providers
+
+    rec = providers.RecordingProvider(directory)
+    for t in tickers:
+        rec.history(t, period="max")
+        for method in ('info', 'calendar', 'insider', 'news'):
+            try:
+                getattr(rec, method)(t)
+            except Exception as e:
+                print(f"{t} {method}: {e}", file=sys.stderr)
+        print(f"înregistrat {t}", file=sys.stderr)
+
+
+def percentile(values, p):
+    if not values:
+        return float('nan')
+    values = sorted(values)
+    k = (len(values) - 1) * p / 100
+    lo, hi = int(k), min(int(k) + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+
+def _widget(at, action):
+    tab, kind, needle = WIDGETS[action]
+    matches = [e for e in getattr(at, kind) if needle in e.label]
+    if not matches:
+        # Fără fallback: o acțiune care nu mai găsește widget-ul ar măsura în tăcere altceva
+        raise RuntimeError(f"{action}: nu găsesc {kind} '{needle}' în tab-ul {tab}")
+    return matches[0]
+
+
+def virtual_user(uid, tickers, duration, think_time):
+    """O sesiune de browser: login, apoi click-uri aleatoare (simbol, perioadă, tab-uri, widget-uri) până expiră timpul.
+
+    Fiecare sesiune rulează în procesul ei: AppTest folosește un Runtime global
+    și nu suportă rulări paralele din thread-uri. Sursa de date și depozitul vin
+    din PRIME_PROVIDER / PRIME_STORE_DIR, setate de run_load.
+    """
+    from streamlit.logger import set_log_level
+    from streamlit.testing.v1 import AppTest
+    from prime import providers
+
+    set_log_level("error")
+    rng = random.Random(uid)
+    at = AppTest.from_file(APP, default_timeout=120)
+    at.secrets['ACCESS_PASSWORD'] = 'loadtest'
+    at.secrets['ADMIN_PASSWORD'] = 'loadtest-admin'
+    at.session_state['access_granted'] = True
+    at.session_state['active_ticker'] = rng.choice(tickers)
+
+    results = []
+    tab = TABS[0]
+
+    def step(action):
+        # AppTest nu ține minte tab-ul între rulări: îl trimitem la fiecare, ca un browser
+        at.session_state['main_tab'] = tab
+        t = time.perf_counter()
+        try:
+            at.run()
+            ok = not at.exception
+        except Exception:
+            ok = False
+        results.append((action, time.perf_counter() - t, ok))
+
+    step('load')
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        if think_time:
+            time.sleep(rng.uniform(0, think_time))
+
+        action = rng.choice(['ticker', 'ticker', 'period', 'tab', 'dividend', 'compare'])
+        if action == 'period':
+            at.select_slider[0].set_value(rng.choice(PERIODS))
+        elif action == 'tab':
+            tab = rng.choice(TABS)
+        elif action in WIDGETS:
+            if tab != WIDGETS[action][0]:
+                # Widget-ul există doar în tab-ul lui: întâi click pe tab (o rulare măsurată separat)
+                tab = WIDGETS[action][0]
+                step('tab')
+            widget = _widget(at, action)
+            if action == 'dividend':
+                widget.set_value(not widget.value)
+            else:
+                widget.set_value(rng.sample(tickers, k=min(3, len(tickers))))
+        else:
+            at.session_state['active_ticker'] = rng.choice(tickers)
+        step(action)
+    return results, providers.get_provider().calls
+
+
+def run_load(directory, sessions, duration, tickers, latency=0.0, jitter=0.0, errors=0.0, think_time=0.0):
+    """Pornește `sessions` utilizatori virtuali pe aceleași date înregistrate."""
+    os.environ['PRIME_PROVIDER'] = (f"replay:{os.path.abspath(directory)}"
+                                    f"?latency={latency}&jitter={jitter}&errors={errors}")
+    os.environ['PRIME_STORE_DIR'] = tempfile.mkdtemp(prefix="prime_loadtest_")
+    os.environ['PRIME_FAVORITES_DB'] = os.path.join(os.environ['PRIME_STORE_DIR'], 'favorites.db')
+    # Prefetch-ul sesiunilor scrie instantanee din `info` redat (cu erori injectate): nu în depozitul real
+    os.environ['PRIME_FUNDAMENTALS_DIR'] = os.path.join(os.environ['PRIME_STORE_DIR'], 'fundamentals')
+    from prime.favorites import FavoritesStore
+    fav_store = FavoritesStore(os.environ['PRIME_FAVORITES_DB'], legacy_json=None)
+    for t in tickers:
+        fav_store.add(t)
+
+    results, calls = [], 0
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=sessions) as pool:
+        futures = [pool.submit(virtual_user, uid, tickers, duration, think_time) for uid in range(sessions)]
+        for fut in futures:
+            user_results, user_calls = fut.result()
+            results.extend(user_results)
+            calls += user_calls
+    return results, time.perf_counter() - started, calls
+
+
+def report(results, elapsed, upstream_calls):
+    print(f"{len(results)} rulări ale paginii în {elapsed:.1f}s -> {len(results) / elapsed:.2f} pagini/s, "
+          f"{upstream_calls} cereri upstream, {sum(1 for *_, ok in results if not ok)} erori")
+    print(f"{'acțiune':10s} {'n':>6s} {'p50 ms':>9s} {'p90 ms':>9s} {'p99 ms':>9s} {'max ms':>9s}")
+    groups = {}
+    for action, seconds, _ in results:
+        groups.setdefault(action, []).append(seconds)
+    groups['TOTAL'] = [s for _, s, _ in results]
+    for action, values in groups.items():
+        ms = [v * 1e3 for v in values]
+        print(f"{action:10s} {len(ms):6d} {statistics.median(ms):9.1f} {percentile(ms, 90):9.1f} "
+              f"{percentile(ms, 99):9.1f} {max(ms):9.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test PRIME Terminal pe date înregistrate.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    rec = sub.add_parser("record", help="Înregistrează răspunsuri pentru redare")
+    rec.add_argument("directory")
+    rec.add_argument("--tickers", nargs="+", default=DEFAULT_TICKERS)
+    rec.add_argument("--synthetic", action="store_true", help="Din Yahoo-ul fals, fără rețea")
+
+    run = sub.add_parser("run", help="Rulează sesiunile simulate")
+    run.add_argument("directory")
+    run.add_argument("--sessions", type=int, default=10)
+    run.add_argument("--duration", type=float, default=30)
+    run.add_argument("--tickers", nargs="+", default=DEFAULT_TICKERS)
+    run.add_argument("--latency", type=float, default=0.0)
+    run.add_argument("--jitter", type=float, default=0.0)
+    run.add_argument("--errors", type=float, default=0.0)
+    run.add_argument("--think-time", type=float, default=0.5, help="Pauza maximă între click-uri (s)")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "record":
+        record(args.directory, [t.upper() for t in args.tickers], args.synthetic)
+    else:
+        results, elapsed, calls = run_load(args.directory, args.sessions, args.duration,
+                                           [t.upper() for t in args.tickers], args.latency,
+                                           args.jitter, args.errors, args.think_time)
+        report(results, elapsed, calls)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""Suita de benchmark-uri pentru căile fierbinți, complet offline.
+
+    python -m benchmarks.run                   # compară cu benchmarks/baseline.json, exit 1 la regresie
+    python -m benchmarks.run --save-baseline   # rescrie baseline-ul (după o optimizare intenționată)
+    python -m benchmarks.run -k rsi            # doar cazurile care conțin "rsi"
+
+Timpii depind de mașină: baseline-ul se regenerează pe mașina pe care rulează verificarea.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks import fake_yf
+from benchmarks.fixtures import SIZES, make_close_matrix, make_history, make_info, make_universe
+
+fake_yf.install()
+
+from prime import backtest, data, fetch, indicators, metadata, store  # noqa: E402
+from prime.report import create_extended_pdf  # noqa: E402
+from prime.scoring import calculate_prime_score, calculate_risk_metrics, calculate_rsi, get_verdict  # noqa: E402
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+# Toleranțe implicite: timpii sunt zgomotoși, memoria mult mai puțin
+TIME_TOLERANCE = 0.5
+MEMORY_TOLERANCE = 0.2
+CONFIRM_ROUNDS = 3
+
+
+def _single_ticker_cases():
+    for size, bars in SIZES.items():
+        h = make_history('AAPL', bars)
+        info = make_info('AAPL')
+        yield f"calculate_rsi[{size}]", lambda h=h: calculate_rsi(h['Close'])
+        yield f"calculate_risk_metrics[{size}]", lambda h=h: calculate_risk_metrics(h)
+        yield f"calculate_prime_score[{size}]", lambda h=h, i=info: calculate_prime_score(i, h)
+
+
+def _matrix_cases():
+    for n in (1, 10, 100, 1000):
+        m = make_close_matrix(make_universe(n), SIZES['5y'])
+        yield f"indicators.indicator_table[5y x {n}]", lambda m=m: indicators.indicator_table(m)
+    m = make_close_matrix(make_universe(100), SIZES['30y'])
+    yield "indicators.indicator_table[30y x 100]", lambda m=m: indicators.indicator_table(m)
+    close, bench = make_history('AAPL', SIZES['30y'])['Close'], make_history('SPY', SIZES['30y'])['Close']
+    yield "indicators.rolling_risk[30y, 3 windows]", lambda: indicators.rolling_risk(close, benchmark=bench)
+
+
+def _backtest_cases():
+    m = make_close_matrix(make_universe(100), SIZES['1y'] * 20)
+    points = {t: backtest.fundamental_points(make_info(t)) for t in m.columns}
+    features = backtest.build_features(m, points)
+    yield "backtest.build_features[20y x 100]", lambda: backtest.build_features(m, points)
+    yield "backtest.run_backtest[prime, 20y x 100]", lambda: backtest.run_backtest(features, 'prime')
+    yield "backtest.run_backtest[rsi, 20y x 100]", lambda: backtest.run_backtest(features, 'rsi')
+
+
+def _pdf_case():
+    h = make_history('AAPL', SIZES['1y'])
+    info = make_info('AAPL')
+    vol, dd, sharpe = calculate_risk_metrics(h)
+    score, reasons = calculate_prime_score(info, h)
+    verdict, _ = get_verdict(score, dd, sharpe)
+    rsi_val = calculate_rsi(h['Close']).iloc[-1]
+
+    def run():
+        return create_extended_pdf('AAPL', info['longName'], h['Close'].iloc[-1], score, reasons, verdict,
+                                   {'vol': vol, 'dd': dd, 'sharpe': sharpe}, info, rsi_val)
+    yield "create_extended_pdf", run
+
+
+def _data_cases():
+    # Depozit temporar: "la rece" = fără fișier pe disc, "la cald" = fișierul există și e proaspăt
+    store.STORE_DIR = tempfile.mkdtemp(prefix="prime_bench_")
+
+    def cold():
+        for p in (store._path('AAPL'), store._compact_path('AAPL')):
+            if os.path.exists(p):
+                os.remove(p)
+        metadata.CACHE.clear()
+        return data.load_stock_data('AAPL', '1y')
+
+    def warm():
+        metadata.CACHE.clear()
+        return data.load_stock_data('AAPL', 'max')
+
+    def comparison():
+        return fetch.fetch_many(make_universe(15), '1y')
+
+    yield "load_stock_data[cold, 30y]", cold
+    yield "load_stock_data[warm, 30y]", warm
+    yield "fetch_many[15 tickers, warm]", comparison
+
+
+def cases():
+    yield from _single_ticker_cases()
+    yield from _matrix_cases()
+    yield from _backtest_cases()
+    yield from _pdf_case()
+    yield from _data_cases()
+
+
+def measure(fn, min_time=0.3, max_repeat=50):
+    """Cel mai bun timp pe apel (ca `timeit`, cel mai stabil între rulări) și vârful de memorie al unui apel separat."""
+    fn()  # încălzire
+    times = []
+    started = time.perf_counter()
+    while len(times) < max_repeat and (len(times) < 3 or time.perf_counter() - started < min_time):
+        t = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'seconds': min(times), 'peak_bytes': peak}
+
+
+def compare(results, baseline, time_tol, mem_tol):
+    """Lista regresiilor (caz, metrică, baseline, acum)."""
+    regressions = []
+    for name, r in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if r['seconds'] > base['seconds'] * (1 + time_tol):
+            regressions.append((name, 'seconds', base['seconds'], r['seconds']))
+        if r['peak_bytes'] > base['peak_bytes'] * (1 + mem_tol):
+            regressions.append((name, 'peak_bytes', base['peak_bytes'], r['peak_bytes']))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark-uri PRIME (offline).")
+    parser.add_argument("-k", dest="filter", default="", help="Rulează doar cazurile care conțin textul dat")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--time-tolerance", type=float, default=TIME_TOLERANCE)
+    parser.add_argument("--memory-tolerance", type=float, default=MEMORY_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    results, fns = {}, {}
+    for name, fn in cases():
+        if args.filter not in name:
+            continue
+        r = measure(fn)
+        results[name], fns[name] = r, fn
+        print(f"{name:45s} {r['seconds'] * 1e3:10.3f} ms {r['peak_bytes'] / 1024:12.0f} KiB")
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline salvat în {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("Nu există baseline; rulează cu --save-baseline.")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.time_tolerance, args.memory_tolerance)
+    # O încetinire izolată poate fi zgomot (mașină încărcată): o confirmăm cu măsurători repetate
+    for _ in range(CONFIRM_ROUNDS):
+        if not any(metric == 'seconds' for _, metric, _, _ in regressions):
+            break
+        for name in {n for n, metric, _, _ in regressions if metric == 'seconds'}:
+            again = measure(fns[name], min_time=1.0)
+            results[name]['seconds'] = min(results[name]['seconds'], again['seconds'])
+        regressions = compare(results, baseline, args.time_tolerance, args.memory_tolerance)
+    for name, metric, old, new in regressions:
+        print(f"REGRESIE {name}: {metric} {old:.6g} -> {new:.6g} ({new / old - 1:+.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
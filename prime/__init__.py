@@ -0,0 +1,7 @@
+"""Nucleul PRIME Terminal: date, calcule și rapoarte, fără dependență de Streamlit."""
+
+
+def yfinance():
+    """Importă yfinance abia la prima cerere către Yahoo (importul costă ~0.5s la pornire)."""
+    import yfinance as yf
+    return yf
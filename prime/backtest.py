@@ -0,0 +1,370 @@
+"""Backtest istoric pentru semnalele PRIME (verdictul) și RSI 70/30, vectorizat pe (date × simboluri).
+
+Semnalele se recalculează "point in time": la închiderea zilei t se folosesc doar barele până
+la t, pe o fereastră de `window` bare (implicit 252 = perioada '1y' din pagină; None = tot
+istoricul disponibil, ca 'max'). Poziția luată la închiderea lui t câștigă randamentul lui t+1.
+Portofoliul e egal ponderat între pozițiile deschise, rebalansat zilnic; costul se aplică pe turnover.
+
+Caracteristicile (scor, Sharpe, drawdown, RSI) se calculează o singură dată; un sweep de praguri
+doar le compară din nou, pe mai multe procese care citesc aceleași matrice prin memory-map.
+
+Atenție: 80 din cele 100 de puncte ale scorului vin din `info`, iar yfinance dă doar valorile
+de azi. Implicit ele sunt constante în timp (look-ahead); cu `--fundamentals snapshots` se
+folosesc instantaneele zilnice din prime.fundamentals, valabile doar de la prima zi salvată.
+
+Rulare fără UI:
+    python -m prime.backtest sp500.csv --strategy prime --start 2006-01-01
+    python -m prime.backtest sp500.csv --strategy rsi --sweep --workers 8
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from prime import fetch, indicators, throttle
+from prime.indicators import RISK_FREE_RATE, TRADING_DAYS
+from prime.scoring import calculate_prime_score
+
+TREND_WINDOW = 200
+TREND_POINTS = 20
+COST_BPS = 10
+ARRAYS = ('returns', 'score', 'sharpe', 'max_dd', 'rsi')
+
+# Pragurile din `get_verdict` și din tab-ul Tehnic
+DEFAULTS = {
+    'prime': {'solid': 60, 'gem_score': 70, 'gem_sharpe': 1.0, 'crash_dd': -50},
+    'rsi': {'oversold': 30, 'overbought': 70},
+}
+SWEEP_GRID = {
+    'prime': {'solid': [50, 60, 70], 'gem_sharpe': [0.5, 1.0, 1.5], 'crash_dd': [-30, -40, -50]},
+    'rsi': {'oversold': [20, 25, 30, 35], 'overbought': [65, 70, 75, 80]},
+}
+
+
+def fundamental_points(info):
+    """Partea din scorul PRIME care nu depinde de preț (evaluare, eficiență, creștere, siguranță)."""
+    return calculate_prime_score(info, pd.DataFrame())[0]
+
+
+def _window_sum(cs, window):
+    # Sume pe ferestre glisante din sume cumulate (cs are un rând de zero în față)
+    out = np.full((cs.shape[0] - 1, cs.shape[1]), np.nan)
+    out[window - 1:] = cs[window:] - cs[:-window]
+    return out
+
+
+def _window_drawdown(x, window):
+    """Max drawdown (fracție) în fiecare fereastră de `window` bare care se termină la t.
+
+    Drawdown-ul maxim e cel mai mic raport x[j] / x[i] cu i <= j și se compune pe două bucăți
+    alăturate A, B: min(dd(A), dd(B), min(B) / max(A)). Ca în `indicators.rolling_max`, seria
+    se împarte în blocuri de `window`; fereastra = sufixul blocului în care începe + prefixul
+    blocului în care se termină, iar prefixele / sufixele vin din `accumulate` pe blocuri, în O(n).
+    NaN-urile sunt ignorate (ca `fmax` / `fmin`); apelanții maschează ferestrele incomplete.
+    """
+    n, k = x.shape
+    out = np.full(x.shape, np.nan)
+    if n < window:
+        return out
+    blocks = -(-n // window)
+    padded = np.full((blocks * window, k), np.nan)
+    padded[:n] = x
+    b = padded.reshape(blocks, window, k)
+    rev = b[:, ::-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pre_min = np.fmin.accumulate(b, axis=1).reshape(-1, k)
+        pre_dd = np.fmin.accumulate(b / np.fmax.accumulate(b, axis=1), axis=1).reshape(-1, k)
+        suf_min = np.fmin.accumulate(rev, axis=1)[:, ::-1]
+        suf_max = np.fmax.accumulate(rev, axis=1)[:, ::-1].reshape(-1, k)
+        # Cel mai mic x[j] / x[i] cu i, j între bara curentă și capătul blocului
+        suf_dd = np.fmin.accumulate((suf_min / b)[:, ::-1], axis=1)[:, ::-1].reshape(-1, k)
+
+        end = np.arange(window - 1, n)
+        start = end - window + 1
+        low = np.fmin(suf_dd[start], np.fmin(pre_dd[end], pre_min[end] / suf_max[start]))
+    # Fereastra care e exact un bloc: doar sufixul (prefixul ar fi același bloc)
+    aligned = start % window == 0
+    low[aligned] = suf_dd[start[aligned]]
+    out[window - 1:] = np.fmin(low, 1.0) - 1
+    return out
+
+
+def build_features(closes, fundamentals=None, window=TRADING_DAYS, risk_free_rate=RISK_FREE_RATE, start=None):
+    """Matricele de lucru pentru un backtest, calculate o singură dată.
+
+    `closes`: prețuri de închidere (date × simboluri), ca `fetch.fetch_many`.
+    `fundamentals`: punctele fundamentale pe simbol (Series) sau pe dată și simbol (DataFrame);
+    lipsă = 0. `start`: prima dată evaluată (barele dinainte servesc doar la încălzire).
+    """
+    closes = closes.sort_index().ffill()
+    x = closes.to_numpy(dtype='float64', na_value=np.nan)
+    n, k = x.shape
+    first = indicators._first_valid(x)
+    bars = np.arange(n)[:, None] - first[None, :] + 1   # câte bare are simbolul până la t, inclusiv
+
+    returns = np.full(x.shape, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns[1:] = x[1:] / x[:-1] - 1
+
+    # Sharpe pe randamentele din fereastră (ca `risk_metrics` pe istoricul tăiat la perioadă)
+    r = np.nan_to_num(returns)
+    cs1 = np.vstack([np.zeros((1, k)), np.cumsum(r, axis=0)])
+    cs2 = np.vstack([np.zeros((1, k)), np.cumsum(r * r, axis=0)])
+    if window is None:
+        count = np.maximum(bars - 1, 0).astype(float)
+        s1, s2 = cs1[1:], cs2[1:]
+        ready = bars >= 2
+    else:
+        count = np.full(x.shape, window - 1.0)
+        s1, s2 = _window_sum(cs1, window - 1), _window_sum(cs2, window - 1)
+        ready = bars >= window
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = s1 / count
+        std = np.sqrt(np.maximum(s2 - count * mean * mean, 0) / (count - 1))
+        annual_std = std * np.sqrt(TRADING_DAYS)
+        sharpe = np.where(annual_std == 0, 0.0, (mean * TRADING_DAYS - risk_free_rate) / annual_std)
+
+    # Max drawdown în fereastră (%)
+    if window is None:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            max_dd = np.fmin.accumulate(x / np.fmax.accumulate(x, axis=0), axis=0) - 1
+    else:
+        max_dd = _window_drawdown(x, window)
+    max_dd *= 100
+
+    # Trend: SMA200 dacă fereastra are mai mult de 200 de bare, altfel media ferestrei
+    sma200 = indicators._rolling_mean(x, TREND_WINDOW, first)
+    if window is None:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            period_mean = np.vstack([np.zeros((1, k)), np.cumsum(np.nan_to_num(x), axis=0)])[1:] / bars
+        sma = np.where(bars > TREND_WINDOW, sma200, period_mean)
+    elif window > TREND_WINDOW:
+        sma = sma200
+    else:
+        sma = indicators._rolling_mean(x, window, first)
+    with np.errstate(invalid='ignore'):
+        score = np.where(x > sma, float(TREND_POINTS), 0.0)
+
+    if isinstance(fundamentals, pd.DataFrame):
+        fund = fundamentals.reindex(index=closes.index, columns=closes.columns).ffill().fillna(0).to_numpy(float)
+    elif fundamentals is not None:
+        fund = pd.Series(fundamentals).reindex(closes.columns).fillna(0).to_numpy(float)[None, :]
+    else:
+        fund = 0.0
+    score = score + fund
+
+    for arr in (score, sharpe, max_dd):
+        arr[~ready] = np.nan
+
+    features = {
+        'dates': closes.index, 'tickers': closes.columns, 'window': window,
+        'returns': returns, 'score': score, 'sharpe': sharpe, 'max_dd': max_dd,
+        'rsi': indicators.rsi(closes).to_numpy(),
+    }
+    if start is not None:
+        rows = closes.index.searchsorted(pd.Timestamp(start))
+        features['dates'] = closes.index[rows:]
+        for name in ARRAYS:
+            features[name] = features[name][rows:]
+    return features
+
+
+def save_features(features, directory):
+    """Matricele ca .npy (citite apoi prin memory-map de procesele unui sweep)."""
+    for name in ARRAYS:
+        np.save(os.path.join(directory, f"{name}.npy"), features[name])
+    meta = {'dates': [d.isoformat() for d in features['dates']], 'tickers': list(features['tickers']),
+            'window': features['window']}
+    with open(os.path.join(directory, "meta.json"), "w") as f:
+        json.dump(meta, f)
+
+
+def load_features(directory, mmap=True):
+    with open(os.path.join(directory, "meta.json")) as f:
+        meta = json.load(f)
+    features = {'dates': pd.DatetimeIndex(meta['dates']), 'tickers': pd.Index(meta['tickers']),
+                'window': meta['window']}
+    for name in ARRAYS:
+        features[name] = np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r' if mmap else None)
+    return features
+
+
+def prime_signal(features, solid=60, gem_score=70, gem_sharpe=1.0, crash_dd=-50):
+    """Long când verdictul ar fi "GEM" sau "Solid" (regulile din `get_verdict`)."""
+    score, sharpe, dd = features['score'], features['sharpe'], features['max_dd']
+    with np.errstate(invalid='ignore'):
+        gem = (sharpe > gem_sharpe) & (score > gem_score)
+        return (dd >= crash_dd) & (gem | (score > solid))
+
+
+def rsi_signal(features, oversold=30, overbought=70):
+    """Intrare când RSI < `oversold`, ieșire când RSI > `overbought`; între praguri se păstrează starea."""
+    rsi = features['rsi']
+    with np.errstate(invalid='ignore'):
+        event = np.where(rsi < oversold, 1, np.where(rsi > overbought, -1, 0)).astype(np.int8)
+    # Ultimul eveniment (intrare / ieșire) până la fiecare dată, fără buclă pe zile
+    rows = np.where(event != 0, np.arange(len(event))[:, None], -1)
+    last = np.maximum.accumulate(rows, axis=0)
+    state = np.take_along_axis(event, np.maximum(last, 0), axis=0)
+    return (last >= 0) & (state == 1)
+
+
+SIGNALS = {'prime': prime_signal, 'rsi': rsi_signal}
+
+
+def simulate(returns, signal, cost_bps=COST_BPS):
+    """Portofoliul egal ponderat și tranzacțiile pe simbol, dintr-o matrice de semnale."""
+    returns = np.asarray(returns)
+    r = np.nan_to_num(returns)
+    held = np.zeros(signal.shape, dtype=bool)
+    held[1:] = signal[:-1]          # semnalul de la închiderea t se tranzacționează pe randamentul t+1
+    held &= ~np.isnan(returns)
+
+    n_held = held.sum(axis=1)
+    weights = held / np.maximum(n_held, 1)[:, None]
+    turnover = np.abs(np.diff(weights, axis=0, prepend=0)).sum(axis=1)
+    daily = (weights * r).sum(axis=1) - turnover * cost_bps / 1e4
+
+    # Tranzacții: secvențe continue de zile deținute, pe fiecare simbol (ordinea din nonzero le împerechează)
+    log_growth = np.vstack([np.zeros((1, r.shape[1])), np.cumsum(np.log1p(r * held), axis=0)])
+    edges = np.diff(np.pad(held.T.astype(np.int8), ((0, 0), (1, 1))), axis=1)
+    cols, opens = np.nonzero(edges == 1)
+    _, closes = np.nonzero(edges == -1)
+    trade_returns = np.expm1(log_growth[closes, cols] - log_growth[opens, cols])
+    trades = pd.DataFrame({'col': cols, 'open': opens, 'close': closes, 'return': trade_returns})
+    return {'daily': daily, 'turnover': turnover, 'exposure': n_held, 'trades': trades}
+
+
+def summarize(sim):
+    """Randament, risc, rata de câștig și turnover pentru un portofoliu simulat."""
+    daily = sim['daily']
+    equity = np.cumprod(1 + daily)
+    years = len(daily) / TRADING_DAYS
+    std = daily.std(ddof=1) * np.sqrt(TRADING_DAYS) if len(daily) > 1 else np.nan
+    trades = sim['trades']['return']
+    return {
+        'Randament (%)': (equity[-1] - 1) * 100 if len(equity) else 0.0,
+        'CAGR (%)': (equity[-1] ** (1 / years) - 1) * 100 if years else 0.0,
+        'Volatilitate (%)': std * 100,
+        'Sharpe': (daily.mean() * TRADING_DAYS - RISK_FREE_RATE) / std if std else 0.0,
+        'Max Drawdown (%)': (equity / np.maximum.accumulate(equity) - 1).min() * 100 if len(equity) else 0.0,
+        'Tranzacții': len(trades),
+        'Rata de câștig (%)': (trades > 0).mean() * 100 if len(trades) else np.nan,
+        'Câștig mediu (%)': trades.mean() * 100 if len(trades) else np.nan,
+        'Expunere (%)': (sim['exposure'] > 0).mean() * 100,
+        'Turnover anual': sim['turnover'].mean() * TRADING_DAYS,
+    }
+
+
+def run_backtest(features, strategy='prime', cost_bps=COST_BPS, **params):
+    """Un backtest complet: curba de capital, tranzacțiile și sumarul."""
+    params = {**DEFAULTS[strategy], **params}
+    sim = simulate(features['returns'], SIGNALS[strategy](features, **params), cost_bps)
+    trades = sim['trades']
+    dates, tickers = features['dates'], features['tickers']
+    return {
+        'params': params,
+        'equity': pd.Series(np.cumprod(1 + sim['daily']), index=dates, name=strategy),
+        'trades': pd.DataFrame({
+            'Simbol': tickers[trades['col']],
+            'Intrare': dates[trades['open'] - 1],
+            'Ieșire': dates[trades['close'] - 1],
+            'Randament (%)': trades['return'] * 100,
+        }),
+        'summary': summarize(sim),
+    }
+
+
+def _sweep_chunk(directory, strategy, cost_bps, combos):
+    features = load_features(directory)
+    rows = []
+    for params in combos:
+        sim = simulate(features['returns'], SIGNALS[strategy](features, **{**DEFAULTS[strategy], **params}),
+                       cost_bps)
+        rows.append({**params, **summarize(sim)})
+    return rows
+
+
+def sweep(features, grid=None, strategy='prime', cost_bps=COST_BPS, workers=None):
+    """Toate combinațiile de praguri din `grid`, împărțite pe procese; sortate după Sharpe."""
+    grid = grid or SWEEP_GRID[strategy]
+    combos = [dict(zip(grid, values)) for values in itertools.product(*grid.values())]
+    workers = min(workers or os.cpu_count(), len(combos))
+    with tempfile.TemporaryDirectory(prefix="prime_backtest_") as tmp:
+        save_features(features, tmp)
+        if workers <= 1:
+            rows = _sweep_chunk(tmp, strategy, cost_bps, combos)
+        else:
+            chunks = [combos[i::workers] for i in range(workers)]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_sweep_chunk, tmp, strategy, cost_bps, c) for c in chunks]
+                rows = [row for fut in futures for row in fut.result()]
+    return pd.DataFrame(rows).sort_values('Sharpe', ascending=False).reset_index(drop=True)
+
+
+def load_universe_features(tickers, window=TRADING_DAYS, start=None, fundamentals='today'):
+    """Istoricul complet din depozit plus punctele fundamentale -> caracteristici.
+
+    `fundamentals`: 'today' (valorile de azi, constante în timp), 'snapshots' (din instantaneele
+    zilnice, fără look-ahead; 0 puncte înainte de primul instantaneu) sau None.
+    """
+    with throttle.priority(throttle.BATCH):
+        closes, infos, errors = fetch.fetch_many(tickers, 'max')
+    if fundamentals == 'snapshots':
+        from prime.fundamentals import get_store
+        points = get_store().points_history(list(closes.columns), closes.index)
+    elif fundamentals:
+        points = {t: fundamental_points(infos.get(t)) for t in closes.columns}
+    else:
+        points = None
+    return build_features(closes, points, window, start=start), errors
+
+
+def main(argv=None):
+    from prime.screener import load_universe
+
+    parser = argparse.ArgumentParser(description="Backtest pentru semnalele PRIME / RSI.")
+    parser.add_argument("universe", help="CSV cu simboluri (aceeași formă ca pentru screener)")
+    parser.add_argument("--strategy", choices=sorted(SIGNALS), default="prime")
+    parser.add_argument("--window", type=int, default=TRADING_DAYS, help="Bare per fereastră; 0 = tot istoricul")
+    parser.add_argument("--start", default=None, help="Prima dată evaluată (YYYY-MM-DD)")
+    parser.add_argument("--fundamentals", choices=['today', 'snapshots'], default='today',
+                        help="Fundamentalele de azi (look-ahead) sau cele din prime.fundamentals, la fiecare dată")
+    parser.add_argument("--cost-bps", type=float, default=COST_BPS)
+    parser.add_argument("--sweep", action="store_true", help="Caută pragurile pe grila implicită")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", default=None, help="CSV pentru curba de capital sau pentru rezultatele sweep-ului")
+    args = parser.parse_args(argv)
+
+    tickers = load_universe(args.universe)
+    start = time.perf_counter()
+    features, errors = load_universe_features(tickers, args.window or None, args.start,
+                                              fundamentals=args.fundamentals if args.strategy == 'prime' else None)
+    loaded = time.perf_counter()
+    for t, err in errors.items():
+        print(f"{t}: {err}", file=sys.stderr)
+
+    if args.sweep:
+        table = sweep(features, strategy=args.strategy, cost_bps=args.cost_bps, workers=args.workers)
+        print(table.to_string(index=False))
+        if args.out:
+            table.to_csv(args.out, index=False)
+    else:
+        result = run_backtest(features, args.strategy, args.cost_bps)
+        for key, value in result['summary'].items():
+            print(f"{key:20s} {value:12.2f}")
+        if args.out:
+            result['equity'].to_csv(args.out)
+    print(f"{len(features['tickers'])} simboluri × {len(features['dates'])} zile: date {loaded - start:.1f}s, "
+          f"backtest {time.perf_counter() - loaded:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Rapoarte PDF de audit în lot (toate favoritele sau o listă), scrise direct într-o arhivă ZIP.
+
+Rulare fără UI:
+    python -m prime.batch_reports --out rapoarte.zip
+    python -m prime.batch_reports --tickers NVDA AAPL MSFT --workers 4
+"""
+import argparse
+import csv
+import io
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+
+from prime import fetch, indicators, metadata, store, throttle
+from prime.favorites import load_db
+from prime.report import create_extended_pdf
+from prime.scoring import calculate_prime_score, calculate_risk_metrics, get_verdict
+
+# Câte simboluri aducem la zi într-o singură descărcare în lot
+CHUNK_SIZE = 25
+TIMING_COLUMNS = ['Simbol', 'Date (s)', 'Calcul (s)', 'PDF (s)', 'Total (s)', 'Octeți', 'Eroare']
+
+
+def build_report(ticker, period="1y", info=None, history=None):
+    """Un raport complet; istoricul vine din depozitul local.
+
+    În `run_batch`, `info` și `history` vin gata aduse de procesul părinte: un worker are propria
+    limită de rată și propriul cache de metadate, deci n-are voie să vorbească cu sursa.
+    Apelat direct, fără ele, le aduce singur.
+    """
+    timing = {'Simbol': ticker, 'Eroare': ''}
+    t0 = time.perf_counter()
+    try:
+        with throttle.priority(throttle.BATCH):
+            if history is None:
+                history = store.get_history(ticker, period)
+            if info is None:
+                info = metadata.get_info(ticker)
+        t1 = time.perf_counter()
+        if history.empty:
+            raise ValueError("Fără date de preț.")
+
+        price = history['Close'].iloc[-1]
+        volatility, max_dd, sharpe = calculate_risk_metrics(history)
+        score, reasons = calculate_prime_score(info, history)
+        verdict, _ = get_verdict(score, max_dd, sharpe)
+        rsi_val = indicators.rsi(history['Close']).iloc[-1]
+        t2 = time.perf_counter()
+
+        pdf_bytes = create_extended_pdf(
+            ticker=ticker,
+            full_name=info.get('longName', ticker),
+            price=price,
+            score=score,
+            reasons=reasons,
+            verdict=verdict,
+            risk={'vol': volatility, 'dd': max_dd, 'sharpe': sharpe},
+            info=info,
+            rsi_val=rsi_val,
+        )
+        t3 = time.perf_counter()
+        timing.update({'Date (s)': round(t1 - t0, 4), 'Calcul (s)': round(t2 - t1, 4),
+                       'PDF (s)': round(t3 - t2, 4), 'Total (s)': round(t3 - t0, 4), 'Octeți': len(pdf_bytes)})
+        return ticker, pdf_bytes, timing
+    except Exception as e:
+        timing.update({'Total (s)': round(time.perf_counter() - t0, 4), 'Eroare': str(e)})
+        return ticker, None, timing
+
+
+def run_batch(tickers, out_path, period="1y", workers=None, progress=None):
+    """Generează rapoartele pe un pool de procese și le scrie în ZIP pe măsură ce sunt gata.
+
+    Cel mult `2 × workers` rapoarte sunt în memorie în același timp. Toate cererile la sursă
+    rulează aici, sub o singură limită de rată: istoricul se aduce la zi în depozit în loturi
+    de CHUNK_SIZE, `.info` o singură dată prin cache-ul comun; workerii primesc doar datele
+    și fac calculul și randarea.
+    """
+    workers = workers or os.cpu_count()
+    tickers = list(tickers)
+    with throttle.priority(throttle.BATCH):
+        for i in range(0, len(tickers), CHUNK_SIZE):
+            fetch.fetch_histories(tickers[i:i + CHUNK_SIZE])
+        infos, errors = fetch.fetch_infos(tickers)
+    timings = []
+    date = datetime.now().strftime('%Y-%m-%d')
+    pending_tickers = iter(tickers)
+
+    with zipfile.ZipFile(out_path, 'w', zipfile.ZIP_DEFLATED) as zf, \
+            ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = set()
+
+        def finish(timing):
+            timings.append(timing)
+            if progress:
+                progress(timing, len(timings), len(tickers))
+
+        def submit_next():
+            for t in pending_tickers:
+                if t in errors:
+                    # Fără `info` nu generăm un raport cu scor greșit; sursa nu se reîncearcă din worker
+                    finish({'Simbol': t, 'Eroare': errors[t]})
+                    continue
+                history = store.slice_period(store.load_compact(t), period)
+                in_flight.add(pool.submit(build_report, t, period, infos[t], history))
+                return
+
+        for _ in range(workers * 2):
+            submit_next()
+
+        while in_flight:
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                in_flight.discard(fut)
+                ticker, pdf_bytes, timing = fut.result()
+                if pdf_bytes is not None:
+                    zf.writestr(f"Raport_Audit_{ticker}_{date}.pdf", pdf_bytes)
+                finish(timing)
+                submit_next()
+
+        # Sumarul cu timpii pe simbol merge și el în arhivă
+        buf = io.StringIO()
+        writer = csv.DictWriter(buf, fieldnames=TIMING_COLUMNS)
+        writer.writeheader()
+        writer.writerows(timings)
+        zf.writestr("timpi_generare.csv", buf.getvalue())
+
+    return timings
+
+
+def _print_progress(timing, n, total):
+    status = timing['Eroare'] or f"{timing['Total (s)']:.2f}s"
+    print(f"[{n}/{total}] {timing['Simbol']}: {status}", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rapoarte PDF PRIME pentru toată lista de favorite.")
+    parser.add_argument("--tickers", nargs="*", help="Implicit: lista principală de favorite")
+    parser.add_argument("--out", default=f"rapoarte_{datetime.now().strftime('%Y%m%d')}.zip")
+    parser.add_argument("--period", default="1y")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    tickers = [t.upper() for t in args.tickers] if args.tickers else load_db().get("favorites", [])
+    if not tickers:
+        parser.error("Nu există simboluri (lista de favorite e goală).")
+
+    start = time.perf_counter()
+    timings = run_batch(tickers, args.out, args.period, args.workers, progress=_print_progress)
+    ok = sum(1 for t in timings if not t['Eroare'])
+    print(f"{ok}/{len(timings)} rapoarte în {time.perf_counter() - start:.1f}s -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Accesul la date pentru un simbol: istoric din depozitul local, `info` din cache-ul comun.
+
+Pagina nu așteaptă sursa mai mult de DEADLINE secunde pe rerun (istoric și `info` în
+paralel, același termen pentru amândouă). Dacă termenul trece, cererea continuă în fundal -
+rerun-ul următor o așteaptă pe ea, nu pornește alta - iar pagina se desenează din ultimele
+date bune (depozit / cache), cu vechimea lor afișată (vezi `staleness`).
+
+    PRIME_PAGE_DEADLINE=3     secunde cât așteaptă pagina sursa
+    PRIME_STALE_AFTER=900     vechime (secunde) de la care datele se afișează ca vechi
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from prime import metadata, metrics, prefetch, store, throttle
+
+# Reperul pentru beta (tab-ul Tehnic)
+BENCHMARK = os.environ.get("PRIME_BENCHMARK", "SPY")
+
+DEADLINE = float(os.environ.get("PRIME_PAGE_DEADLINE", 3))
+STALE_AFTER = float(os.environ.get("PRIME_STALE_AFTER", 15 * 60))
+DEADLINE_WORKERS = 8
+
+_pool = None
+_pending = {}  # (tip, simbol, ...) -> Future încă în zbor
+_pending_lock = threading.Lock()
+
+
+def deadline(budget=None):
+    """Momentul (time.monotonic) până la care pagina mai așteaptă sursa."""
+    return time.monotonic() + (DEADLINE if budget is None else budget)
+
+
+def _start(key, fn, *args):
+    # Un singur apel în zbor per cheie: un rerun care a rămas fără timp nu pornește încă o cerere
+    global _pool
+    with _pending_lock:
+        fut = _pending.get(key)
+        if fut is not None:
+            return fut
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=DEADLINE_WORKERS, thread_name_prefix="prime-page")
+        fut = _pending[key] = _pool.submit(throttle.bind(fn), *args)
+
+    def done(f):
+        with _pending_lock:
+            if _pending.get(key) is f:
+                del _pending[key]
+    fut.add_done_callback(done)
+    return fut
+
+
+def _wait(fut, stage, until):
+    """Rezultatul lui `fut` dacă vine până la `until`; altfel ridică TimeoutError (apelul continuă)."""
+    try:
+        return fut.result(timeout=max(0.0, until - time.monotonic()))
+    except FutureTimeout:
+        metrics.count('deadline_exceeded_total', stage=stage)
+        raise TimeoutError(stage) from None
+
+
+def _get_history(ticker, period):
+    return store.get_history(ticker, period, revalidate=prefetch.revalidate_history)
+
+
+def load_history(ticker, period, until=None):
+    """Doar istoricul (fără `info`); DataFrame gol dacă nu există date.
+
+    Dacă sursa nu răspunde până la `until` (sau dă eroare), servește ce e în depozit, oricât de vechi.
+    """
+    until = deadline() if until is None else until
+    try:
+        with metrics.timer('history'):
+            return _wait(_start(('history', ticker.upper(), period), _get_history, ticker, period), 'history', until)
+    except Exception:
+        return store.slice_period(store.load_compact(ticker), period)
+
+
+def load_info(ticker, until=None):
+    """`info` din cache-ul comun; dacă sursa nu răspunde la timp, ultima versiune bună (sau {})."""
+    until = deadline() if until is None else until
+    try:
+        with metrics.timer('info'):
+            return _wait(_start(('info', ticker.upper()), metadata.get_info, ticker, prefetch.revalidate_meta),
+                         'info', until)
+    except Exception:
+        return metadata.CACHE.peek(ticker, 'info')[1] or {}
+
+
+def load_quote(ticker, until=None):
+    """Ultimul preț (cache de câteva secunde); None dacă sursa nu răspunde la timp și nu avem unul vechi."""
+    until = deadline() if until is None else until
+    try:
+        with metrics.timer('quote'):
+            return _wait(_start(('quote', ticker.upper()), metadata.get_quote, ticker, prefetch.revalidate_meta),
+                         'quote', until)
+    except Exception:
+        return metadata.CACHE.peek(ticker, 'quote')[1]
+
+
+def load_stock_data(ticker, period, until=None):
+    """(istoric, info) pentru un simbol; nu ridică excepții, întoarce structuri goale."""
+    # REPARATIE: Separăm istoric de info. Dacă info crapă, istoricul rămâne.
+    until = deadline() if until is None else until
+
+    # 2. Info (Opțional dar important) - pornit primul, ca să curgă în paralel cu istoricul
+    _start(('info', ticker.upper()), metadata.get_info, ticker, prefetch.revalidate_meta)
+
+    # 1. Istoric (Critic) - din depozitul local, Yahoo dă doar barele noi.
+    # Dacă avem deja un istoric (chiar vechi), îl servim imediat și delta vine în fundal
+    h = load_history(ticker, period, until)
+    i = load_info(ticker, until)
+    return h, i
+
+
+def staleness(ticker):
+    """Cât de vechi sunt datele servite pentru `ticker` și dacă sursa e indisponibilă.
+
+    {'history': secunde de la ultima sincronizare, 'info': secunde de la ultima încărcare,
+     'syncing': o cerere e încă în zbor, 'retry_in': secunde până sursa e întrebată din nou (0 = disponibilă)}
+    """
+    t = ticker.upper()
+    with _pending_lock:
+        syncing = any(key[1] == t for key in _pending)
+    breakers = throttle.stats()['breakers']
+    return {
+        'history': store.age(t),
+        'info': metadata.CACHE.age(t, 'info'),
+        'syncing': syncing,
+        'retry_in': max((b['retry_in'] for m, b in breakers.items() if m in ('history', 'info')), default=0.0),
+    }
+
+
+def age_label(seconds):
+    """'acum 5 min', 'acum 3 h', 'acum 2 zile'."""
+    if seconds == float('inf'):
+        return "niciodată"
+    if seconds < 90:
+        return "acum un minut"
+    if seconds < 90 * 60:
+        return f"acum {seconds / 60:.0f} min"
+    if seconds < 36 * 3600:
+        return f"acum {seconds / 3600:.0f} h"
+    return f"acum {seconds / 86400:.0f} zile"
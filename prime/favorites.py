@@ -0,0 +1,204 @@
+"""Listele de favorite: SQLite în mod WAL, actualizări atomice pe rând, mai multe liste numite.
+
+Fiecare scriere e o tranzacție scurtă care modifică doar rândurile atinse și incrementează
+`version`; sesiunile compară versiunea (un SELECT pe un rând) și recitesc lista doar când
+altcineva a schimbat-o. Vechiul prime_favorites.json se importă o singură dată, automat.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DB_PATH = os.environ.get("PRIME_FAVORITES_DB", "prime_favorites.db")
+LEGACY_JSON = "prime_favorites.json"
+DEFAULT_LIST = "Principală"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS watchlists (name TEXT PRIMARY KEY, created REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS favorites (
+    watchlist TEXT NOT NULL REFERENCES watchlists(name) ON DELETE CASCADE,
+    ticker TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    added REAL NOT NULL,
+    PRIMARY KEY (watchlist, ticker)
+);
+CREATE TABLE IF NOT EXISTS names (ticker TEXT PRIMARY KEY, name TEXT NOT NULL);
+INSERT OR IGNORE INTO meta VALUES ('version', 0);
+"""
+
+
+class FavoritesStore:
+    """Acces la baza de favorite; o singură conexiune per proces, folosită pe rând de toate thread-urile.
+
+    Streamlit rulează fiecare rerun în alt thread: o conexiune per thread ar însemna una nouă
+    la fiecare rerun, niciodată închisă. Operațiile durează microsecunde, deci un lock e suficient;
+    între procese ordinea o păstrează tot SQLite (WAL + BEGIN IMMEDIATE).
+    """
+
+    def __init__(self, path=DB_PATH, legacy_json=LEGACY_JSON):
+        self.path = path
+        self._lock = threading.RLock()
+        self._db = None
+        self._init(legacy_json)
+
+    def _conn(self):
+        # Apelantul ține `self._lock`
+        if self._db is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._db = conn
+        return self._db
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn().execute(sql, params).fetchall()
+
+    def _write(self):
+        return _Transaction(self)
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _init(self, legacy_json):
+        with self._lock:
+            self._conn().executescript(SCHEMA)
+        with self._write() as conn:
+            conn.execute("INSERT OR IGNORE INTO watchlists VALUES (?, ?)", (DEFAULT_LIST, time.time()))
+            migrated = conn.execute("SELECT 1 FROM meta WHERE key = 'migrated_json'").fetchone()
+            if migrated or not legacy_json or not os.path.exists(legacy_json):
+                return
+            try:
+                with open(legacy_json, "r") as f:
+                    legacy = json.load(f)
+            except (OSError, ValueError):
+                # Fișier stricat: nu-l marcăm ca importat și nu-l atingem, se reîncearcă la pornire
+                return
+            for pos, ticker in enumerate(legacy.get("favorites", [])):
+                conn.execute("INSERT OR IGNORE INTO favorites VALUES (?, ?, ?, ?)",
+                             (DEFAULT_LIST, ticker, pos, time.time()))
+            conn.executemany("INSERT OR REPLACE INTO names VALUES (?, ?)", legacy.get("names", {}).items())
+            conn.execute("INSERT INTO meta VALUES ('migrated_json', 1)")
+            _bump(conn)
+
+    def version(self):
+        return self._query("SELECT value FROM meta WHERE key = 'version'")[0][0]
+
+    def watchlists(self):
+        rows = self._query("SELECT name FROM watchlists ORDER BY created, name")
+        return [r[0] for r in rows]
+
+    def tickers(self, watchlist=DEFAULT_LIST):
+        rows = self._query("SELECT ticker FROM favorites WHERE watchlist = ? ORDER BY position", (watchlist,))
+        return [r[0] for r in rows]
+
+    def all_tickers(self):
+        """Simbolurile din toate listele, fără duplicate (pentru prefetch)."""
+        rows = self._query("SELECT DISTINCT ticker FROM favorites ORDER BY ticker")
+        return [r[0] for r in rows]
+
+    def names(self, tickers=None):
+        if tickers is None:
+            rows = self._query("SELECT ticker, name FROM names")
+        else:
+            rows = self._query(f"SELECT ticker, name FROM names WHERE ticker IN ({','.join('?' * len(tickers))})",
+                               list(tickers))
+        return dict(rows)
+
+    def load(self, watchlist=DEFAULT_LIST):
+        """Lista și numele ei, citite dintr-un singur snapshot (cu versiunea corespunzătoare)."""
+        with self._lock:
+            conn = self._conn()
+            conn.execute("BEGIN")
+            try:
+                version = self.version()
+                tickers = self.tickers(watchlist)
+                names = self.names(tickers)
+            finally:
+                conn.execute("COMMIT")
+        return {"favorites": tickers, "names": names, "version": version}
+
+    def add(self, ticker, name=None, watchlist=DEFAULT_LIST):
+        with self._write() as conn:
+            conn.execute("INSERT OR IGNORE INTO watchlists VALUES (?, ?)", (watchlist, time.time()))
+            cur = conn.execute(
+                "INSERT OR IGNORE INTO favorites SELECT ?, ?, COALESCE(MAX(position), -1) + 1, ? "
+                "FROM favorites WHERE watchlist = ?", (watchlist, ticker, time.time(), watchlist))
+            if name:
+                conn.execute("INSERT OR REPLACE INTO names VALUES (?, ?)", (ticker, name))
+            if cur.rowcount or name:
+                _bump(conn)
+
+    def remove(self, ticker, watchlist=DEFAULT_LIST):
+        with self._write() as conn:
+            cur = conn.execute("DELETE FROM favorites WHERE watchlist = ? AND ticker = ?", (watchlist, ticker))
+            if cur.rowcount:
+                _bump(conn)
+
+    def create_watchlist(self, name):
+        with self._write() as conn:
+            cur = conn.execute("INSERT OR IGNORE INTO watchlists VALUES (?, ?)", (name, time.time()))
+            if cur.rowcount:
+                _bump(conn)
+
+    def delete_watchlist(self, name):
+        if name == DEFAULT_LIST:
+            raise ValueError("Lista principală nu se poate șterge")
+        with self._write() as conn:
+            cur = conn.execute("DELETE FROM watchlists WHERE name = ?", (name,))
+            if cur.rowcount:
+                _bump(conn)
+
+
+class _Transaction:
+    """`BEGIN IMMEDIATE` ia lock-ul de scriere de la început: fără upgrade-uri care se blochează reciproc.
+
+    Conexiunea e a procesului: lock-ul store-ului se ține de la BEGIN până la COMMIT / ROLLBACK.
+    """
+
+    def __init__(self, store):
+        self.store = store
+
+    def __enter__(self):
+        self.store._lock.acquire()
+        try:
+            self.conn = self.store._conn()
+            self.conn.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            self.store._lock.release()
+            raise
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.store._lock.release()
+        return False
+
+
+def _bump(conn):
+    conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'version'")
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = FavoritesStore()
+        return _store
+
+
+def load_db(watchlist=DEFAULT_LIST):
+    """{"favorites": [...], "names": {...}, "version": n} pentru o listă."""
+    return get_store().load(watchlist)
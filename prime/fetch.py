@@ -0,0 +1,115 @@
+"""Descărcare în lot pentru mai multe simboluri (tab-ul de comparație)."""
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from prime import metadata, store, throttle
+from prime.providers import get_provider
+
+# Câte cereri `.info` rulează în paralel (Yahoo limitează agresiv peste ~10)
+MAX_WORKERS = 8
+
+
+def _batch_download(tickers, **kwargs):
+    """O singură cerere în lot pentru toate simbolurile; returnează {ticker: DataFrame}."""
+    raw = get_provider().download(list(tickers), **kwargs)
+    out = {}
+    if raw is None or raw.empty:
+        return out
+    for t in tickers:
+        if isinstance(raw.columns, pd.MultiIndex):
+            if t not in raw.columns.get_level_values(0):
+                continue
+            df = raw[t]
+        else:
+            df = raw
+        ohlc = [c for c in ('Open', 'High', 'Low', 'Close') if c in df.columns]
+        df = df.dropna(how='all', subset=ohlc)
+        if not df.empty:
+            out[t] = df
+    return out
+
+
+def fetch_histories(tickers):
+    """Istoricul complet pe simbol: din disc, plus cel mult două descărcări în lot."""
+    histories, errors = {}, {}
+    stored = {t: store.load_history(t) for t in tickers}
+    missing = [t for t in tickers if stored[t].empty]
+    stale = [t for t in tickers if not stored[t].empty and not store.is_fresh(t)]
+
+    for t in tickers:
+        if t not in missing and t not in stale:
+            histories[t] = stored[t]
+
+    # 1. Simboluri noi: istoric complet, o singură cerere pentru toate
+    if missing:
+        try:
+            got = _batch_download(missing, period='max')
+        except Exception as e:
+            got = {}
+            errors.update({t: f"Descărcare eșuată: {e}" for t in missing})
+        for t in missing:
+            if t in got:
+                histories[t] = store.store_full(t, got[t])
+            else:
+                errors.setdefault(t, "Fără date de preț.")
+
+    # 2. Simboluri salvate: doar barele noi, tot într-o singură cerere
+    if stale:
+        start = min(store.delta_start(stored[t]) for t in stale)
+        try:
+            got = _batch_download(stale, start=start)
+        except Exception:
+            got = None
+        for t in stale:
+            if got is None:
+                # Yahoo nu răspunde: servim ce avem pe disc
+                histories[t] = stored[t]
+                continue
+            try:
+                histories[t] = store.merge_delta(t, stored[t], got.get(t))
+            except Exception:
+                histories[t] = stored[t]
+
+    return histories, errors
+
+
+def fetch_infos(tickers, info_fn=None, max_workers=MAX_WORKERS):
+    """Rulează `.info` pe un pool de thread-uri; erorile se raportează pe simbol."""
+    info_fn = info_fn or metadata.get_info
+    infos, errors = {}, {}
+    if not tickers:
+        return infos, errors
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tickers))) as pool:
+        # Cererile din pool păstrează prioritatea apelantului (pagină, prefetch sau lot)
+        futures = {t: pool.submit(throttle.bind(info_fn), t) for t in tickers}
+        for t, fut in futures.items():
+            try:
+                infos[t] = fut.result() or {}
+            except Exception as e:
+                infos[t] = {}
+                errors[t] = f"Info indisponibil: {e}"
+    return infos, errors
+
+
+def _by_date(series):
+    # Bursele au fusuri orare diferite; aliniem pe data calendaristică locală
+    idx = series.index
+    if idx.tz is not None:
+        idx = idx.tz_localize(None)
+    return series.set_axis(idx.normalize())
+
+
+def fetch_many(tickers, period="1y", info_fn=None):
+    """Prețuri de închidere aliniate (date × simboluri), dicționarele `info` și erorile pe simbol."""
+    tickers = list(dict.fromkeys(tickers))
+    histories, errors = fetch_histories(tickers)
+    infos, info_errors = fetch_infos(tickers, info_fn)
+    for t, err in info_errors.items():
+        errors.setdefault(t, err)
+
+    closes = pd.DataFrame({
+        t: _by_date(store.slice_period(histories[t], period)['Close'])
+        for t in tickers if t in histories and not histories[t].empty
+    })
+    return closes, infos, errors
@@ -0,0 +1,370 @@
+"""Istoricul fundamentalelor: instantanee zilnice ale câmpurilor din `info` care intră în scorul PRIME.
+
+Se scriu doar valorile schimbate, ca rânduri (zi, simbol, câmp, valoare) pe coloane NumPy:
+fiecare instantaneu e un segment `.npz` mic (scris atomic, deci mai multe procese pot scrie
+în paralel), iar segmentele se comasează periodic într-un fișier de bază sortat. O valoare
+NaN înseamnă "câmpul a dispărut din `info`".
+
+În memorie rândurile stau sortate după (simbol, câmp, zi), deci "valoarea la data X" pentru
+mii de simboluri e o singură căutare binară vectorizată (`searchsorted`).
+
+17 octeți pe rând (+ antetul npz). Ratele care depind de preț (P/E, PEG) se schimbă aproape
+zilnic, restul doar la raportări: ~10.000 de rânduri pe zi pentru 5.000 de simboluri, ~45 MB pe an.
+
+    PRIME_FUNDAMENTALS_DIR=prime_fundamentals
+
+Rulare fără UI (ex. zilnic, din cron, după screener):
+    python -m prime.fundamentals snapshot sp500.csv
+    python -m prime.fundamentals score 2024-06-28 sp500.csv
+"""
+import argparse
+import glob
+import os
+import sys
+import threading
+import time
+import zipfile
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from prime import fetch, indicators, metrics, store, throttle
+
+DIR = os.environ.get("PRIME_FUNDAMENTALS_DIR", "prime_fundamentals")
+# Câmpurile citite de `calculate_prime_score` (ordinea nu contează: numele stau în fiecare segment)
+FIELDS = ('pegRatio', 'trailingPE', 'returnOnEquity', 'revenueGrowth', 'freeCashflow', 'totalCash', 'totalDebt')
+BASE_FILE = "base.npz"
+# Câte segmente se adună înainte de comasare
+COMPACT_SEGMENTS = 32
+LOCK_FILE = ".compact.lock"
+# Un lock mai vechi de atât e al unui proces oprit în timpul comasării
+LOCK_TIMEOUT = 600
+EPOCH = date(1970, 1, 1)
+# (simbol, câmp) și ziua într-o singură cheie int64, sortabilă
+_DAY_BITS = 20
+
+
+def _day(d=None):
+    """Zile de la 1970-01-01 (int), pentru o dată / Timestamp / șir; implicit azi."""
+    if isinstance(d, (int, np.integer)):
+        return int(d)
+    if d is None:
+        d = date.today()
+    return (pd.Timestamp(d).date() - EPOCH).days
+
+
+def _value(info, field):
+    v = (info or {}).get(field)
+    try:
+        return float(v) if v is not None else np.nan
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def points(frame):
+    """Punctele fundamentale ale scorului PRIME (0-80), vectorizat: rânduri = simboluri, coloane = FIELDS.
+
+    Aceleași reguli ca `calculate_prime_score`; câmpurile lipsă (NaN) se tratează ca acolo.
+    """
+    col = {f: frame[f].to_numpy(dtype=float) if f in frame else np.full(len(frame), np.nan) for f in FIELDS}
+    with np.errstate(invalid='ignore'):
+        peg_ok = (col['pegRatio'] > 0) & (col['pegRatio'] < 2.0)
+        pe_ok = np.nan_to_num(col['trailingPE'], nan=100) < 25
+        valuation = np.where(peg_ok, 20, np.where(pe_ok, 10, 0))
+        roe = np.where(np.nan_to_num(col['returnOnEquity']) > 0.15, 20, 0)
+        growth = np.where(np.nan_to_num(col['revenueGrowth']) > 0.10, 20, 0)
+        safety = np.where((col['freeCashflow'] > 0) |
+                          (np.nan_to_num(col['totalCash']) > np.nan_to_num(col['totalDebt'])), 20, 0)
+    return pd.Series(valuation + roe + growth + safety, index=frame.index, name='points')
+
+
+class FundamentalsStore:
+    """Instantaneele de pe disc; citirea se reface doar când apare un segment nou."""
+
+    def __init__(self, path=DIR):
+        self.path = path
+        self._lock = threading.Lock()
+        self._signature = None
+        self._data = None
+        # (simbol, zi) deja scrise de procesul ăsta: un singur instantaneu pe zi, oricât de des rulează prefetch-ul
+        self._written = set()
+
+    # --- disc ---
+
+    def _files(self):
+        base = os.path.join(self.path, BASE_FILE)
+        segments = sorted(glob.glob(os.path.join(self.path, "seg-*.npz")))
+        return ([base] if os.path.exists(base) else []) + segments
+
+    def _write_npz(self, name, **arrays):
+        os.makedirs(self.path, exist_ok=True)
+        final = os.path.join(self.path, name)
+        tmp = f"{final}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp, final)
+
+    def _load(self):
+        """Toate rândurile, sortate după (simbol, câmp, zi, ordinea scrierii)."""
+        files = self._files()
+        signature = []
+        for f in files:
+            try:
+                signature.append((f, os.path.getmtime(f)))
+            except OSError:
+                pass
+        signature = tuple(signature)
+        with self._lock:
+            if signature == self._signature:
+                return self._data
+        tickers, fields, parts = {}, {}, []
+        for f in files:
+            try:
+                with np.load(f, allow_pickle=False) as z:
+                    seg = {k: z[k] for k in z.files}
+            except (OSError, ValueError):
+                continue    # segment șters de o comasare între timp
+            t_ids = np.array([tickers.setdefault(t, len(tickers)) for t in seg['tickers']], dtype=np.int64)
+            f_ids = np.array([fields.setdefault(x, len(fields)) for x in seg['fields']], dtype=np.int64)
+            parts.append((seg['day'].astype(np.int64), t_ids[seg['ticker']], f_ids[seg['field']], seg['value']))
+        if parts:
+            day, tid, fid, value = (np.concatenate(c) for c in zip(*parts))
+        else:
+            day, tid, fid, value = (np.empty(0, np.int64),) * 3 + (np.empty(0),)
+        key = (tid * max(len(fields), 1) + fid) << _DAY_BITS | day
+        order = np.argsort(key, kind='stable')
+        data = {
+            'key': key[order], 'value': value[order],
+            'tickers': tickers, 'fields': fields, 'rows': len(key), 'files': len(files),
+        }
+        with self._lock:
+            self._signature, self._data = signature, data
+        return data
+
+    # --- scriere ---
+
+    def snapshot(self, infos, day=None):
+        """Salvează valorile schimbate față de ultimul instantaneu; returnează câte rânduri s-au scris."""
+        d = _day(day)
+        infos = {t.upper(): i for t, i in infos.items() if i and (t.upper(), d) not in self._written}
+        if not infos:
+            return 0
+        tickers = sorted(infos)
+        a = np.array([[_value(infos[t], f) for f in FIELDS] for t in tickers], dtype=float)
+        b, known = self._values(d, tickers)
+
+        changed = ~known | ((np.isnan(a) != np.isnan(b)) | (~np.isnan(a) & (a != b)))
+        # Un simbol nou, fără nicio valoare: nu are rost să-l scriem
+        changed &= ~(np.isnan(a) & ~known)
+        t_idx, f_idx = np.nonzero(changed)
+        if len(t_idx):
+            self._write_npz(
+                f"seg-{d:06d}-{time.time_ns()}-{os.getpid()}.npz",
+                day=np.full(len(t_idx), d, dtype=np.int32),
+                ticker=t_idx.astype(np.int32), field=f_idx.astype(np.uint8), value=a[t_idx, f_idx],
+                tickers=np.array(tickers), fields=np.array(FIELDS),
+            )
+        self._written.update((t, d) for t in tickers)
+        if len(self._files()) > COMPACT_SEGMENTS:
+            self.compact()
+        return len(t_idx)
+
+    def compact(self):
+        """Comasează baza și segmentele într-un singur fișier de bază sortat.
+
+        Un singur proces comasează odată (lock exclusiv pe fișier); ceilalți pot scrie segmente
+        noi între timp - se șterg doar segmentele deja incluse în bază.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        lock = os.path.join(self.path, LOCK_FILE)
+        try:
+            os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock) > LOCK_TIMEOUT:
+                    os.remove(lock)
+            except OSError:
+                pass
+            return False
+        try:
+            self._compact()
+        finally:
+            os.remove(lock)
+        return True
+
+    def _compact(self):
+        files = self._files()
+        data = self._load()
+        fields = list(data['fields'])
+        key = data['key']
+        pair, day = key >> _DAY_BITS, key & ((1 << _DAY_BITS) - 1)
+        n_fields = max(len(fields), 1)
+        self._write_npz(
+            BASE_FILE,
+            day=day.astype(np.int32), ticker=(pair // n_fields).astype(np.int32),
+            field=(pair % n_fields).astype(np.uint8), value=data['value'],
+            tickers=np.array(list(data['tickers']) or [''], dtype=str), fields=np.array(fields or [''], dtype=str),
+        )
+        for f in files:
+            if os.path.basename(f) != BASE_FILE:
+                try:
+                    os.remove(f)
+                except OSError:
+                    pass
+
+    # --- citire ---
+
+    def _lookup(self, day, tickers):
+        """(poziții, găsit) pentru fiecare (simbol, câmp din FIELDS): ultimul rând cu zi <= `day`."""
+        data = self._load()
+        n_fields = max(len(data['fields']), 1)
+        t_ids = np.array([data['tickers'].get(t.upper(), -1) for t in tickers], dtype=np.int64)
+        f_ids = np.array([data['fields'].get(f, -1) for f in FIELDS], dtype=np.int64)
+        pair = t_ids[:, None] * n_fields + f_ids[None, :]
+        valid = (t_ids[:, None] >= 0) & (f_ids[None, :] >= 0)
+        key = data['key']
+        pos = np.searchsorted(key, (pair << _DAY_BITS) | day, side='right') - 1
+        found = valid & (pos >= 0)
+        found[found] = (key[pos[found]] >> _DAY_BITS) == pair[found]
+        return pos, found, data
+
+    def _values(self, day, tickers):
+        """(valori, găsit) la data `day`, ca matrice simboluri × FIELDS."""
+        pos, found, data = self._lookup(_day(day), tickers)
+        values = np.full(found.shape, np.nan)
+        values[found] = data['value'][pos[found]]
+        return values, found
+
+    def as_of(self, day=None, tickers=None):
+        """Valorile cunoscute la data `day` (rânduri = simboluri, coloane = FIELDS; NaN = necunoscut)."""
+        if tickers is None:
+            tickers = list(self._load()['tickers'])
+        tickers = [t.upper() for t in tickers]
+        values, _ = self._values(day, tickers)
+        return pd.DataFrame(values, index=pd.Index(tickers, name='Simbol'), columns=list(FIELDS))
+
+    def history(self, field, tickers, dates):
+        """Valorile unui câmp la fiecare dată din `dates` (date × simboluri), fără buclă pe date."""
+        data = self._load()
+        days = np.array([_day(d) for d in dates], dtype=np.int64)
+        out = np.full((len(days), len(tickers)), np.nan)
+        f = data['fields'].get(field)
+        if f is None or not data['rows']:
+            return pd.DataFrame(out, index=dates, columns=tickers)
+        n_fields = max(len(data['fields']), 1)
+        key = data['key']
+        for j, t in enumerate(tickers):
+            tid = data['tickers'].get(t.upper())
+            if tid is None:
+                continue
+            pair = tid * n_fields + f
+            lo, hi = np.searchsorted(key, [pair << _DAY_BITS, (pair + 1) << _DAY_BITS])
+            if lo == hi:
+                continue
+            change_days = key[lo:hi] & ((1 << _DAY_BITS) - 1)
+            idx = np.searchsorted(change_days, days, side='right') - 1
+            out[:, j] = np.where(idx >= 0, data['value'][lo:hi][np.maximum(idx, 0)], np.nan)
+        return pd.DataFrame(out, index=dates, columns=tickers)
+
+    def points_history(self, tickers, dates):
+        """Punctele fundamentale la fiecare dată (date × simboluri), pentru backtest; NaN înainte de primul instantaneu."""
+        frames = {f: self.history(f, tickers, dates).to_numpy() for f in FIELDS}
+        seen = np.zeros((len(dates), len(tickers)), dtype=bool)
+        for v in frames.values():
+            seen |= ~np.isnan(v)
+        flat = pd.DataFrame({f: v.ravel() for f, v in frames.items()})
+        pts = points(flat).to_numpy(dtype=float).reshape(len(dates), len(tickers))
+        return pd.DataFrame(np.where(seen, pts, np.nan), index=dates, columns=tickers)
+
+    def stats(self):
+        data = self._load()
+        size = sum(os.path.getsize(f) for f in self._files() if os.path.exists(f))
+        return {'rows': data['rows'], 'tickers': len(data['tickers']), 'files': data['files'], 'bytes': size}
+
+
+def score_as_of(day, tickers, period='1y', fundamentals_store=None):
+    """Scorul PRIME la data `day` pentru mai multe simboluri: fundamentale din instantanee, trend din depozit.
+
+    Doar simbolurile care au deja un istoric local de prețuri primesc punctele de trend.
+    """
+    fs = fundamentals_store or get_store()
+    values = fs.as_of(day, tickers)
+    cutoff = pd.Timestamp(day)
+    closes = {}
+    for t in values.index:
+        h = store.load_compact(t)
+        if h.empty:
+            continue
+        stamp = cutoff.tz_localize(h.index.tz) if h.index.tz is not None else cutoff
+        h = store.slice_period(h.iloc[:h.index.searchsorted(stamp + pd.Timedelta(days=1), side='left')], period)
+        if not h.empty:
+            closes[t] = fetch._by_date(h['Close'])
+    table = values.copy()
+    table['Fundamentale'] = points(values)
+    table['Trend'] = 0
+    if closes:
+        trend = indicators.sma_trend(pd.DataFrame(closes))
+        table.loc[trend.index, 'Trend'] = np.where(trend['above'], 20, 0)
+    table['Scor'] = table['Fundamentale'] + table['Trend']
+    return table.sort_values('Scor', ascending=False)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = FundamentalsStore()
+        return _store
+
+
+def snapshot(infos, day=None):
+    """Instantaneul zilei în depozitul comun; erorile de disc / segmentele stricate nu opresc
+    prefetch-ul sau screener-ul, dar se numără și se scriu în log (altfel istoricul are goluri neobservate)."""
+    try:
+        return get_store().snapshot(infos, day)
+    except (OSError, ValueError, zipfile.BadZipFile) as e:
+        metrics.count('fundamentals_snapshot_errors_total', error=type(e).__name__)
+        print(f"prime.fundamentals: instantaneul nu s-a salvat în {get_store().path}: {e}", file=sys.stderr)
+        return 0
+
+
+def main(argv=None):
+    from prime.screener import load_universe
+
+    parser = argparse.ArgumentParser(description="Instantanee zilnice ale fundamentalelor PRIME.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    snap = sub.add_parser("snapshot", help="Descarcă `info` pentru univers și salvează ce s-a schimbat")
+    snap.add_argument("universe")
+    score = sub.add_parser("score", help="Scorul PRIME la o dată din trecut")
+    score.add_argument("date")
+    score.add_argument("universe")
+    score.add_argument("--out", default=None)
+    sub.add_parser("compact", help="Comasează segmentele")
+    args = parser.parse_args(argv)
+
+    fs = get_store()
+    if args.command == "snapshot":
+        tickers = load_universe(args.universe)
+        start = time.perf_counter()
+        with throttle.priority(throttle.BATCH):
+            infos, errors = fetch.fetch_infos(tickers)
+        written = fs.snapshot(infos)
+        print(f"{len(infos) - len(errors)} simboluri, {written} valori schimbate în "
+              f"{time.perf_counter() - start:.1f}s | {fs.stats()}")
+    elif args.command == "score":
+        table = score_as_of(args.date, load_universe(args.universe), fundamentals_store=fs)
+        print(table.head(30).to_string())
+        if args.out:
+            table.to_csv(args.out)
+    else:
+        fs.compact()
+        print(fs.stats())
+
+
+if __name__ == "__main__":
+    main()
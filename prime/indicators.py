@@ -0,0 +1,250 @@
+"""Indicatori vectorizați pe o matrice de prețuri (date × simboluri), într-o singură trecere NumPy.
+
+Fiecare coloană dă exact rezultatul funcțiilor pe un singur simbol aplicate coloanei
+fără NaN-urile de la început (simboluri listate la date diferite).
+"""
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+RISK_FREE_RATE = 0.04
+
+
+def _as_matrix(closes):
+    if isinstance(closes, pd.Series):
+        closes = closes.to_frame()
+    return closes.to_numpy(dtype='float64', na_value=np.nan), closes.index, closes.columns
+
+
+def _first_valid(x):
+    """Indexul primului rând non-NaN pe fiecare coloană (n pentru coloane goale)."""
+    valid = ~np.isnan(x)
+    return np.where(valid.any(axis=0), valid.argmax(axis=0), x.shape[0])
+
+
+def _rolling_mean(values, window, first):
+    # Medie mobilă prin sume cumulate: valoare doar când fereastra e plină (ca pandas min_periods=window)
+    n = values.shape[0]
+    cs = np.vstack([np.zeros((1, values.shape[1])), np.cumsum(np.nan_to_num(values), axis=0)])
+    out = np.full(values.shape, np.nan)
+    if n >= window:
+        out[window - 1:] = (cs[window:] - cs[:-window]) / window
+    rows = np.arange(n)[:, None]
+    out[rows - window + 1 < first[None, :]] = np.nan
+    return out
+
+
+def rsi(closes, window=14):
+    """RSI (medii simple, ca `calculate_rsi`) pentru fiecare coloană."""
+    x, index, columns = _as_matrix(closes)
+    first = _first_valid(x)
+    delta = np.full(x.shape, np.nan)
+    delta[1:] = x[1:] - x[:-1]
+
+    # NaN > 0 e False, deci diferențele lipsă devin 0 (la fel ca `where` din pandas)
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    avg_gain = _rolling_mean(gain, window, first)
+    avg_loss = _rolling_mean(loss, window, first)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out = 100 - (100 / (1 + avg_gain / avg_loss))
+    if isinstance(closes, pd.Series):
+        return pd.Series(out[:, 0], index=index, name=closes.name)
+    return pd.DataFrame(out, index=index, columns=columns)
+
+
+def _nan_stats(r):
+    """Număr, medie și deviație standard (ddof=1) ignorând NaN, fără avertismente."""
+    valid = ~np.isnan(r)
+    count = valid.sum(axis=0)
+    total = np.where(valid, r, 0.0).sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = total / count
+        dev = np.where(valid, r - mean, 0.0)
+        std = np.sqrt((dev * dev).sum(axis=0) / (count - 1))
+    std[count < 2] = np.nan
+    return count, mean, std
+
+
+def risk_metrics(closes, risk_free_rate=RISK_FREE_RATE):
+    """Volatilitate anuală (%), max drawdown (%) și Sharpe pentru fiecare coloană."""
+    x, _, columns = _as_matrix(closes)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ret = x[1:] / x[:-1] - 1
+    _, mean, std = _nan_stats(ret)
+
+    # 1. Volatilitate
+    annual_std = std * np.sqrt(TRADING_DAYS)
+    volatility = annual_std * 100
+
+    # 2. Max Drawdown (fmax ignoră NaN-urile, ca `cummax`)
+    peak = np.fmax.accumulate(x, axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dd = np.where(np.isnan(x), np.inf, x / peak - 1)
+    max_dd = dd.min(axis=0) if len(x) else np.full(x.shape[1], np.inf)
+    max_dd = np.where(np.isinf(max_dd), np.nan, max_dd) * 100
+
+    # 3. Sharpe Ratio
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = (mean * TRADING_DAYS - risk_free_rate) / annual_std
+    sharpe = np.where(annual_std == 0, 0.0, sharpe)
+
+    return pd.DataFrame({'volatility': volatility, 'max_dd': max_dd, 'sharpe': sharpe}, index=columns)
+
+
+def sma_trend(closes, window=200):
+    """Media de trend (SMA200 sau media perioadei) și dacă ultimul preț e peste ea."""
+    x, _, columns = _as_matrix(closes)
+    n = x.shape[0]
+    first = _first_valid(x)
+    length = n - first
+    full_window = length > window
+
+    valid = ~np.isnan(x)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        period_mean = np.where(valid, x, 0.0).sum(axis=0) / valid.sum(axis=0)
+    tail = x[max(n - window, 0):]
+    sma_tail = tail.mean(axis=0) if len(tail) == window else np.full(x.shape[1], np.nan)
+    sma = np.where(full_window, sma_tail, period_mean)
+
+    current = x[-1] if n else np.full(x.shape[1], np.nan)
+    with np.errstate(invalid='ignore'):
+        above = current > sma
+    return pd.DataFrame({'sma': sma, 'current': current, 'above': above, 'full_window': full_window},
+                        index=columns)
+
+
+def _wrap(out, index, columns, like):
+    if isinstance(like, pd.Series):
+        return pd.Series(out[:, 0], index=index, name=like.name)
+    return pd.DataFrame(out, index=index, columns=columns)
+
+
+def _window_sums(values, window):
+    """Suma pe fiecare fereastră de `window` rânduri care se termină la t (NaN cât fereastra nu e plină)."""
+    cs = np.vstack([np.zeros((1, values.shape[1])), np.cumsum(values, axis=0)])
+    out = np.full(values.shape, np.nan)
+    if values.shape[0] >= window:
+        out[window - 1:] = cs[window:] - cs[:-window]
+    return out
+
+
+def _calendar_dates(index):
+    return (index.tz_localize(None) if getattr(index, 'tz', None) is not None else index).normalize()
+
+
+def _returns(x):
+    ret = np.full(x.shape, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ret[1:] = x[1:] / x[:-1] - 1
+    return ret
+
+
+def _returns_ready(x, window):
+    # Fereastra de `window` randamente are nevoie de window + 1 prețuri de la listare încoace
+    rows = np.arange(x.shape[0])[:, None]
+    return rows - _first_valid(x)[None, :] >= window
+
+
+def rolling_max(values, window):
+    """Maximul pe ferestre glisante în O(n), fără buclă pe ferestre (van Herk / Gil-Werman).
+
+    Seria se împarte în blocuri de `window`; maximul unei ferestre = max(sufixul blocului în care
+    începe, prefixul blocului în care se termină), ambele obținute cu `np.fmax.accumulate`.
+    NaN-urile sunt ignorate (ca `fmax`); apelanții maschează ferestrele incomplete.
+    """
+    n, k = values.shape
+    out = np.full(values.shape, np.nan)
+    if n < window:
+        return out
+    blocks = -(-n // window)
+    padded = np.full((blocks * window, k), np.nan)
+    padded[:n] = values
+    shaped = padded.reshape(blocks, window, k)
+    prefix = np.fmax.accumulate(shaped, axis=1).reshape(-1, k)
+    suffix = np.fmax.accumulate(shaped[:, ::-1], axis=1)[:, ::-1].reshape(-1, k)
+    end = np.arange(window - 1, n)
+    out[window - 1:] = np.fmax(suffix[end - window + 1], prefix[end])
+    return out
+
+
+def rolling_volatility(closes, window=30):
+    """Volatilitatea anuală (%) pe ultimele `window` randamente zilnice, pentru fiecare zi."""
+    x, index, columns = _as_matrix(closes)
+    ret = _returns(x)
+    r = np.nan_to_num(ret)
+    s1, s2 = _window_sums(r, window), _window_sums(r * r, window)
+    with np.errstate(invalid='ignore'):
+        var = np.maximum(s2 - s1 * s1 / window, 0) / (window - 1)
+    out = np.sqrt(var) * np.sqrt(TRADING_DAYS) * 100
+    out[~_returns_ready(x, window)] = np.nan
+    return _wrap(out, index, columns, closes)
+
+
+def rolling_sharpe(closes, window=252, risk_free_rate=RISK_FREE_RATE):
+    """Sharpe pe ultimele `window` randamente (aceeași formulă ca `risk_metrics`)."""
+    x, index, columns = _as_matrix(closes)
+    r = np.nan_to_num(_returns(x))
+    s1, s2 = _window_sums(r, window), _window_sums(r * r, window)
+    mean = s1 / window
+    with np.errstate(divide='ignore', invalid='ignore'):
+        annual_std = np.sqrt(np.maximum(s2 - s1 * mean, 0) / (window - 1)) * np.sqrt(TRADING_DAYS)
+        out = np.where(annual_std == 0, 0.0, (mean * TRADING_DAYS - risk_free_rate) / annual_std)
+    out[~_returns_ready(x, window)] = np.nan
+    return _wrap(out, index, columns, closes)
+
+
+def rolling_drawdown(closes, window=252):
+    """Distanța (%) a prețului față de vârful ultimelor `window` zile (plus ziua curentă)."""
+    x, index, columns = _as_matrix(closes)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out = (x / rolling_max(x, window + 1) - 1) * 100
+    out[~_returns_ready(x, window)] = np.nan
+    return _wrap(out, index, columns, closes)
+
+
+def rolling_beta(closes, benchmark, window=252):
+    """Beta față de `benchmark` (o serie de prețuri) pe ultimele `window` randamente.
+
+    Benchmark-ul se aliniază pe datele simbolului (ultimul preț cunoscut, fără valori din viitor).
+    """
+    x, index, columns = _as_matrix(closes)
+    # Bursele pot avea fusuri orare diferite: aliniem pe data calendaristică locală
+    bench = benchmark.set_axis(_calendar_dates(benchmark.index))
+    bench = bench[~bench.index.duplicated(keep='last')].sort_index()
+    b = bench.reindex(_calendar_dates(index), method='ffill').to_numpy(dtype='float64', na_value=np.nan)[:, None]
+    rx, rb = _returns(x), _returns(b)
+    valid = ~np.isnan(rx) & ~np.isnan(rb)
+    rx, rb = np.where(valid, rx, 0.0), np.where(valid, rb, 0.0)
+    n = _window_sums(valid.astype(float), window)
+    sx, sb = _window_sums(rx, window), _window_sums(rb, window)
+    sxb, sbb = _window_sums(rx * rb, window), _window_sums(rb * rb, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out = (sxb - sx * sb / n) / (sbb - sb * sb / n)
+    # Cer o fereastră aproape completă de zile comune (benchmark-ul poate lipsi în zilele fără bursă)
+    out[~_returns_ready(x, window) | (n < 0.8 * window)] = np.nan
+    return _wrap(out, index, columns, closes)
+
+
+def rolling_risk(close, windows=(30, 90, 252), benchmark=None, risk_free_rate=RISK_FREE_RATE):
+    """Seriile de risc pentru un simbol: coloane (metrică, fereastră), una pe fiecare zi."""
+    parts = {}
+    for w in windows:
+        parts[('Volatilitate (%)', w)] = rolling_volatility(close, w)
+        parts[('Sharpe', w)] = rolling_sharpe(close, w, risk_free_rate)
+        parts[('Drawdown (%)', w)] = rolling_drawdown(close, w)
+        if benchmark is not None:
+            parts[('Beta', w)] = rolling_beta(close, benchmark, w)
+    return pd.DataFrame(parts)
+
+
+def indicator_table(closes, rsi_window=14, sma_window=200, risk_free_rate=RISK_FREE_RATE):
+    """Tot setul de indicatori, câte un rând pe simbol (pentru comparații și screening)."""
+    last_rsi = rsi(closes, rsi_window)
+    if isinstance(last_rsi, pd.Series):
+        last_rsi = last_rsi.to_frame()
+    table = risk_metrics(closes, risk_free_rate).join(sma_trend(closes, sma_window))
+    table.insert(0, 'rsi', last_rsi.iloc[-1] if len(last_rsi) else np.nan)
+    return table
@@ -0,0 +1,212 @@
+"""Mod intraday: barele noi se adaugă la serie și indicatorii se actualizează în O(1) per bară."""
+import math
+import threading
+import time
+from collections import deque
+
+import pandas as pd
+
+from prime.indicators import RISK_FREE_RATE, TRADING_DAYS
+from prime.providers import get_provider
+
+# Câte bare are o zi de tranzacționare (NYSE, 6.5 ore)
+BARS_PER_DAY = {'1m': 390, '5m': 78}
+# Fereastra inițială descărcată la pornire
+SEED_PERIODS = {'1m': '1d', '5m': '5d'}
+REFRESH_SECONDS = 30
+# Sumele mobile se recalculează exact din când în când, ca să nu se acumuleze erori de rotunjire
+RESYNC_EVERY = 1000
+
+
+class LiveIndicators:
+    """RSI, volatilitate, Sharpe, drawdown și SMA ținute ca stare, nu recalculate pe toată seria.
+
+    Formulele sunt aceleași ca în `prime.indicators` (RSI cu medii simple, SMA200 sau media
+    perioadei), doar anualizarea folosește numărul de bare intraday pe an.
+    """
+
+    def __init__(self, rsi_window=14, sma_window=200, bars_per_year=TRADING_DAYS,
+                 risk_free_rate=RISK_FREE_RATE):
+        self.rsi_window = rsi_window
+        self.sma_window = sma_window
+        self.bars_per_year = bars_per_year
+        self.risk_free_rate = risk_free_rate
+
+        self.count = 0
+        self.last = None
+        # RSI: ultimele `rsi_window` câștiguri/pierderi și sumele lor
+        self.gains = deque(maxlen=rsi_window)
+        self.losses = deque(maxlen=rsi_window)
+        self.gain_sum = 0.0
+        self.loss_sum = 0.0
+        # Randamente: medie și varianță Welford
+        self.n_ret = 0
+        self.ret_mean = 0.0
+        self.ret_m2 = 0.0
+        # Drawdown
+        self.peak = -math.inf
+        self.max_dd = 0.0
+        # SMA: fereastra și suma ei, plus suma totală pentru "Media Perioadei"
+        self.window = deque(maxlen=sma_window)
+        self.window_sum = 0.0
+        self.total_sum = 0.0
+
+        self._saved = None
+
+    # Valorile scalare care se refac când bara curentă e revizuită
+    _SCALARS = ('count', 'last', 'gain_sum', 'loss_sum', 'n_ret', 'ret_mean', 'ret_m2',
+                'peak', 'max_dd', 'window_sum', 'total_sum')
+
+    @staticmethod
+    def _push(buf, value, total):
+        evicted = buf[0] if len(buf) == buf.maxlen else None
+        buf.append(value)
+        return total + value - (evicted or 0.0), evicted
+
+    def update(self, close):
+        """Adaugă o bară nouă (închisă)."""
+        scalars = {k: getattr(self, k) for k in self._SCALARS}
+        close = float(close)
+
+        if self.last is None:
+            delta = 0.0  # prima diferență lipsește; pandas o tratează ca 0 în RSI
+        else:
+            delta = close - self.last
+            r = close / self.last - 1
+            self.n_ret += 1
+            d = r - self.ret_mean
+            self.ret_mean += d / self.n_ret
+            self.ret_m2 += d * (r - self.ret_mean)
+
+        self.gain_sum, ev_gain = self._push(self.gains, max(delta, 0.0), self.gain_sum)
+        self.loss_sum, ev_loss = self._push(self.losses, max(-delta, 0.0), self.loss_sum)
+        self.window_sum, ev_close = self._push(self.window, close, self.window_sum)
+        self.total_sum += close
+        self._saved = (scalars, ev_gain, ev_loss, ev_close)
+
+        self.peak = max(self.peak, close)
+        self.max_dd = min(self.max_dd, close / self.peak - 1)
+
+        self.count += 1
+        self.last = close
+        if self.count % RESYNC_EVERY == 0:
+            self.gain_sum, self.loss_sum = sum(self.gains), sum(self.losses)
+            self.window_sum = sum(self.window)
+
+    def revise(self, close):
+        """Înlocuiește ultima bară (bara curentă, încă deschisă, s-a modificat)."""
+        if self._saved is None:
+            return self.update(close)
+        scalars, *evicted = self._saved
+        for buf, ev in zip((self.gains, self.losses, self.window), evicted):
+            buf.pop()
+            if ev is not None:
+                buf.appendleft(ev)
+        self.__dict__.update(scalars)
+        self._saved = None
+        self.update(close)
+
+    @property
+    def rsi(self):
+        if len(self.gains) < self.rsi_window:
+            return math.nan
+        avg_gain = self.gain_sum / self.rsi_window
+        avg_loss = self.loss_sum / self.rsi_window
+        if avg_loss == 0:
+            return math.nan if avg_gain == 0 else 100.0
+        return 100 - 100 / (1 + avg_gain / avg_loss)
+
+    @property
+    def annual_std(self):
+        if self.n_ret < 2:
+            return math.nan
+        return math.sqrt(self.ret_m2 / (self.n_ret - 1)) * math.sqrt(self.bars_per_year)
+
+    @property
+    def volatility(self):
+        return self.annual_std * 100
+
+    @property
+    def sharpe(self):
+        std = self.annual_std
+        if std == 0:
+            return 0.0
+        return (self.ret_mean * self.bars_per_year - self.risk_free_rate) / std
+
+    @property
+    def drawdown(self):
+        return self.max_dd * 100 if self.count else math.nan
+
+    @property
+    def sma(self):
+        if self.count > self.sma_window:
+            return self.window_sum / self.sma_window
+        return self.total_sum / self.count if self.count else math.nan
+
+    def snapshot(self):
+        return {
+            'rsi': self.rsi,
+            'volatility': self.volatility,
+            'max_dd': self.drawdown,
+            'sharpe': self.sharpe,
+            'sma': self.sma,
+            'above_sma': self.last is not None and self.last > self.sma,
+            'bars': self.count,
+        }
+
+
+class LiveSession:
+    """Seria intraday a unui simbol, comună tuturor sesiunilor care îl urmăresc."""
+
+    def __init__(self, ticker, interval='1m', refresh_seconds=REFRESH_SECONDS):
+        self.ticker = ticker
+        self.interval = interval
+        self.refresh_seconds = refresh_seconds
+        self.history = pd.DataFrame()
+        self.indicators = LiveIndicators(
+            bars_per_year=TRADING_DAYS * BARS_PER_DAY.get(interval, BARS_PER_DAY['1m']))
+        self.last_refresh = 0.0
+        self._lock = threading.Lock()
+
+    def _download(self, **kwargs):
+        return get_provider().history(self.ticker, interval=self.interval, **kwargs)
+
+    def append(self, bars):
+        """Lipește barele noi; doar ele (și ultima bară, dacă s-a schimbat) trec prin indicatori."""
+        if bars is None or bars.empty:
+            return 0
+        if self.history.empty:
+            self.history = bars
+            for c in bars['Close']:
+                self.indicators.update(c)
+            return len(bars)
+
+        last = self.history.index[-1]
+        if last in bars.index:
+            # Bara curentă era încă deschisă: o revizuim
+            self.indicators.revise(bars.loc[last, 'Close'])
+        new = bars[bars.index > last]
+        for c in new['Close']:
+            self.indicators.update(c)
+        # Cadru nou, nu modificare pe loc: alte sesiuni pot citi încă versiunea veche
+        self.history = pd.concat([self.history[self.history.index < last], bars[bars.index >= last]])
+        return len(new)
+
+    def refresh(self, force=False):
+        """Aduce doar barele de după ultima bară cunoscută (cel mult o dată la `refresh_seconds`)."""
+        with self._lock:
+            if not force and time.monotonic() - self.last_refresh < self.refresh_seconds:
+                return 0
+            self.last_refresh = time.monotonic()
+            try:
+                if self.history.empty:
+                    bars = self._download(period=SEED_PERIODS.get(self.interval, '1d'))
+                else:
+                    bars = self._download(start=self.history.index[-1])
+            except Exception:
+                return 0
+            return self.append(bars)
+
+    def snapshot(self):
+        with self._lock:
+            return self.history, self.indicators.snapshot()
@@ -0,0 +1,178 @@
+"""Cache comun (pe proces) pentru `.info`, calendar, insideri și știri, cu TTL pe tip de date."""
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+from prime import metrics
+from prime.providers import get_provider
+
+# Cât timp (secunde) rămâne valid fiecare tip de date
+TTLS = {
+    'quote': 15,
+    'news': 15 * 60,
+    'info': 6 * 3600,
+    'calendar': 6 * 3600,
+    'insider': 24 * 3600,
+}
+DEFAULT_TTL = 3600
+MAX_BYTES = 64 * 1024 * 1024
+
+LOADERS = {
+    'quote': lambda t: get_provider().quote(t),
+    'info': lambda t: get_provider().info(t),
+    'calendar': lambda t: get_provider().calendar(t),
+    'insider': lambda t: get_provider().insider(t),
+    'news': lambda t: get_provider().news(t),
+}
+
+
+def _size_of(value):
+    """Estimare ieftină a memoriei ocupate de o valoare din cache."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 1024
+
+
+class MetaCache:
+    """LRU cu limită de memorie, cheie (ticker, dataset), TTL pe dataset.
+
+    Valorile returnate sunt partajate între sesiuni: nu le modifica pe loc.
+    """
+
+    def __init__(self, max_bytes=MAX_BYTES, ttls=None, loaders=None):
+        self.max_bytes = max_bytes
+        self.ttls = dict(TTLS if ttls is None else ttls)
+        self.loaders = dict(LOADERS if loaders is None else loaders)
+        self._data = OrderedDict()  # (ticker, dataset) -> (expiră_la, mărime, valoare)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = {}
+        self.misses = {}
+
+    def _lookup(self, key, stale_ok=False):
+        # Intrările expirate rămân în LRU până sunt evacuate, ca să poată fi servite "stale"
+        with self._lock:
+            entry = self._data.get(key)
+            fresh = entry is not None and entry[0] > time.monotonic()
+            if fresh or (stale_ok and entry is not None):
+                self._data.move_to_end(key)
+                self.hits[key[1]] = self.hits.get(key[1], 0) + 1
+                found, value = True, entry[2]
+            else:
+                self.misses[key[1]] = self.misses.get(key[1], 0) + 1
+                found, value = False, None
+        metrics.count('cache_hits_total' if found else 'cache_misses_total', dataset=key[1], ticker=key[0])
+        return found, value, fresh
+
+    def put(self, ticker, dataset, value):
+        key = (ticker.upper(), dataset)
+        size = _size_of(value)
+        expires = time.monotonic() + self.ttls.get(dataset, DEFAULT_TTL)
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            if size > self.max_bytes:
+                return value
+            self._data[key] = (expires, size, value)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, s, _) = self._data.popitem(last=False)
+                self._bytes -= s
+        return value
+
+    def get(self, ticker, dataset, loader=None, revalidate=None):
+        """Returnează valoarea din cache sau o încarcă (o singură dată per TTL).
+
+        Cu `revalidate`, o valoare expirată se returnează imediat, iar `revalidate(ticker, dataset)`
+        o reîmprospătează în fundal (stale-while-revalidate). Dacă sursa dă eroare (sau are
+        circuitul deschis), se returnează ultima valoare bună, cât timp e încă în LRU.
+        """
+        key = (ticker.upper(), dataset)
+        found, value, fresh = self._lookup(key, stale_ok=revalidate is not None)
+        if found:
+            if not fresh:
+                revalidate(key[0], dataset)
+            return value
+        loader = loader or self.loaders[dataset]
+        try:
+            value = loader(key[0])
+        except Exception:
+            found, value = self.peek(ticker, dataset)
+            if not found:
+                raise
+            metrics.count('stale_served_total', dataset=dataset, ticker=key[0])
+            return value
+        return self.put(ticker, dataset, value)
+
+    def peek(self, ticker, dataset):
+        """(găsit, ultima valoare bună oricât de veche), fără încărcare și fără contoare."""
+        with self._lock:
+            entry = self._data.get((ticker.upper(), dataset))
+        return (True, entry[2]) if entry is not None else (False, None)
+
+    def refresh(self, ticker, dataset):
+        """Reîncarcă necondiționat de la sursă (folosit de prefetch)."""
+        return self.put(ticker, dataset, self.loaders[dataset](ticker.upper()))
+
+    def expires_in(self, ticker, dataset):
+        """Secunde până expiră intrarea (negativ dacă a expirat, -inf dacă lipsește)."""
+        with self._lock:
+            entry = self._data.get((ticker.upper(), dataset))
+        return entry[0] - time.monotonic() if entry is not None else float('-inf')
+
+    def age(self, ticker, dataset):
+        """Secunde de la ultima încărcare reușită (inf dacă intrarea lipsește)."""
+        left = self.expires_in(ticker, dataset)
+        return self.ttls.get(dataset, DEFAULT_TTL) - left
+
+    def invalidate(self, ticker, dataset=None):
+        with self._lock:
+            for key in [k for k in self._data if k[0] == ticker.upper() and dataset in (None, k[1])]:
+                self._bytes -= self._data.pop(key)[1]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._data),
+                'bytes': self._bytes,
+                'hits': dict(self.hits),
+                'misses': dict(self.misses),
+            }
+
+
+# O singură instanță pe proces, comună tuturor sesiunilor Streamlit
+CACHE = MetaCache()
+
+
+def get_info(ticker, revalidate=None):
+    return CACHE.get(ticker, 'info', revalidate=revalidate) or {}
+
+
+def get_quote(ticker, revalidate=None):
+    return CACHE.get(ticker, 'quote', revalidate=revalidate)
+
+
+def get_calendar(ticker):
+    return CACHE.get(ticker, 'calendar')
+
+
+def get_insider(ticker):
+    return CACHE.get(ticker, 'insider')
+
+
+def get_news(ticker):
+    return CACHE.get(ticker, 'news') or []
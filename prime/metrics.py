@@ -0,0 +1,255 @@
+"""Instrumentare: timpi pe etape pentru fiecare rerun, contoare (cache, erori upstream), mărimi de payload.
+
+Oprită implicit. Se pornește cu PRIME_METRICS=1 (sau `enable()` din panoul de diagnostic).
+Cât e oprită, `timer()` întoarce un context gol comun, iar `count()` / `observe()` / `payload()`
+ies la prima linie: sub o microsecundă pe apel, ~15 µs pe rerun în total.
+
+Export (opțional, doar cu instrumentarea pornită):
+    PRIME_METRICS_FILE=metrics.jsonl     o linie JSON la fiecare rerun terminat
+    PRIME_METRICS_FILE=/var/lib/node_exporter/prime.prom
+                                         text Prometheus, rescris atomic (textfile collector)
+    PRIME_METRICS_PORT=9464              endpoint HTTP /metrics în format Prometheus
+
+Obiectivul de latență al paginii (SLO): PRIME_PAGE_SLO=4 secunde pe rerun; rerun-urile mai
+lente se numără în `rerun_slo_breaches_total`.
+"""
+import contextlib
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import pandas as pd
+
+ENABLED = os.environ.get("PRIME_METRICS", "").lower() not in ("", "0", "false", "no")
+METRICS_FILE = os.environ.get("PRIME_METRICS_FILE", "")
+METRICS_PORT = int(os.environ.get("PRIME_METRICS_PORT", "0") or 0)
+SLO_SECONDS = float(os.environ.get("PRIME_PAGE_SLO", 4))
+
+# Câte rerun-uri păstrăm pentru panou și câte durate per etapă pentru percentile
+RECENT_RUNS = 50
+RECENT_SAMPLES = 500
+
+_NULL = contextlib.nullcontext()
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Registry:
+    """Contoare și sumare (count / sum / max + ultimele valori), cheie (nume, etichete)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}
+        self.summaries = {}
+        self.runs = deque(maxlen=RECENT_RUNS)
+
+    def count(self, name, value=1, labels=()):
+        key = (name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, labels=()):
+        key = (name, labels)
+        with self._lock:
+            s = self.summaries.get(key)
+            if s is None:
+                s = self.summaries[key] = [0, 0.0, 0.0, deque(maxlen=RECENT_SAMPLES)]
+            s[0] += 1
+            s[1] += value
+            s[2] = max(s[2], value)
+            s[3].append(value)
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.summaries.clear()
+            self.runs.clear()
+
+    def counter_table(self):
+        with self._lock:
+            rows = [{'metric': n, **dict(l), 'value': v} for (n, l), v in self.counters.items()]
+        return pd.DataFrame(rows)
+
+    def summary_table(self):
+        """Sumar pe etape: număr, medie, p50/p95 (din ultimele valori), maxim."""
+        with self._lock:
+            items = [(n, dict(l), s[0], s[1], s[2], list(s[3])) for (n, l), s in self.summaries.items()]
+        rows = []
+        for name, labels, cnt, total, peak, recent in items:
+            recent = pd.Series(recent, dtype=float)
+            rows.append({'metric': name, **labels, 'count': cnt, 'mean': total / cnt,
+                         'p50': recent.quantile(0.5), 'p95': recent.quantile(0.95), 'max': peak})
+        return pd.DataFrame(rows)
+
+    def prometheus_text(self):
+        """Formatul text Prometheus 0.0.4: contoarele ca `counter`, duratele și mărimile ca `summary`."""
+        def fmt(labels):
+            if not labels:
+                return ""
+            return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+        with self._lock:
+            counters = sorted(self.counters.items())
+            summaries = sorted((k, (s[0], s[1])) for k, s in self.summaries.items())
+        lines, typed = [], set()
+        for (name, labels), value in counters:
+            if name not in typed:
+                lines.append(f"# TYPE prime_{name} counter")
+                typed.add(name)
+            lines.append(f"prime_{name}{fmt(labels)} {value}")
+        for (name, labels), (cnt, total) in summaries:
+            if name not in typed:
+                lines.append(f"# TYPE prime_{name} summary")
+                typed.add(name)
+            lines.append(f"prime_{name}_count{fmt(labels)} {cnt}")
+            lines.append(f"prime_{name}_sum{fmt(labels)} {total}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+_local = threading.local()
+
+
+def enable(on=True):
+    global ENABLED
+    ENABLED = bool(on)
+    if ENABLED and METRICS_PORT:
+        serve(METRICS_PORT)
+
+
+def _labels(labels):
+    return tuple(sorted(labels.items()))
+
+
+def count(name, value=1, **labels):
+    if not ENABLED:
+        return
+    REGISTRY.count(name, value, _labels(labels))
+
+
+def observe(name, value, **labels):
+    if not ENABLED:
+        return
+    REGISTRY.observe(name, value, _labels(labels))
+
+
+@contextlib.contextmanager
+def _timer(stage):
+    t = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - t
+        REGISTRY.observe('stage_seconds', elapsed, (('stage', stage),))
+        run = getattr(_local, 'run', None)
+        if run is not None:
+            run['stages'][stage] = run['stages'].get(stage, 0.0) + elapsed
+
+
+def timer(stage):
+    """`with timer('score'):` - durata intră în sumarul etapei și în rerun-ul curent."""
+    if not ENABLED:
+        return _NULL
+    return _timer(stage)
+
+
+def _size(obj):
+    if isinstance(obj, (bytes, bytearray)):
+        return len(obj)
+    if isinstance(obj, str):
+        return len(obj.encode())
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return int(obj.memory_usage(deep=True).sum())
+    if hasattr(obj, 'to_json'):
+        # Figuri Plotly: JSON-ul e exact ce pleacă spre browser
+        return len(obj.to_json())
+    return 0
+
+
+def payload(element, obj):
+    """Mărimea (aproximativă) a unui element trimis browserului; se calculează doar cu instrumentarea pornită."""
+    if not ENABLED:
+        return
+    REGISTRY.observe('payload_bytes', _size(obj), (('element', element),))
+
+
+def begin_run(page, ticker=None):
+    """Marchează începutul unui rerun în thread-ul curent (fiecare sesiune are thread-ul ei)."""
+    if not ENABLED:
+        _local.run = None
+        return
+    _local.run = {'ts': time.time(), 'page': page, 'ticker': ticker, 'stages': {},
+                  '_start': time.perf_counter()}
+
+
+def end_run():
+    """Închide rerun-ul curent, îl păstrează pentru panou și îl exportă în fișier, dacă e configurat."""
+    run = getattr(_local, 'run', None)
+    _local.run = None
+    if run is None or not ENABLED:
+        return None
+    run['total'] = time.perf_counter() - run.pop('_start')
+    REGISTRY.observe('rerun_seconds', run['total'], (('page', run['page']),))
+    if run['total'] > SLO_SECONDS:
+        REGISTRY.count('rerun_slo_breaches_total', 1, (('page', run['page']),))
+    REGISTRY.runs.append(run)
+    if METRICS_FILE:
+        try:
+            export(METRICS_FILE, run)
+        except OSError:
+            count('export_errors_total')
+    return run
+
+
+def export(path, run=None):
+    """`.prom` -> text Prometheus rescris atomic; altfel adaugă `run` ca linie JSON."""
+    if path.endswith('.prom'):
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'w') as f:
+            f.write(REGISTRY.prometheus_text())
+        os.replace(tmp, path)
+    elif run is not None:
+        with open(path, 'a') as f:
+            f.write(json.dumps(run, default=str) + "\n")
+
+
+_server = None
+
+
+def serve(port):
+    """Pornește (o singură dată pe proces) un endpoint HTTP /metrics pentru Prometheus."""
+    global _server
+    if _server is not None:
+        return _server
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip('/') != '/metrics':
+                self.send_error(404)
+                return
+            body = REGISTRY.prometheus_text().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    try:
+        _server = ThreadingHTTPServer(('', port), Handler)
+    except OSError:
+        # Alt proces (sau alt worker) ține deja portul
+        return None
+    threading.Thread(target=_server.serve_forever, daemon=True).start()
+    return _server
+
+
+if ENABLED and METRICS_PORT:
+    serve(METRICS_PORT)
@@ -0,0 +1,162 @@
+"""Sentimentul știrilor: un simbol (tab-ul Știri) sau toată lista de favorite dintr-o trecere.
+
+Lexiconul (termen -> pondere) se compilează într-un singur regex; fiecare titlu se scanează o
+dată, iar scorul lui se ține minte după ID-ul știrii, deci o reîmprospătare rescorează doar
+știrile noi. Scorul unui titlu = cea mai mare pondere pozitivă găsită + cea mai negativă
+(cu ponderi ±1 e exact regula veche: +1 dacă are un termen pozitiv, -1 dacă are unul negativ).
+
+Lexicon propriu: PRIME_SENTIMENT_LEXICON=lexicon.json ({"upgrade": 1.5, "lawsuit": -2, ...}),
+adăugat peste cel implicit.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from prime import metadata, throttle
+
+DEFAULT_LEXICON = {
+    'beat': 1, 'rise': 1, 'jump': 1, 'buy': 1, 'growth': 1, 'strong': 1, 'record': 1, 'profit': 1,
+    'miss': -1, 'fall': -1, 'drop': -1, 'sell': -1, 'weak': -1, 'loss': -1, 'crash': -1, 'risk': -1,
+}
+MAX_WORKERS = 8
+MAX_CACHED = 50_000
+
+
+def load_lexicon(path=None):
+    lexicon = dict(DEFAULT_LEXICON)
+    path = path or os.environ.get("PRIME_SENTIMENT_LEXICON")
+    if path:
+        with open(path, "r") as f:
+            lexicon.update({k.lower(): float(v) for k, v in json.load(f).items()})
+    return lexicon
+
+
+def label(score):
+    return "Pozitiv 🟢" if score > 0 else "Negativ 🔴" if score < 0 else "Neutru ⚪"
+
+
+def _title(item):
+    # yfinance vechi: {'title', 'uuid', 'providerPublishTime'}; nou: {'id', 'content': {'title', 'pubDate'}}
+    content = item.get('content') or {}
+    return item.get('title') or content.get('title') or ''
+
+
+def _published(item):
+    # (epoch, text ISO) - convertite vectorial, o singură dată, în `headlines`
+    content = item.get('content') or {}
+    return item.get('providerPublishTime'), content.get('pubDate')
+
+
+def _news_id(item, title):
+    return item.get('uuid') or item.get('id') or hashlib.sha1(title.encode()).hexdigest()
+
+
+class SentimentEngine:
+    """Scorare în lot cu un matcher precompilat și cache de scoruri per știre."""
+
+    def __init__(self, lexicon=None):
+        self.lexicon = {k.lower(): float(v) for k, v in (lexicon or load_lexicon()).items()}
+        # Termenii lungi primii, ca "profit warning" să câștige în fața lui "profit"
+        terms = sorted(self.lexicon, key=len, reverse=True)
+        self._matcher = re.compile("|".join(map(re.escape, terms)), re.IGNORECASE) if terms else None
+        self._scores = OrderedDict()
+        self._lock = threading.Lock()
+
+    def score_title(self, title):
+        if self._matcher is None or not title:
+            return 0.0
+        weights = [self.lexicon[m.lower()] for m in self._matcher.findall(title)]
+        return max([w for w in weights if w > 0], default=0.0) + min([w for w in weights if w < 0], default=0.0)
+
+    def score(self, news_id, title):
+        with self._lock:
+            cached = self._scores.get(news_id)
+        if cached is not None:
+            return cached
+        value = self.score_title(title)
+        with self._lock:
+            self._scores[news_id] = value
+            if len(self._scores) > MAX_CACHED:
+                self._scores.popitem(last=False)
+        return value
+
+    def headlines(self, feeds):
+        """{ticker: [știri yfinance]} -> un rând per (știre, simbol), fiecare știre scorată o singură dată."""
+        rows, seen_titles = [], {}
+        for ticker, items in feeds.items():
+            for item in items or []:
+                title = _title(item).strip()
+                if not title:
+                    continue
+                # Aceeași știre apare sub mai multe ID-uri / simboluri: deduplicăm și după titlu
+                news_id = seen_titles.setdefault(title.lower(), _news_id(item, title))
+                epoch, iso = _published(item)
+                rows.append((news_id, ticker, epoch, iso, title, self.score(news_id, title)))
+        df = pd.DataFrame(rows, columns=['id', 'ticker', 'epoch', 'iso', 'title', 'score'])
+        published = pd.to_datetime(df.pop('epoch'), unit='s', utc=True)
+        iso = df.pop('iso')
+        df.insert(2, 'published', published.fillna(pd.to_datetime(iso, utc=True, errors='coerce')))
+        return df.drop_duplicates(subset=['id', 'ticker'])
+
+    def summary(self, headlines):
+        """Per simbol: număr de știri, scor mediu, etichetă."""
+        if headlines.empty:
+            return pd.DataFrame(columns=['Știri', 'Scor', 'Sentiment'])
+        g = headlines.groupby('ticker')['score']
+        out = pd.DataFrame({'Știri': g.size(), 'Scor': g.mean().round(2)})
+        out['Sentiment'] = [label(s) for s in g.sum()]
+        return out.sort_values('Scor', ascending=False)
+
+    def timeseries(self, headlines, freq='D'):
+        """Scorul mediu pe simbol și interval (coloane = simboluri), pentru grafic."""
+        dated = headlines.dropna(subset=['published'])
+        if dated.empty:
+            return pd.DataFrame()
+        return (dated.groupby([pd.Grouper(key='published', freq=freq), 'ticker'])['score']
+                .mean()
+                .unstack('ticker'))
+
+
+ENGINE = SentimentEngine()
+
+
+def fetch_feeds(tickers, max_workers=MAX_WORKERS):
+    """Știrile pentru toate simbolurile, în paralel (din cache-ul comun de metadate)."""
+    if not tickers:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tickers))) as pool:
+        futures = {t: pool.submit(throttle.bind(metadata.get_news), t) for t in tickers}
+        feeds = {}
+        for t, fut in futures.items():
+            try:
+                feeds[t] = fut.result()
+            except Exception:
+                feeds[t] = []
+    return feeds
+
+
+def watchlist_sentiment(tickers, freq='D'):
+    """(sumar per simbol, serie de timp) pentru o listă de simboluri."""
+    heads = ENGINE.headlines(fetch_feeds(list(tickers)))
+    return ENGINE.summary(heads), ENGINE.timeseries(heads, freq)
+
+
+def get_news_sentiment(ticker):
+    try:
+        news = metadata.get_news(ticker)
+        headlines = []
+        if news:
+            for n in news[:5]:
+                t = _title(n)
+                if t and t not in headlines: headlines.append(t)
+        if not headlines: return "Neutru", ["Fara stiri recente."]
+        val = sum(ENGINE.score_title(h) for h in headlines)
+        return label(val), headlines
+    except:
+        return "Indisponibil", []
@@ -0,0 +1,76 @@
+"""Reducerea seriilor de preț pentru grafice: agregare OHLC adaptivă și LTTB pentru linii.
+
+Graficul are un buget fix de puncte (aprox. lățimea în pixeli / 2), deci payload-ul și timpul
+de randare rămân aproape constante indiferent de perioadă: 1mo rămâne zilnic, 'max' devine lunar.
+"""
+import numpy as np
+
+# Câte lumânări / puncte încap lizibil pe un grafic de ~1200px
+MAX_CANDLES = 500
+MAX_POINTS = 1000
+
+# (eticheta afișată, regula pandas, bare zilnice per bară agregată, aproximativ)
+RESOLUTIONS = [
+    ('zilnic', None, 1),
+    ('săptămânal', 'W-FRI', 5),
+    ('lunar', 'ME', 21),
+    ('trimestrial', 'QE', 63),
+]
+
+_OHLC_AGG = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+
+
+def pick_resolution(n_bars, budget=MAX_CANDLES):
+    """Cea mai fină rezoluție la care numărul de lumânări încape în buget."""
+    for label, _, per_bar in RESOLUTIONS:
+        if n_bars / per_bar <= budget:
+            return label
+    return RESOLUTIONS[-1][0]
+
+
+def resample_ohlc(history, resolution):
+    """Agregă barele zilnice; fiecare lumânare stă pe ultima zi de tranzacționare din interval."""
+    rule = dict((label, r) for label, r, _ in RESOLUTIONS)[resolution]
+    if rule is None or history.empty:
+        return history
+    cols = {c: agg for c, agg in _OHLC_AGG.items() if c in history.columns}
+    grouped = history[list(cols)].resample(rule)
+    out = grouped.agg(cols)
+    # Eticheta implicită e capătul intervalului (poate fi în viitor); folosim ultima zi reală
+    out.index = history.index.to_series().resample(rule).last()
+    return out.dropna(subset=['Close'])
+
+
+def downsample_ohlc(history, budget=MAX_CANDLES):
+    """(bare reduse, rezoluție) pentru un istoric zilnic."""
+    resolution = pick_resolution(len(history), budget)
+    return resample_ohlc(history, resolution), resolution
+
+
+def lttb(series, threshold=MAX_POINTS):
+    """Largest-Triangle-Three-Buckets: păstrează forma vizuală a unei linii cu `threshold` puncte.
+
+    Primul și ultimul punct rămân; din fiecare bucket intermediar se alege punctul care
+    formează triunghiul cel mai mare cu punctul ales anterior și media bucket-ului următor.
+    """
+    series = series.dropna()
+    n = len(series)
+    if threshold >= n or threshold < 3:
+        return series
+
+    x = np.arange(n, dtype=float)
+    y = series.to_numpy(dtype=float)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    keep = np.empty(threshold, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Media bucket-ului următor (ultimul bucket se sprijină pe ultimul punct)
+        nlo, nhi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(area.argmax())
+        keep[i + 1] = a
+    return series.iloc[keep]
@@ -0,0 +1,123 @@
+"""Riscul unui portofoliu din favorite: covarianță, corelații, metrici pe ponderi și frontiera eficientă.
+
+Definițiile sunt cele din `calculate_risk_metrics`: randamente zilnice simple, volatilitate =
+deviația standard (ddof=1) × √252, Sharpe = (media × 252 - 4%) / volatilitate, drawdown pe
+curba de capital. Portofoliul e rebalansat zilnic, deci media lui e w·μ și varianța w'Σw -
+exact ce ar da `calculate_risk_metrics` pe seria portofoliului.
+
+Frontiera se estimează Monte Carlo: zeci de mii de vectori de ponderi (Dirichlet), evaluați în
+loturi cu înmulțiri de matrice - randament, volatilitate și Sharpe din (μ, Σ), drawdown din
+drumul complet al fiecărui portofoliu.
+"""
+import numpy as np
+import pandas as pd
+
+from prime import indicators
+from prime.indicators import RISK_FREE_RATE, TRADING_DAYS
+
+SAMPLES = 20_000
+CHUNK = 2_048
+SEED = 7
+
+
+def daily_returns(closes):
+    """Randamente zilnice pe eșantionul comun (zilele în care toate simbolurile au preț)."""
+    closes = closes.dropna(axis=1, how='all').ffill()
+    return closes.pct_change().iloc[1:].dropna()
+
+
+def covariance(returns):
+    """(randamente medii zilnice, matricea de covarianță zilnică, ddof=1)."""
+    x = returns.to_numpy(dtype='float64')
+    mu = x.mean(axis=0)
+    dev = x - mu
+    cov = dev.T @ dev / max(len(x) - 1, 1)
+    return mu, cov
+
+
+def correlation(cov, tickers):
+    std = np.sqrt(np.diag(cov))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = cov / np.outer(std, std)
+    return pd.DataFrame(corr, index=tickers, columns=tickers)
+
+
+def _sharpe(mean, std):
+    annual_std = std * np.sqrt(TRADING_DAYS)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = (mean * TRADING_DAYS - RISK_FREE_RATE) / annual_std
+    return np.where(annual_std == 0, 0.0, sharpe), annual_std * 100
+
+
+def _max_drawdown(returns, weights):
+    """Max drawdown (%) pentru fiecare rând din `weights` (S × N), pe drumul zilnic complet."""
+    equity = np.cumprod(1 + returns @ weights.T, axis=0)        # T × S
+    peak = np.maximum.accumulate(np.vstack([np.ones((1, equity.shape[1])), equity]), axis=0)[1:]
+    return (equity / peak - 1).min(axis=0) * 100 if len(equity) else np.zeros(len(weights))
+
+
+def evaluate(returns, mu, cov, weights):
+    """Randament anual (%), volatilitate (%), Sharpe și max drawdown (%) pentru un lot de ponderi."""
+    weights = np.atleast_2d(weights)
+    mean = weights @ mu
+    var = ((weights @ cov) * weights).sum(axis=1)
+    sharpe, volatility = _sharpe(mean, np.sqrt(np.maximum(var, 0)))
+    return {
+        'return': mean * TRADING_DAYS * 100,
+        'volatility': volatility,
+        'sharpe': sharpe,
+        'max_dd': _max_drawdown(returns, weights),
+    }
+
+
+def portfolio_metrics(closes, weights):
+    """(volatilitate, max drawdown, Sharpe) pentru ponderile date - aceeași formă ca `calculate_risk_metrics`.
+
+    `weights`: {simbol: pondere}; se normalizează la sumă 1, simbolurile lipsă primesc 0.
+    """
+    returns = daily_returns(closes)
+    w = pd.Series(weights, dtype=float).reindex(returns.columns).fillna(0).to_numpy()
+    if not len(returns) or w.sum() <= 0:
+        return 0, 0, 0
+    equity = np.concatenate([[1.0], np.cumprod(1 + returns.to_numpy() @ (w / w.sum()))])
+    m = indicators.risk_metrics(pd.DataFrame({'Close': equity})).iloc[0]
+    return m['volatility'], m['max_dd'], m['sharpe']
+
+
+def sample_weights(n_assets, samples=SAMPLES, alpha=1.0, seed=SEED):
+    """Vectori de ponderi long-only (sumă 1); `alpha` < 1 dă portofolii mai concentrate."""
+    rng = np.random.default_rng(seed)
+    return rng.dirichlet(np.full(n_assets, alpha), size=samples)
+
+
+def efficient_mask(volatility, returns):
+    """Portofoliile de pe frontieră: niciun alt eșantion nu are randament mai mare la volatilitate mai mică."""
+    order = np.argsort(volatility, kind='stable')
+    best = np.maximum.accumulate(returns[order])
+    on_frontier = np.empty(len(order), dtype=bool)
+    on_frontier[order] = returns[order] >= best
+    return on_frontier
+
+
+def frontier(closes, samples=SAMPLES, alpha=1.0, seed=SEED, chunk=CHUNK):
+    """Monte Carlo pe ponderi: tabelul eșantioanelor, portofoliul cu Sharpe maxim și cel cu volatilitate minimă."""
+    returns = daily_returns(closes)
+    tickers = returns.columns
+    mu, cov = covariance(returns)
+    x = returns.to_numpy(dtype='float64')
+    weights = sample_weights(len(tickers), samples, alpha, seed)
+
+    # Pe loturi: drumurile zilnice (T × lot) nu trebuie să existe toate odată în memorie
+    parts = [evaluate(x, mu, cov, weights[i:i + chunk]) for i in range(0, len(weights), chunk)]
+    table = pd.DataFrame({k: np.concatenate([p[k] for p in parts]) for k in parts[0]})
+    table['efficient'] = efficient_mask(table['volatility'].to_numpy(), table['return'].to_numpy())
+
+    def pick(i):
+        return pd.Series(weights[i], index=tickers).sort_values(ascending=False)
+
+    return {
+        'samples': table,
+        'max_sharpe': pick(int(table['sharpe'].to_numpy().argmax())),
+        'min_volatility': pick(int(table['volatility'].to_numpy().argmin())),
+        'correlation': correlation(cov, tickers),
+    }
@@ -0,0 +1,153 @@
+"""Planificator în fundal care ține favoritele "calde", plus reîmprospătare stale-while-revalidate.
+
+Un singur thread pe procesul serverului reîmprospătează periodic istoricul (în lot) și
+fundamentalele tuturor favoritelor: des cât bursa e deschisă, rar cât e închisă. Pagina
+citește mereu ultima versiune bună din depozit / cache și nu așteaptă niciodată rețeaua
+pentru un simbol deja cunoscut; dacă datele sunt vechi, `revalidate_*` le aduce în fundal.
+
+    PRIME_PREFETCH=0                 oprește planificatorul
+    PRIME_PREFETCH_OPEN=60           secunde între treceri cu bursa deschisă
+    PRIME_PREFETCH_CLOSED=1800       secunde între treceri cu bursa închisă
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, time as dtime
+from zoneinfo import ZoneInfo
+
+from prime import fetch, fundamentals, metadata, metrics, store, throttle
+
+ENABLED = os.environ.get("PRIME_PREFETCH", "1").lower() not in ("0", "false", "no")
+OPEN_INTERVAL = float(os.environ.get("PRIME_PREFETCH_OPEN", 60))
+CLOSED_INTERVAL = float(os.environ.get("PRIME_PREFETCH_CLOSED", 30 * 60))
+# Fundamentalele se schimbă rar: le reîncărcăm doar când le rămâne mai puțin de atât din TTL
+META_DATASETS = ('info',)
+META_MARGIN = 2
+
+MARKET_TZ = ZoneInfo("America/New_York")
+MARKET_OPEN, MARKET_CLOSE = dtime(9, 30), dtime(16, 0)
+
+# Reîmprospătări la cerere (stale-while-revalidate): puține thread-uri, o singură cerere per cheie
+REVALIDATE_WORKERS = 4
+
+
+def market_open(now=None):
+    """True în orele de tranzacționare NYSE (luni-vineri, 9:30-16:00 ET; sărbătorile nu sunt excluse)."""
+    now = (now or datetime.now(MARKET_TZ)).astimezone(MARKET_TZ)
+    return now.weekday() < 5 and MARKET_OPEN <= now.time() < MARKET_CLOSE
+
+
+def current_interval(now=None):
+    return OPEN_INTERVAL if market_open(now) else CLOSED_INTERVAL
+
+
+_pool = None
+_inflight = set()
+_inflight_lock = threading.Lock()
+
+
+def _submit(key, fn, *args):
+    global _pool
+    with _inflight_lock:
+        if key in _inflight:
+            return False
+        _inflight.add(key)
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=REVALIDATE_WORKERS, thread_name_prefix="prime-revalidate")
+
+    def run():
+        try:
+            with throttle.priority(throttle.BACKGROUND):
+                fn(*args)
+        except Exception:
+            metrics.count('revalidate_errors_total', kind=key[0])
+        finally:
+            with _inflight_lock:
+                _inflight.discard(key)
+
+    metrics.count('revalidations_total', kind=key[0])
+    _pool.submit(run)
+    return True
+
+
+def revalidate_history(ticker):
+    """Aduce delta pentru `ticker` în fundal; apelurile repetate cât rulează deja sunt ignorate."""
+    return _submit(('history', ticker.upper()), store.sync_history, ticker)
+
+
+def revalidate_meta(ticker, dataset):
+    return _submit((dataset, ticker.upper()), metadata.CACHE.refresh, ticker, dataset)
+
+
+class Prefetcher:
+    """Thread daemon care reîmprospătează periodic simbolurile date de `tickers_fn()`."""
+
+    def __init__(self, tickers_fn, interval_fn=current_interval):
+        self.tickers_fn = tickers_fn
+        self.interval_fn = interval_fn
+        self._stop = threading.Event()
+        self._thread = None
+        self.last_run = None
+        self.last_duration = 0.0
+        self.last_count = 0
+        self.errors = {}
+
+    def run_once(self):
+        t = time.perf_counter()
+        tickers = list(self.tickers_fn())
+        # Prioritate mică: paginile deschise de utilizatori trec înaintea noastră la limita de rată
+        with throttle.priority(throttle.BACKGROUND):
+            # Istoricul: cel mult două descărcări în lot, doar pentru simbolurile vechi
+            _, errors = fetch.fetch_histories(tickers)
+            interval = self.interval_fn()
+            for ticker in tickers:
+                for dataset in META_DATASETS:
+                    if metadata.CACHE.expires_in(ticker, dataset) < META_MARGIN * interval:
+                        try:
+                            metadata.CACHE.refresh(ticker, dataset)
+                        except Exception as e:
+                            errors[ticker] = str(e)
+            # Instantaneul zilnic al fundamentalelor (o singură scriere pe zi și simbol)
+            infos = {}
+            for ticker in tickers:
+                try:
+                    infos[ticker] = metadata.get_info(ticker)
+                except Exception:
+                    pass
+            fundamentals.snapshot(infos)
+        self.errors = errors
+        self.last_count = len(tickers)
+        self.last_run = time.time()
+        self.last_duration = time.perf_counter() - t
+        metrics.observe('prefetch_seconds', self.last_duration)
+        return tickers
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception:
+                metrics.count('prefetch_errors_total')
+            self._stop.wait(self.interval_fn())
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="prime-prefetch", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def status(self):
+        return {
+            'running': self._thread is not None and self._thread.is_alive(),
+            'market_open': market_open(),
+            'interval': self.interval_fn(),
+            'last_run': self.last_run,
+            'last_duration': self.last_duration,
+            'tickers': self.last_count,
+            'errors': dict(self.errors),
+        }
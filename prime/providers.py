@@ -0,0 +1,348 @@
+"""Sursa de date de piață, interschimbabilă: Yahoo (yfinance), înregistrare și redare din fișiere.
+
+Sursa activă se alege cu `set_provider()` sau cu variabila de mediu PRIME_PROVIDER:
+    PRIME_PROVIDER=yfinance                                  (implicit)
+    PRIME_PROVIDER=record:/cale/inregistrari                 (Yahoo + salvează fiecare răspuns)
+    PRIME_PROVIDER=replay:/cale/inregistrari?latency=0.2&jitter=0.1&errors=0.05
+"""
+import hashlib
+import os
+import pickle
+import random
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+from prime import metrics, throttle, yfinance
+
+
+class ProviderError(Exception):
+    """Eroare de la sursa de date (reală sau injectată la redare)."""
+
+
+class MarketDataProvider:
+    """Interfața folosită de tot nucleul; nimic altceva nu vorbește direct cu Yahoo."""
+
+    name = "abstract"
+
+    def history(self, ticker, **kwargs):
+        raise NotImplementedError
+
+    def download(self, tickers, **kwargs):
+        """Istoric pentru mai multe simboluri, coloane MultiIndex (simbol, câmp)."""
+        frames = {t: self.history(t, **kwargs) for t in tickers}
+        frames = {t: f for t, f in frames.items() if f is not None and not f.empty}
+        return pd.concat(frames, axis=1) if frames else pd.DataFrame()
+
+    def info(self, ticker):
+        raise NotImplementedError
+
+    def quote(self, ticker):
+        raise NotImplementedError
+
+    def calendar(self, ticker):
+        raise NotImplementedError
+
+    def insider(self, ticker):
+        raise NotImplementedError
+
+    def news(self, ticker):
+        raise NotImplementedError
+
+
+class YFinanceProvider(MarketDataProvider):
+    name = "yfinance"
+
+    def history(self, ticker, **kwargs):
+        return yfinance().Ticker(ticker).history(**kwargs)
+
+    def download(self, tickers, **kwargs):
+        return yfinance().download(list(tickers), group_by='ticker', actions=True, auto_adjust=True,
+                                   ignore_tz=False, threads=True, progress=False, **kwargs)
+
+    def info(self, ticker):
+        return yfinance().Ticker(ticker).info
+
+    def quote(self, ticker):
+        return yfinance().Ticker(ticker).fast_info.last_price
+
+    def calendar(self, ticker):
+        return yfinance().Ticker(ticker).calendar
+
+    def insider(self, ticker):
+        return yfinance().Ticker(ticker).insider_transactions
+
+    def news(self, ticker):
+        return yfinance().Ticker(ticker).news
+
+
+def _key(kwargs):
+    # Argumentele apelului (perioadă, start, interval) devin parte din numele fișierului
+    raw = repr(sorted((k, str(v)) for k, v in kwargs.items()))
+    return hashlib.sha1(raw.encode()).hexdigest()[:12]
+
+
+def _path(directory, method, ticker, kwargs):
+    return os.path.join(directory, method, f"{ticker.upper()}__{_key(kwargs)}.pkl")
+
+
+class RecordingProvider(MarketDataProvider):
+    """Trece cererile la `inner` și salvează fiecare răspuns pentru `ReplayProvider`."""
+
+    name = "record"
+
+    def __init__(self, directory, inner=None):
+        self.directory = directory
+        self.inner = inner or YFinanceProvider()
+
+    def _record(self, method, ticker, kwargs, value):
+        p = _path(self.directory, method, ticker, kwargs)
+        os.makedirs(os.path.dirname(p), exist_ok=True)
+        tmp = f"{p}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, p)
+        return value
+
+    def history(self, ticker, **kwargs):
+        return self._record('history', ticker, kwargs, self.inner.history(ticker, **kwargs))
+
+    def download(self, tickers, **kwargs):
+        # Înregistrăm pe simbol, ca redarea să poată compune orice combinație de simboluri
+        raw = self.inner.download(tickers, **kwargs)
+        if raw is not None and not raw.empty and isinstance(raw.columns, pd.MultiIndex):
+            for t in raw.columns.get_level_values(0).unique():
+                self._record('history', t, kwargs, raw[t].dropna(how='all'))
+        return raw
+
+    def info(self, ticker):
+        return self._record('info', ticker, {}, self.inner.info(ticker))
+
+    def quote(self, ticker):
+        return self._record('quote', ticker, {}, self.inner.quote(ticker))
+
+    def calendar(self, ticker):
+        return self._record('calendar', ticker, {}, self.inner.calendar(ticker))
+
+    def insider(self, ticker):
+        return self._record('insider', ticker, {}, self.inner.insider(ticker))
+
+    def news(self, ticker):
+        return self._record('news', ticker, {}, self.inner.news(ticker))
+
+
+class ReplayProvider(MarketDataProvider):
+    """Redă răspunsurile înregistrate, cu latență și erori injectate configurabile.
+
+    `latency` + o variație uniformă de până la `jitter` secunde se adaugă fiecărei cereri;
+    cu probabilitatea `errors` cererea ridică `ProviderError`.
+    """
+
+    name = "replay"
+
+    def __init__(self, directory, latency=0.0, jitter=0.0, errors=0.0, seed=None):
+        self.directory = directory
+        self.latency = latency
+        self.jitter = jitter
+        self.errors = errors
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._loaded = {}
+        self.calls = 0
+
+    def _simulate(self):
+        with self._lock:
+            self.calls += 1
+            delay = self.latency + self._rng.uniform(0, self.jitter)
+            fail = self._rng.random() < self.errors
+        if delay > 0:
+            time.sleep(delay)
+        if fail:
+            raise ProviderError("Eroare injectată (replay)")
+
+    def _load(self, path):
+        value = self._loaded.get(path)
+        if value is None:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+            self._loaded[path] = value
+        return value
+
+    def _lookup(self, method, ticker, kwargs, simulate=True):
+        if simulate:
+            self._simulate()
+        exact = _path(self.directory, method, ticker, kwargs)
+        if os.path.exists(exact):
+            return self._load(exact)
+        # Fără înregistrare exactă (ex. alt `start`): folosim cea mai lungă înregistrare a simbolului
+        folder = os.path.join(self.directory, method)
+        prefix = f"{ticker.upper()}__"
+        candidates = [os.path.join(folder, f) for f in os.listdir(folder)] if os.path.isdir(folder) else []
+        candidates = [c for c in candidates if os.path.basename(c).startswith(prefix)]
+        if not candidates:
+            raise ProviderError(f"Nicio înregistrare pentru {method} {ticker}")
+        return self._load(max(candidates, key=os.path.getsize))
+
+    def history(self, ticker, simulate=True, **kwargs):
+        h = self._lookup('history', ticker, kwargs, simulate)
+        start = kwargs.get('start')
+        if start is not None and not h.empty:
+            start = pd.Timestamp(start)
+            if start.tz is None and h.index.tz is not None:
+                start = start.tz_localize(h.index.tz)
+            h = h[h.index >= start]
+        return h
+
+    def download(self, tickers, **kwargs):
+        # O singură cerere în lot = o singură latență, ca la Yahoo
+        self._simulate()
+        frames = {}
+        for t in tickers:
+            try:
+                frames[t] = self.history(t, simulate=False, **kwargs)
+            except ProviderError:
+                continue  # simbolurile lipsă dispar din rezultat, ca la yf.download
+        frames = {t: f for t, f in frames.items() if not f.empty}
+        return pd.concat(frames, axis=1) if frames else pd.DataFrame()
+
+    def info(self, ticker):
+        return self._lookup('info', ticker, {})
+
+    def quote(self, ticker):
+        return self._lookup('quote', ticker, {})
+
+    def calendar(self, ticker):
+        return self._lookup('calendar', ticker, {})
+
+    def insider(self, ticker):
+        return self._lookup('insider', ticker, {})
+
+    def news(self, ticker):
+        return self._lookup('news', ticker, {})
+
+
+class MeteredProvider(MarketDataProvider):
+    """Învelește sursa activă și numără cererile, erorile și durata lor, pe metodă și simbol."""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.name = inner.name
+
+    def __getattr__(self, attr):
+        # Atributele specifice sursei (ex. `calls` la redare) rămân accesibile
+        return getattr(self.inner, attr)
+
+    def _call(self, method, ticker, *args, **kwargs):
+        fn = getattr(self.inner, method)
+        if not metrics.ENABLED:
+            return fn(*args, **kwargs)
+        t = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        except Exception:
+            metrics.count('upstream_errors_total', method=method, ticker=ticker)
+            raise
+        finally:
+            metrics.count('upstream_requests_total', method=method, ticker=ticker)
+            metrics.observe('upstream_seconds', time.perf_counter() - t, method=method)
+
+    def history(self, ticker, **kwargs):
+        return self._call('history', ticker.upper(), ticker, **kwargs)
+
+    def download(self, tickers, **kwargs):
+        return self._call('download', '_lot', tickers, **kwargs)
+
+    def info(self, ticker):
+        return self._call('info', ticker.upper(), ticker)
+
+    def quote(self, ticker):
+        return self._call('quote', ticker.upper(), ticker)
+
+    def calendar(self, ticker):
+        return self._call('calendar', ticker.upper(), ticker)
+
+    def insider(self, ticker):
+        return self._call('insider', ticker.upper(), ticker)
+
+    def news(self, ticker):
+        return self._call('news', ticker.upper(), ticker)
+
+
+def provider_from_spec(spec):
+    """Construiește o sursă din textul PRIME_PROVIDER (vezi docstring-ul modulului)."""
+    if not spec or spec == "yfinance":
+        return YFinanceProvider()
+    kind, _, rest = spec.partition(":")
+    parts = urlsplit(rest)
+    opts = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+    if kind == "record":
+        return RecordingProvider(parts.path)
+    if kind == "replay":
+        return ReplayProvider(
+            parts.path,
+            latency=float(opts.get('latency', 0)),
+            jitter=float(opts.get('jitter', 0)),
+            errors=float(opts.get('errors', 0)),
+            seed=int(opts['seed']) if 'seed' in opts else None,
+        )
+    raise ValueError(f"Sursă de date necunoscută: {spec}")
+
+
+class ThrottledProvider(MarketDataProvider):
+    """Comasează cererile identice și le trece prin limita de rată comună (vezi prime.throttle)."""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.name = inner.name
+
+    def __getattr__(self, attr):
+        return getattr(self.inner, attr)
+
+    def _call(self, method, ticker, *args, **kwargs):
+        fn = getattr(self.inner, method)
+        return throttle.call(method, ticker, kwargs, lambda: fn(*args, **kwargs))
+
+    def history(self, ticker, **kwargs):
+        return self._call('history', ticker.upper(), ticker, **kwargs)
+
+    def download(self, tickers, **kwargs):
+        return self._call('download', tuple(sorted(tickers)), tickers, **kwargs)
+
+    def info(self, ticker):
+        return self._call('info', ticker.upper(), ticker)
+
+    def quote(self, ticker):
+        return self._call('quote', ticker.upper(), ticker)
+
+    def calendar(self, ticker):
+        return self._call('calendar', ticker.upper(), ticker)
+
+    def insider(self, ticker):
+        return self._call('insider', ticker.upper(), ticker)
+
+    def news(self, ticker):
+        return self._call('news', ticker.upper(), ticker)
+
+
+def _wrap(provider):
+    # Comasare + limită de rată la exterior, ca metricile să numere doar cererile reale
+    return ThrottledProvider(MeteredProvider(provider))
+
+
+_provider = None
+
+
+def get_provider():
+    global _provider
+    if _provider is None:
+        _provider = _wrap(provider_from_spec(os.environ.get("PRIME_PROVIDER")))
+    return _provider
+
+
+def set_provider(provider):
+    """Schimbă sursa activă pentru tot procesul (teste, load-test, înregistrare)."""
+    global _provider
+    _provider = _wrap(provider)
+    return provider
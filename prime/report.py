@@ -0,0 +1,220 @@
+"""Raportul PDF de audit (3 pagini) pentru un simbol."""
+from datetime import datetime
+
+from fpdf import FPDF
+
+
+# --- FUNCȚIE CURĂȚARE TEXT ---
+# Construit o singură dată, nu la fiecare apel. `str.replace` (C) pe șiruri scurte e mai rapid
+# decât `str.translate` sau un regex cu înlocuiri multi-caracter, așa că îl păstrăm.
+_PDF_REPLACEMENTS = tuple({
+    'ă': 'a', 'â': 'a', 'î': 'i', 'ș': 's', 'ț': 't',
+    'Ă': 'A', 'Â': 'A', 'Î': 'I', 'Ș': 'S', 'Ț': 'T',
+    '🔴': '[RISC]', '🟢': '[BUN]', '🟡': '[NEUTRU]', '⚪': '-',
+    '💎': '[GEM]', '🛡️': '[SCUT]', '📈': '[UP]', '📉': '[DOWN]'
+}.items())
+
+
+def clean_text_for_pdf(text):
+    """Transformă diacriticele în caractere simple pentru a nu crăpa PDF-ul."""
+    if text is None: return ""
+    text = str(text)
+    # Majoritatea textelor (cifre, etichete) sunt deja ASCII
+    if text.isascii(): return text
+    for k, v in _PDF_REPLACEMENTS:
+        if k in text:
+            text = text.replace(k, v)
+
+    # Eliminăm orice alt caracter ciudat care nu e latin-1
+    return text.encode('latin-1', 'ignore').decode('latin-1')
+
+
+# --- ȘABLON DE PAGINĂ ---
+# Textele fixe se curăță o singură dată, la import
+DISCLAIMER = clean_text_for_pdf(
+    "DISCLAIMER: Acest raport este generat automat de un algoritm software si are scop pur informativ. "
+    "Nu reprezinta un sfat financiar, juridic sau fiscal. Performantele trecute nu garanteaza rezultate viitoare. "
+    "Consultati un specialist inainte de a investi."
+)
+NO_DIVIDEND_TEXT = "Compania NU plateste dividende in prezent. Profitul este reinvestit."
+
+
+class AuditPDF(FPDF):
+    """Layout-ul comun al raportului: titluri de secțiune și paragrafe."""
+
+    def section(self, title):
+        self.set_font("Arial", 'B', 16)
+        self.cell(0, 12, title, ln=True, fill=True)
+        self.ln(5)
+
+    def heading(self, text, size=12, h=8):
+        self.set_font("Arial", 'B', size)
+        self.cell(0, h, text, ln=True)
+
+    def paragraph(self, h, text):
+        # Textele scurte încap pe un rând: `cell` dă același rezultat ca `multi_cell`, fără împărțirea pe cuvinte
+        w = self.w - self.r_margin - self.x
+        if '\n' not in text and self.get_string_width(text) <= w - 2 * self.c_margin:
+            self.cell(w, h, text, ln=1)
+        else:
+            self.multi_cell(0, h, text)
+
+
+# --- GENERATORUL DE RAPORT COMPLEX ---
+def create_extended_pdf(ticker, full_name, price, score, reasons, verdict, risk, info, rsi_val):
+    if not info: info = {}
+    pdf = AuditPDF()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    
+    # --- PAGINA 1: REZUMAT ---
+    pdf.add_page()
+    
+    # Titlu
+    pdf.set_font("Arial", 'B', 24)
+    pdf.cell(0, 20, f"RAPORT DE ANALIZA: {clean_text_for_pdf(ticker)}", ln=True, align='C')
+    
+    pdf.set_font("Arial", '', 10)
+    pdf.cell(0, 10, f"Generat automat de PRIME Terminal | Data: {datetime.now().strftime('%Y-%m-%d')}", ln=True, align='C')
+    pdf.ln(10)
+
+    # 1. SCOR ȘI VERDICT
+    pdf.set_fill_color(240, 240, 240)
+    pdf.section("1. VERDICT GENERAL")
+    
+    pdf.set_font("Arial", 'B', 14)
+    pdf.cell(50, 10, f"SCOR PRIME: {score}/100", ln=False)
+    pdf.cell(0, 10, f"CALIFICATIV: {clean_text_for_pdf(verdict)}", ln=True)
+    
+    pdf.set_font("Arial", '', 11)
+    pdf.ln(5)
+    pdf.multi_cell(0, 6, clean_text_for_pdf(
+        f"Compania {full_name} se tranzactioneaza la pretul de ${price:.2f}. "
+        f"Pe baza algoritmului nostru, aceasta prezinta un profil de risc cu volatilitate anuala de {risk['vol']:.1f}% "
+        f"si un Sharpe Ratio de {risk.get('sharpe', 0):.2f} (un numar mai mare de 1 indica un randament bun ajustat la risc)."
+    ))
+
+    pdf.ln(10)
+    pdf.heading("PUNCTE CHEIE (PRO/CONTRA)", size=14, h=10)
+    pdf.set_font("Arial", '', 11)
+    
+    if reasons:
+        for r in reasons:
+            pdf.cell(5, 8, "-", ln=False)
+            pdf.paragraph(8, clean_text_for_pdf(r))
+    else:
+        pdf.cell(0, 8, "Nu au fost identificate semnale majore automate.", ln=True)
+
+    # --- PAGINA 2: ANALIZA FUNDAMENTALĂ DETALIATĂ ---
+    pdf.add_page()
+    pdf.section("2. ANALIZA FUNDAMENTALA DETALIATA")
+
+    # A. EVALUARE (VALUATION)
+    pe = info.get('trailingPE')
+    peg = info.get('pegRatio')
+    pb = info.get('priceToBook')
+    
+    # Interpretare Textuala Evaluare
+    interp_val = "Date insuficiente."
+    if pe:
+        if pe < 15: interp_val = "Compania este considerata ieftina (Sub-evaluata)."
+        elif pe < 30: interp_val = "Evaluarea este corecta (Fair Value)."
+        else: interp_val = "Pretul include asteptari mari de crestere (Supra-evaluata)."
+    
+    pdf.heading(f"A. Evaluare (Cat platesti?): {clean_text_for_pdf(interp_val)}")
+    pdf.set_font("Arial", '', 11)
+    
+    col_w = 60
+    pdf.cell(col_w, 8, f"P/E Ratio: {pe if pe else 'N/A'}", border=1)
+    pdf.cell(col_w, 8, f"PEG Ratio: {peg if peg else 'N/A'}", border=1)
+    pdf.cell(col_w, 8, f"P/Book: {pb if pb else 'N/A'}", border=1, ln=True)
+    pdf.ln(5)
+
+    # B. PROFITABILITATE
+    mg = info.get('profitMargins', 0)
+    roe = info.get('returnOnEquity', 0)
+    
+    # Interpretare Textuala Profit
+    interp_prof = "Compania are probleme de profitabilitate."
+    if mg is not None:
+        if mg > 0.15: interp_prof = "Compania este o masina de bani (Marje foarte bune)."
+        elif mg > 0.05: interp_prof = "Profitabilitate stabila si normala."
+    else:
+        mg = 0
+    
+    pdf.heading(f"B. Profitabilitate: {clean_text_for_pdf(interp_prof)}")
+    pdf.set_font("Arial", '', 11)
+    
+    pdf.cell(col_w, 8, f"Marja Profit: {mg*100:.1f}%", border=1)
+    pdf.cell(col_w, 8, f"ROE (Randament): {roe*100:.1f}%", border=1)
+    pdf.cell(col_w, 8, f"Revenue Growth: {info.get('revenueGrowth', 0)*100:.1f}%", border=1, ln=True)
+    pdf.ln(5)
+
+    # C. BILANT SI DATORII
+    cash = info.get('totalCash', 0)
+    debt = info.get('totalDebt', 0)
+    current_ratio = info.get('currentRatio', 0)
+    
+    interp_health = "Situatie financiara riscanta."
+    if cash is None: cash = 0
+    if debt is None: debt = 0
+    if current_ratio is None: current_ratio = 0
+
+    if cash > debt: interp_health = "Bilant FORTAREATA (Mai multi bani decat datorii)."
+    elif current_ratio > 1.5: interp_health = "Stabilitate buna pe termen scurt."
+    
+    pdf.heading(f"C. Sanatate Financiara: {clean_text_for_pdf(interp_health)}")
+    pdf.set_font("Arial", '', 11)
+    
+    pdf.cell(col_w, 8, f"Cash Total: ${cash/1e9:.1f}B", border=1)
+    pdf.cell(col_w, 8, f"Datorie Totala: ${debt/1e9:.1f}B", border=1)
+    pdf.cell(col_w, 8, f"Lichiditate (Curr): {current_ratio:.2f}", border=1, ln=True)
+
+    # --- PAGINA 3: TEHNIC, DIVIDENDE SI DISCLAIMER ---
+    pdf.add_page()
+    pdf.section("3. ANALIZA TEHNICA & DIVIDENDE")
+
+    # RSI
+    interp_rsi = "Momentum Neutru."
+    if rsi_val > 70: interp_rsi = "Supra-cumparat (Posibila corectie)."
+    elif rsi_val < 30: interp_rsi = "Supra-vandut (Posibila revenire)."
+    
+    pdf.heading(f"Indicator RSI (14 zile): {rsi_val:.2f} -> {clean_text_for_pdf(interp_rsi)}")
+    
+    # Dividende
+    div_yield = info.get('dividendYield', 0)
+    if div_yield and div_yield < 1: div_yield = div_yield * 100 # Corectie
+    
+    pdf.ln(5)
+    pdf.heading("Politica de Dividende:")
+    pdf.set_font("Arial", '', 11)
+    if div_yield and div_yield > 0:
+        pdf.multi_cell(0, 6, clean_text_for_pdf(
+            f"Compania plateste dividende. Randamentul anual curent este de {div_yield:.2f}%. "
+            f"Rata de plata (Payout Ratio) este de {info.get('payoutRatio', 0)*100:.1f}%, ceea ce indica cat din profit se intoarce la investitori."
+        ))
+    else:
+        pdf.paragraph(6, NO_DIVIDEND_TEXT)
+
+    # TABEL DATE BRUTE SUPLIMENTARE
+    pdf.ln(10)
+    pdf.heading("Alte Date Relevante (Snapshot):")
+    pdf.set_font("Arial", '', 10)
+    
+    extra_data = [
+        ("Sector", info.get('sector', 'N/A')),
+        ("Industrie", info.get('industry', 'N/A')),
+        ("Angajati", info.get('fullTimeEmployees', 'N/A')),
+        ("Target Pret Analisti", f"${info.get('targetMeanPrice', 'N/A')}"),
+        ("Beta (Volatilitate vs Piata)", f"{info.get('beta', 'N/A')}")
+    ]
+    
+    for label, val in extra_data:
+        pdf.cell(60, 6, clean_text_for_pdf(label), border=1)
+        pdf.cell(0, 6, clean_text_for_pdf(str(val)), border=1, ln=True)
+
+    # DISCLAIMER FINAL
+    pdf.ln(20)
+    pdf.set_font("Arial", 'I', 8)
+    pdf.multi_cell(0, 5, DISCLAIMER)
+
+    return pdf.output(dest='S').encode('latin-1', 'ignore')
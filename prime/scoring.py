@@ -0,0 +1,70 @@
+"""Scorul PRIME, metricile de risc și verdictul - aceleași reguli în UI, screener și rapoarte."""
+from prime import indicators
+
+
+def calculate_rsi(data, window=14):
+    # Motorul vectorizat lucrează pe orice număr de coloane; aici e una singură
+    return indicators.rsi(data, window)
+
+
+def calculate_risk_metrics(history):
+    if history.empty: return 0, 0, 0
+    
+    # Volatilitate, Max Drawdown, Sharpe - aceleași formule ca pentru o listă întreagă
+    m = indicators.risk_metrics(history[['Close']]).iloc[0]
+    return m['volatility'], m['max_dd'], m['sharpe']
+
+
+def calculate_prime_score(info, history):
+    score = 0
+    reasons = []
+    
+    if not info: info = {} # Protectie daca info e gol
+    
+    # 1. TREND
+    if not history.empty:
+        trend = indicators.sma_trend(history[['Close']]).iloc[0]
+        trend_name = "SMA200" if trend['full_window'] else "Media Perioadei"
+        if trend['above']:
+            score += 20
+            reasons.append(f"Trend Ascendent (Peste {trend_name})")
+
+    # 2. EVALUARE
+    peg = info.get('pegRatio')
+    if peg is not None and 0 < peg < 2.0:
+        score += 20
+        reasons.append(f"Preț Bun pt Creștere (PEG: {peg:.2f})")
+    elif info.get('trailingPE', 100) < 25: 
+        score += 10
+        reasons.append("P/E Decent (<25)")
+
+    # 3. EFICIENȚĂ
+    roe = info.get('returnOnEquity', 0) or 0
+    if roe > 0.15:
+        score += 20
+        reasons.append(f"Management Eficient (ROE: {roe*100:.1f}%)")
+
+    # 4. CREȘTERE
+    rg = info.get('revenueGrowth', 0) or 0
+    if rg > 0.10: 
+        score += 20
+        reasons.append(f"Creștere Venituri: {rg*100:.1f}%")
+
+    # 5. SIGURANȚĂ
+    fcf = info.get('freeCashflow')
+    if fcf is not None and fcf > 0:
+        score += 20
+        reasons.append("Generează Cash (FCF Pozitiv)")
+    elif (info.get('totalCash', 0) > info.get('totalDebt', 0)):
+        score += 20
+        reasons.append("Bilanț Solid (Cash > Datorii)")
+
+    return score, reasons
+
+
+def get_verdict(score, max_dd, sharpe):
+    """Calificativul afișat și stilul casetei (success / warning / error)."""
+    if max_dd < -50: return "Prăbușire Istorică 🔴", "error"
+    elif sharpe > 1.0 and score > 70: return "💎 GEM (Oportunitate)", "success"
+    elif score > 60: return "Solid 🟢", "success"
+    else: return "Neutru / Riscant 🟡", "warning"
@@ -0,0 +1,174 @@
+"""Screener pe un univers întreg (CSV), rulat pe un pool de procese, cu reluare din checkpoint.
+
+Rulare fără UI:
+    python -m prime.screener sp500.csv --period 1y --out screener_results.csv
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import pandas as pd
+
+from prime import fetch, fundamentals, store, throttle
+from prime.scoring import calculate_prime_score, calculate_risk_metrics, get_verdict
+
+RESULTS_FILE = "screener_results.csv"
+CHECKPOINT_FILE = "screener_checkpoint.jsonl"
+# Câte simboluri primește un proces odată (o descărcare în lot per bucată)
+CHUNK_SIZE = 25
+COLUMNS = ['Simbol', 'Scor', 'Verdict', 'Sharpe', 'Max Drawdown', 'Volatilitate', 'Motive', 'Eroare']
+
+
+def load_universe(path):
+    """Simbolurile dintr-un CSV: coloana Symbol/Ticker/Simbol, altfel prima coloană."""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        rows = list(csv.reader(f))
+    if not rows:
+        return []
+    header = [h.strip().lower() for h in rows[0]]
+    col = next((header.index(n) for n in ('symbol', 'ticker', 'simbol') if n in header), None)
+    if col is None:
+        col, body = 0, rows
+    else:
+        body = rows[1:]
+    tickers = [r[col].strip().upper().replace('.', '-') for r in body if len(r) > col and r[col].strip()]
+    return list(dict.fromkeys(tickers))
+
+
+def _fetch_chunk(tickers, period):
+    # În procesul părinte: fiecare worker ar avea propria limită de rată și propriul întrerupător,
+    # deci împreună ar cere de `workers` ori mai mult decât bugetul PRIME_UPSTREAM_RATE
+    with throttle.priority(throttle.BATCH):
+        histories, errors = fetch.fetch_histories(tickers)
+        infos, info_errors = fetch.fetch_infos(tickers)
+    fundamentals.snapshot(infos)
+    # Spre worker pleacă doar fereastra `period`, nu tot istoricul
+    histories = {t: store.slice_period(h, period) for t, h in histories.items()}
+    return histories, infos, errors, info_errors
+
+
+def _score_chunk(tickers, histories, infos, errors, info_errors):
+    # Rulează într-un proces separat, doar calcul: datele vin gata aduse de `_fetch_chunk`
+    rows = []
+    for t in tickers:
+        row = {'Simbol': t}
+        try:
+            history = histories.get(t, pd.DataFrame())
+            if history.empty:
+                raise ValueError(errors.get(t, "Fără date de preț."))
+            info = infos.get(t) or {}
+            volatility, max_dd, sharpe = calculate_risk_metrics(history)
+            score, reasons = calculate_prime_score(info, history)
+            verdict, _ = get_verdict(score, max_dd, sharpe)
+            row.update({
+                'Scor': score, 'Verdict': verdict, 'Sharpe': float(sharpe),
+                'Max Drawdown': float(max_dd), 'Volatilitate': float(volatility),
+                'Motive': "; ".join(reasons), 'Eroare': info_errors.get(t, ''),
+            })
+        except Exception as e:
+            row['Eroare'] = str(e)
+        rows.append(row)
+    return rows
+
+
+def _read_checkpoint(path):
+    done = {}
+    if path and os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    continue  # ultima linie poate fi tăiată dacă procesul a fost oprit
+                # Rândurile cu eroare (timeout, limită, sursă căzută) nu intră: la reluare se reîncearcă
+                if not row.get('Eroare'):
+                    done[row['Simbol']] = row
+    return done
+
+
+def rank(rows):
+    """Tabelul final, sortat după scor și apoi Sharpe."""
+    df = pd.DataFrame(list(rows), columns=COLUMNS)
+    return df.sort_values(['Scor', 'Sharpe'], ascending=False, na_position='last').reset_index(drop=True)
+
+
+def run_screener(tickers, period="1y", workers=None, checkpoint=CHECKPOINT_FILE,
+                 chunk_size=CHUNK_SIZE, progress=None):
+    """Scor PRIME + risc pentru fiecare simbol; simbolurile reușite din checkpoint nu se mai recalculează.
+
+    Descărcările rulează aici, bucată cu bucată, sub o singură limită de rată; procesele din pool
+    primesc doar calculul. Cel mult `2 × workers` bucăți descărcate așteaptă calculul în memorie.
+    """
+    workers = workers or os.cpu_count()
+    done = _read_checkpoint(checkpoint)
+    todo = [t for t in tickers if t not in done]
+    chunks = [todo[i:i + chunk_size] for i in range(0, len(todo), chunk_size)]
+
+    if chunks:
+        ckpt = open(checkpoint, 'a', encoding='utf-8') if checkpoint else None
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                in_flight = set()
+
+                def collect(**wait_args):
+                    finished, _ = wait(in_flight, **wait_args)
+                    for fut in finished:
+                        in_flight.discard(fut)
+                        for row in fut.result():
+                            done[row['Simbol']] = row
+                            # Doar rândurile reușite: o eroare trecătoare nu devine permanentă la reluare
+                            if ckpt and not row.get('Eroare'):
+                                ckpt.write(json.dumps(row, ensure_ascii=False) + "\n")
+                        if ckpt:
+                            ckpt.flush()
+                        if progress:
+                            progress(len(done), len(tickers))
+
+                for c in chunks:
+                    in_flight.add(pool.submit(_score_chunk, c, *_fetch_chunk(c, period)))
+                    collect(timeout=0)
+                    while len(in_flight) >= 2 * workers:
+                        collect(return_when=FIRST_COMPLETED)
+                while in_flight:
+                    collect(return_when=FIRST_COMPLETED)
+        finally:
+            if ckpt:
+                ckpt.close()
+
+    return rank(done[t] for t in tickers if t in done)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Screener PRIME pe un univers de simboluri.")
+    parser.add_argument("universe", help="CSV cu simboluri (S&P 500, Russell 1000, lista proprie)")
+    parser.add_argument("--period", default="1y")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--checkpoint", default=CHECKPOINT_FILE)
+    parser.add_argument("--out", default=RESULTS_FILE)
+    parser.add_argument("--fresh", action="store_true", help="Ignoră checkpoint-ul existent")
+    args = parser.parse_args(argv)
+
+    if args.fresh and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+
+    tickers = load_universe(args.universe)
+    start = time.perf_counter()
+    table = run_screener(
+        tickers, args.period, args.workers, args.checkpoint,
+        progress=lambda n, total: print(f"\r{n}/{total}", end="", file=sys.stderr),
+    )
+    print(file=sys.stderr)
+    table.to_csv(args.out, index=False)
+    # Run complet: checkpoint-ul nu mai e necesar
+    if os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+    print(f"{len(table)} simboluri în {time.perf_counter() - start:.1f}s -> {args.out}")
+    print(table.head(20).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""Depozit local (Parquet) pentru istoricul zilnic OHLCV, cu descărcări incrementale.
+
+Pe disc ținem un singur istoric canonic per simbol (toată perioada, 'max'), în două forme:
+Parquet complet (sursa de adevăr pentru delta și reajustări) și o copie compactă mapată în
+memorie (vezi prime.compact) din care citește pagina. Orice perioadă e doar o felie din ea,
+deci schimbarea perioadei nu descarcă și nu copiază nimic.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+from prime import compact, metrics
+from prime.providers import get_provider
+
+STORE_DIR = os.environ.get("PRIME_STORE_DIR", "prime_store")
+
+# Câte zile cerem în urmă la delta, ca să putem verifica dacă Yahoo a reajustat istoricul
+OVERLAP_DAYS = 7
+# Diferență relativă peste care considerăm că prețurile vechi au fost reajustate (split/dividend)
+ADJ_TOLERANCE = 1e-4
+# Dacă fișierul a fost sincronizat recent, nu mai întrebăm deloc Yahoo
+MIN_SYNC_SECONDS = 60
+
+# Câte istorice compacte ținem deschise (mapate), comune tuturor sesiunilor
+MEMORY_TICKERS = 256
+
+PERIOD_OFFSETS = {
+    '1mo': pd.DateOffset(months=1),
+    '3mo': pd.DateOffset(months=3),
+    '6mo': pd.DateOffset(months=6),
+    '1y': pd.DateOffset(years=1),
+    '2y': pd.DateOffset(years=2),
+    '3y': pd.DateOffset(years=3),
+    '5y': pd.DateOffset(years=5),
+    '10y': pd.DateOffset(years=10),
+}
+
+
+def _path(ticker):
+    return os.path.join(STORE_DIR, f"{ticker.upper()}.parquet")
+
+
+def _compact_path(ticker):
+    return os.path.join(STORE_DIR, f"{ticker.upper()}.cols")
+
+
+def load_history(ticker):
+    """Citește istoricul salvat pe disc (sau un DataFrame gol)."""
+    p = _path(ticker)
+    if not os.path.exists(p):
+        return pd.DataFrame()
+    try:
+        return pd.read_parquet(p)
+    except Exception:
+        return pd.DataFrame()
+
+
+def save_history(ticker, history):
+    # Scriere atomică: fișier temporar + rename, ca o sesiune să nu citească un fișier pe jumătate.
+    # Întâi copia compactă: dacă procesul moare între cele două, Parquet-ul rămâne mai vechi
+    # și următoarea sincronizare le aduce pe amândouă la zi
+    os.makedirs(STORE_DIR, exist_ok=True)
+    compact.write(_compact_path(ticker), history)
+    p = _path(ticker)
+    tmp = f"{p}.{os.getpid()}.tmp"
+    history.to_parquet(tmp)
+    os.replace(tmp, p)
+
+
+# cale -> (mtime_ns, vedere read-only peste fișierul mapat)
+_memory = OrderedDict()
+_memory_lock = threading.Lock()
+
+
+def load_compact(ticker):
+    """Istoricul canonic compact (mapat în memorie, read-only), sau gol dacă simbolul nu e în depozit."""
+    p = _compact_path(ticker)
+    try:
+        mtime = os.stat(p).st_mtime_ns
+    except OSError:
+        # Depozit scris înainte de formatul compact: îl generăm o dată din Parquet
+        full = load_history(ticker)
+        if full.empty:
+            return full
+        compact.write(p, full)
+        mtime = os.stat(p).st_mtime_ns
+    with _memory_lock:
+        hit = _memory.get(p)
+        if hit is not None and hit[0] == mtime:
+            _memory.move_to_end(p)
+            return hit[1]
+    view = compact.read(p)
+    with _memory_lock:
+        _memory[p] = (mtime, view)
+        _memory.move_to_end(p)
+        while len(_memory) > MEMORY_TICKERS:
+            _memory.popitem(last=False)
+    return view
+
+
+def _download(ticker, **kwargs):
+    return get_provider().history(ticker, **kwargs)
+
+
+def _needs_rebase(stored, delta, last):
+    """True dacă delta arată un split/dividend nou sau prețuri vechi reajustate."""
+    new = delta[delta.index > last]
+    for col in ('Dividends', 'Stock Splits'):
+        if col in new.columns and (new[col].fillna(0) != 0).any():
+            return True
+
+    # Ultima bară salvată poate fi una parțială (în timpul ședinței), o excludem din comparație
+    common = stored.index[stored.index < last].intersection(delta.index)
+    if common.empty:
+        return False
+    old = stored.loc[common, 'Close']
+    fresh = delta.loc[common, 'Close']
+    diff = ((fresh - old).abs() / old.abs()).max()
+    return bool(diff > ADJ_TOLERANCE)
+
+
+def age(ticker):
+    """Secunde de la ultima sincronizare reușită cu sursa (inf dacă simbolul nu e în depozit)."""
+    try:
+        return time.time() - os.path.getmtime(_path(ticker))
+    except OSError:
+        return float('inf')
+
+
+def is_fresh(ticker):
+    """True dacă fișierul a fost sincronizat în ultimele MIN_SYNC_SECONDS secunde."""
+    return age(ticker) < MIN_SYNC_SECONDS
+
+
+def delta_start(stored):
+    """Data de la care cerem delta pentru un istoric salvat."""
+    return (stored.index[-1] - pd.Timedelta(days=OVERLAP_DAYS)).strftime('%Y-%m-%d')
+
+
+def store_full(ticker, full):
+    if full is not None and not full.empty:
+        save_history(ticker, full)
+    return full
+
+
+def merge_delta(ticker, stored, delta):
+    """Lipește delta peste istoricul salvat și îl scrie pe disc."""
+    if delta is None or delta.empty:
+        os.utime(_path(ticker))
+        return stored
+
+    if delta.index.tz is not None and stored.index.tz is not None:
+        delta = delta.tz_convert(stored.index.tz)
+
+    last = stored.index[-1]
+    if _needs_rebase(stored, delta, last):
+        # Yahoo a reajustat trecutul: rescriem tot istoricul o singură dată
+        metrics.count('store_rebases_total', ticker=ticker.upper())
+        full = _download(ticker, period="max")
+        if full.empty:
+            return stored
+        return store_full(ticker, full)
+
+    # Bara `last` se înlocuiește cu versiunea proaspătă (poate fi fost parțială)
+    merged = pd.concat([stored[stored.index < last], delta[delta.index >= last]])
+    merged = merged[~merged.index.duplicated(keep='last')]
+    save_history(ticker, merged)
+    return merged
+
+
+def sync_history(ticker):
+    """Aduce istoricul complet la zi, descărcând doar barele noi față de disc."""
+    stored = load_history(ticker)
+
+    if stored.empty:
+        metrics.count('store_syncs_total', kind='full', ticker=ticker.upper())
+        return store_full(ticker, _download(ticker, period="max"))
+
+    if is_fresh(ticker):
+        metrics.count('store_syncs_total', kind='fresh', ticker=ticker.upper())
+        return stored
+
+    metrics.count('store_syncs_total', kind='delta', ticker=ticker.upper())
+    try:
+        delta = _download(ticker, start=delta_start(stored))
+    except Exception:
+        return stored
+    return merge_delta(ticker, stored, delta)
+
+
+def slice_period(history, period):
+    """Returnează fereastra `period` ('1y', '5y', 'max' ...) din istoricul complet."""
+    if history.empty or period == 'max' or period not in PERIOD_OFFSETS:
+        return history
+    cutoff = history.index[-1] - PERIOD_OFFSETS[period]
+    # Felie pozițională (indexul e sortat): o vedere peste istoricul canonic, fără copie
+    return history.iloc[history.index.searchsorted(cutoff, side='right'):]
+
+
+def get_history(ticker, period, revalidate=None):
+    """Fereastra `period` din istoricul compact; Parquet-ul se citește doar când chiar se lipește o delta.
+
+    Cu `revalidate`, un istoric vechi se returnează imediat, iar `revalidate(ticker)`
+    aduce delta în fundal (stale-while-revalidate).
+    """
+    view = load_compact(ticker)
+    if view.empty or (not is_fresh(ticker) and revalidate is None):
+        sync_history(ticker)
+        view = load_compact(ticker)
+    elif not is_fresh(ticker):
+        metrics.count('store_syncs_total', kind='stale', ticker=ticker.upper())
+        revalidate(ticker)
+    else:
+        metrics.count('store_syncs_total', kind='fresh', ticker=ticker.upper())
+    return slice_period(view, period)
@@ -0,0 +1,320 @@
+"""Protecția sursei de date: cereri identice comasate (single-flight) și limită de rată cu priorități.
+
+Toate cererile upstream trec prin `ThrottledProvider` (vezi providers.get_provider):
+- dacă aceeași cerere (metodă, simbol, argumente) e deja în zbor, apelantul așteaptă
+  rezultatul ei în loc să mai pornească una;
+- fiecare cerere reală consumă un jeton dintr-un token bucket comun procesului; când nu
+  sunt jetoane, cererile așteaptă la coadă în ordinea priorității, apoi FIFO.
+
+Prioritatea se alege cu `with priority(BACKGROUND): ...` (implicit INTERACTIVE) și se
+moștenește în thread-urile pornite cu `bind()`.
+
+Fiecare metodă (history, info, news ...) are și un întrerupător (circuit breaker): după
+BREAKER_FAILURES căderi consecutive ale sursei (rețea, timeout, 429, 5xx - nu simboluri
+necunoscute sau fără date, vezi `upstream_failure`) nu mai trimitem nimic la sursă timp de BREAKER_COOLDOWN
+secunde - apelanții primesc imediat `CircuitOpenError` și servesc ultimele date bune - apoi
+o singură cerere de probă decide dacă circuitul se închide la loc.
+
+    PRIME_UPSTREAM_RATE=5       cereri pe secundă, în medie
+    PRIME_UPSTREAM_BURST=10     cereri permise în rafală
+    PRIME_BREAKER_FAILURES=5    erori consecutive care deschid circuitul
+    PRIME_BREAKER_COOLDOWN=30   secunde cu circuitul deschis
+"""
+import contextlib
+import contextvars
+import heapq
+import itertools
+import os
+import threading
+import time
+
+from prime import metrics
+
+INTERACTIVE, BACKGROUND, BATCH = 0, 1, 2
+PRIORITY_NAMES = {INTERACTIVE: 'interactive', BACKGROUND: 'background', BATCH: 'batch'}
+
+RATE = float(os.environ.get("PRIME_UPSTREAM_RATE", 5))
+BURST = float(os.environ.get("PRIME_UPSTREAM_BURST", 10))
+BREAKER_FAILURES = int(os.environ.get("PRIME_BREAKER_FAILURES", 5))
+BREAKER_COOLDOWN = float(os.environ.get("PRIME_BREAKER_COOLDOWN", 30))
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half-open'
+
+_priority = contextvars.ContextVar('prime_priority', default=INTERACTIVE)
+
+
+@contextlib.contextmanager
+def priority(level):
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority():
+    return _priority.get()
+
+
+def bind(fn):
+    """`fn` rulat în alt thread (ex. ThreadPoolExecutor) cu prioritatea apelantului de acum."""
+    level = _priority.get()
+
+    def run(*args, **kwargs):
+        with priority(level):
+            return fn(*args, **kwargs)
+    return run
+
+
+class RateLimiter:
+    """Token bucket cu coadă de priorități: `acquire()` blochează până primește un jeton."""
+
+    def __init__(self, rate=RATE, burst=BURST):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+        self._waiters = []  # heap de (prioritate, ordine)
+        self._seq = itertools.count()
+        self.max_depth = 0
+        self.waits = {}     # prioritate -> [număr, total secunde, maxim]
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, level=None):
+        """Ia un jeton; returnează cât a așteptat (secunde)."""
+        level = current_priority() if level is None else level
+        if self.rate <= 0:
+            return 0.0
+        start = time.monotonic()
+        with self._cond:
+            entry = (level, next(self._seq))
+            heapq.heappush(self._waiters, entry)
+            self.max_depth = max(self.max_depth, len(self._waiters))
+            try:
+                while True:
+                    self._refill()
+                    if self._waiters[0] == entry and self._tokens >= 1:
+                        heapq.heappop(self._waiters)
+                        self._tokens -= 1
+                        break
+                    # Doar primul din coadă știe cât mai are de așteptat; ceilalți sunt treziți de el
+                    timeout = (1 - self._tokens) / self.rate if self._waiters[0] == entry else None
+                    self._cond.wait(timeout)
+            except BaseException:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                raise
+            finally:
+                self._cond.notify_all()
+            waited = time.monotonic() - start
+            w = self.waits.setdefault(level, [0, 0.0, 0.0])
+            w[0] += 1
+            w[1] += waited
+            w[2] = max(w[2], waited)
+        metrics.observe('ratelimit_wait_seconds', waited, priority=PRIORITY_NAMES.get(level, level))
+        return waited
+
+    def stats(self):
+        with self._cond:
+            self._refill()
+            return {
+                'rate': self.rate,
+                'burst': self.burst,
+                'tokens': round(self._tokens, 2),
+                'queue_depth': len(self._waiters),
+                'max_depth': self.max_depth,
+                'waits': {PRIORITY_NAMES.get(p, p): {'count': c, 'mean': total / c, 'max': peak}
+                          for p, (c, total, peak) in self.waits.items()},
+            }
+
+
+class _Flight:
+    __slots__ = ('done', 'value', 'error', 'followers')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """Execută cel mult un `fn` per cheie în același timp; ceilalți apelanți primesc același rezultat."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+        self.leaders = 0
+        self.shared = 0
+
+    def do(self, key, fn):
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.leaders += 1
+            else:
+                flight.followers += 1
+                self.shared += 1
+        if not leader:
+            metrics.count('upstream_coalesced_total', method=key[0])
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+        try:
+            flight.value = fn()
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def stats(self):
+        with self._lock:
+            return {'in_flight': len(self._flights), 'leaders': self.leaders, 'shared': self.shared}
+
+
+class CircuitOpenError(Exception):
+    """Sursa a dat prea multe erori la rând; cererea nu a mai fost trimisă."""
+
+    def __init__(self, method, retry_in):
+        super().__init__(f"{method}: sursa nu răspunde, reîncercăm în {retry_in:.0f}s")
+        self.method = method
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Închis -> deschis după `failures` erori consecutive -> semi-deschis după `cooldown` (o cerere de probă)."""
+
+    def __init__(self, method, failures=BREAKER_FAILURES, cooldown=BREAKER_COOLDOWN):
+        self.method = method
+        self.failures = failures
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._errors = 0
+        self._opened = 0.0
+        self._probing = False
+        self.rejected = 0
+        self.trips = 0
+
+    def _retry_in(self):
+        return max(0.0, self._opened + self.cooldown - time.monotonic())
+
+    def before(self):
+        """Ridică `CircuitOpenError` dacă cererea nu are voie să plece."""
+        with self._lock:
+            if self._state == OPEN and not self._retry_in():
+                self._state = HALF_OPEN
+            if self._state == CLOSED or (self._state == HALF_OPEN and not self._probing):
+                self._probing = self._state == HALF_OPEN
+                return
+            self.rejected += 1
+            retry_in = self._retry_in()
+        metrics.count('breaker_rejections_total', method=self.method)
+        raise CircuitOpenError(self.method, retry_in)
+
+    def success(self):
+        with self._lock:
+            self._state, self._errors, self._probing = CLOSED, 0, False
+
+    def release(self):
+        """Cererea s-a întrerupt fără verdict (ex. KeyboardInterrupt): eliberează doar proba."""
+        with self._lock:
+            self._probing = False
+
+    def failure(self):
+        with self._lock:
+            self._errors += 1
+            if self._state == HALF_OPEN or self._errors >= self.failures:
+                tripped = self._state != OPEN
+                self._state, self._opened, self._probing = OPEN, time.monotonic(), False
+            else:
+                tripped = False
+            if tripped:
+                self.trips += 1
+        if tripped:
+            metrics.count('breaker_trips_total', method=self.method)
+
+    def retry_in(self):
+        """Secunde până la următoarea cerere de probă (0 dacă circuitul e închis)."""
+        with self._lock:
+            return self._retry_in() if self._state == OPEN else 0.0
+
+    def stats(self):
+        retry_in = self.retry_in()
+        with self._lock:
+            return {'state': self._state, 'errors': self._errors, 'retry_in': round(retry_in, 1),
+                    'trips': self.trips, 'rejected': self.rejected}
+
+
+def upstream_failure(exc):
+    """True dacă eroarea arată o problemă a sursei (rețea, timeout, 429, 5xx), nu a cererii.
+
+    Un simbol necunoscut (404), un ETF fără calendar sau o înregistrare lipsă (`ProviderError`)
+    nu trebuie să oprească cererile pentru toate celelalte simboluri.
+    """
+    status = getattr(getattr(exc, 'response', None), 'status_code', None)
+    if status is not None:
+        return status == 429 or status >= 500
+    name = type(exc).__name__
+    return isinstance(exc, OSError) or 'Timeout' in name or 'RateLimit' in name
+
+
+# Comune tuturor sesiunilor din proces
+LIMITER = RateLimiter()
+FLIGHTS = SingleFlight()
+BREAKERS = {}
+_breakers_lock = threading.Lock()
+
+
+def breaker(method):
+    with _breakers_lock:
+        b = BREAKERS.get(method)
+        if b is None:
+            b = BREAKERS[method] = CircuitBreaker(method)
+        return b
+
+
+def call(method, ticker, kwargs, fn):
+    """Cererea `fn` comasată pe (metodă, simbol, argumente), păzită de întrerupător și trecută prin limita de rată."""
+    guard = breaker(method)
+
+    def limited():
+        # Întâi întrerupătorul: o cerere respinsă nu consumă jeton și nu stă la coadă
+        guard.before()
+        ok = None
+        try:
+            LIMITER.acquire()
+            value = fn()
+            ok = True
+            return value
+        except Exception as e:
+            ok = not upstream_failure(e)
+            raise
+        finally:
+            # Și la BaseException: altfel o probă întreruptă ar ține circuitul blocat pentru totdeauna
+            if ok is None:
+                guard.release()
+            elif ok:
+                guard.success()
+            else:
+                guard.failure()
+    key = (method, ticker, tuple(sorted((k, str(v)) for k, v in kwargs.items())))
+    return FLIGHTS.do(key, limited)
+
+
+def stats():
+    with _breakers_lock:
+        breakers = {m: b.stats() for m, b in BREAKERS.items()}
+    return {'limiter': LIMITER.stats(), 'flights': FLIGHTS.stats(), 'breakers': breakers}
@@ -0,0 +1,92 @@
+"""Backtest: drawdown-ul pe ferestre față de o buclă directă și împerecherea intrărilor cu ieșirile."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.fixtures import make_history
+from prime import backtest
+
+
+def ref_window_drawdown(x, window):
+    out = np.full(x.shape, np.nan)
+    for t in range(window - 1, x.shape[0]):
+        w = pd.DataFrame(x[t - window + 1:t + 1])
+        out[t] = ((w / w.cummax()) - 1).min().fillna(0).to_numpy()
+    return out
+
+
+@pytest.fixture
+def prices():
+    x = np.column_stack([make_history(t, 140)['Close'].to_numpy() for t in ('AAA', 'BBB', 'CCC', 'DDD')])
+    x[:30, 1] = np.nan          # listat mai târziu
+    x[60:64, 2] = np.nan        # goluri
+    x[:, 3] = x[0, 3] * np.r_[np.linspace(1, 2, 70), np.linspace(2, 0.5, 70)]  # vârf la mijloc
+    return x
+
+
+@pytest.mark.parametrize('window', [1, 2, 7, 20, 70, 140])
+def test_window_drawdown_matches_direct_loop(prices, window):
+    np.testing.assert_allclose(backtest._window_drawdown(prices, window), ref_window_drawdown(prices, window),
+                               rtol=0, atol=1e-12)
+
+
+def test_window_drawdown_shorter_than_window(prices):
+    assert np.isnan(backtest._window_drawdown(prices[:5], 20)).all()
+
+
+def test_window_drawdown_known_values(prices):
+    dd = backtest._window_drawdown(prices[:, 3:], 70)
+    assert dd[69, 0] == 0                                   # doar creștere
+    assert dd[-1, 0] == pytest.approx(0.5 / 2 - 1)         # de la vârf (2x) la final (0.5x)
+
+
+def test_trades_pair_each_entry_with_its_exit():
+    returns = np.array([
+        [np.nan, np.nan, np.nan],
+        [0.10, 0.01, 0.02],
+        [0.10, 0.01, -0.5],
+        [-0.20, 0.01, 0.02],
+        [0.05, 0.01, 0.02],
+        [0.05, 0.01, 0.02],
+    ])
+    signal = np.array([
+        [1, 0, 1],
+        [1, 0, 1],
+        [0, 1, 0],
+        [1, 0, 0],
+        [0, 1, 1],
+        [0, 1, 1],   # ultima zi: fără randament după ea, nu mai deschide nimic
+    ], dtype=bool)
+    trades = backtest.simulate(returns, signal, cost_bps=0)['trades']
+
+    # Ordinea e pe simbol, apoi în timp: fiecare intrare cu ieșirea ei, chiar dacă altele se suprapun
+    assert trades[['col', 'open', 'close']].values.tolist() == [
+        [0, 1, 3], [0, 4, 5],
+        [1, 3, 4], [1, 5, 6],
+        [2, 1, 3], [2, 5, 6],
+    ]
+    np.testing.assert_allclose(trades['return'], [1.1 * 1.1 - 1, 0.05, 0.01, 0.01, 1.02 * 0.5 - 1, 0.02])
+
+
+def test_trade_open_at_the_end_is_closed_on_the_last_row():
+    returns = np.array([[np.nan], [0.1], [0.1], [0.1]])
+    signal = np.array([[0], [0], [1], [1]], dtype=bool)
+    trades = backtest.simulate(returns, signal, cost_bps=0)['trades']
+    assert trades[['open', 'close']].values.tolist() == [[3, 4]]
+    assert trades['return'].iloc[0] == pytest.approx(0.1)
+
+
+def test_run_backtest_trade_dates():
+    dates = pd.bdate_range('2026-01-05', periods=6)
+    closes = pd.DataFrame({'AAA': [10, 11, 12, 11, 12, 13.0], 'BBB': [5, 5, 5, 5, 5, 5.0]}, index=dates)
+    features = backtest.build_features(closes, window=2)
+    features['score'] = np.array([[80, 0], [80, 0], [0, 0], [0, 80], [80, 0], [0, 0]], dtype=float)
+    features['sharpe'] = np.full(closes.shape, 2.0)
+    features['max_dd'] = np.zeros(closes.shape)
+
+    trades = backtest.run_backtest(features, 'prime', cost_bps=0)['trades']
+    # Intrare la închiderea zilei cu semnal, ieșire la închiderea ultimei zile deținute
+    assert trades[['Simbol', 'Intrare', 'Ieșire']].values.tolist() == [
+        ['AAA', dates[0], dates[2]], ['AAA', dates[4], dates[5]], ['BBB', dates[3], dates[4]],
+    ]
+    np.testing.assert_allclose(trades['Randament (%)'], [20.0, 100 / 12, 0.0])
@@ -0,0 +1,82 @@
+"""Formatul compact `.cols`: scriere + citire prin memory-map, fără copii, cu tipuri și fus orar păstrate."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.fixtures import make_history
+from prime import compact
+
+
+def _mapped(arr):
+    # Urcă pe lanțul de `base` până la memmap-ul fișierului (None dacă valorile au fost copiate)
+    while arr is not None and not isinstance(arr, np.memmap):
+        arr = arr.base
+    return arr
+
+
+@pytest.fixture
+def history():
+    return make_history('NVDA', 500)
+
+
+def test_round_trip_keeps_values_index_and_timezone(tmp_path, history):
+    path = str(tmp_path / 'NVDA.cols')
+    compact.write(path, history)
+    view = compact.read(path)
+
+    assert list(view.columns) == list(compact.COLUMNS)  # fără Dividends / Stock Splits
+    pd.testing.assert_index_equal(view.index, history.index)
+    assert str(view.index.tz) == 'America/New_York'
+    for col in compact.COLUMNS:
+        np.testing.assert_allclose(view[col], history[col], rtol=compact.FLOAT32_RTOL)
+
+
+def test_read_is_zero_copy_and_read_only(tmp_path, history):
+    path = str(tmp_path / 'NVDA.cols')
+    compact.write(path, history)
+    view = compact.read(path)
+
+    for col in view:
+        values = view[col].to_numpy()
+        assert _mapped(values) is not None, col
+        assert not values.flags.writeable
+    assert _mapped(view.index.asi8) is not None
+    with pytest.raises(ValueError):
+        view['Close'].to_numpy()[0] = 1.0
+
+
+def test_columns_narrow_to_float32_only_when_lossless(tmp_path, history):
+    history = history.copy()
+    history['Open'] = np.where(np.arange(len(history)) == 3, 1e39, history['Open'])  # depășește float32
+    history['High'] = history['High'] * 1e-44                                           # subnormal în float32
+    history.iloc[[5, 6], history.columns.get_loc('Close')] = np.nan
+    history.iloc[7, history.columns.get_loc('Close')] = 0.0
+    path = str(tmp_path / 'NVDA.cols')
+    compact.write(path, history)
+    view = compact.read(path)
+
+    assert view['Open'].dtype == np.float64 and view['Open'].iloc[3] == 1e39
+    assert view['High'].dtype == np.float64
+    assert view['Close'].dtype == np.float32 and view['Low'].dtype == np.float32
+    assert view['Close'].isna().sum() == 2 and view['Close'].iloc[7] == 0
+    np.testing.assert_array_equal(view['High'], history['High'])
+
+
+def test_naive_index_and_empty_history(tmp_path, history):
+    naive = history.tz_localize(None)
+    path = str(tmp_path / 'NAIVE.cols')
+    compact.write(path, naive)
+    view = compact.read(path)
+    assert view.index.tz is None
+    pd.testing.assert_index_equal(view.index, naive.index)
+
+    empty = history.iloc[:0]
+    compact.write(path, empty)
+    assert compact.read(path).empty
+
+
+def test_missing_or_foreign_file_reads_empty(tmp_path):
+    assert compact.read(str(tmp_path / 'missing.cols')).empty
+    foreign = tmp_path / 'foreign.cols'
+    foreign.write_bytes(b'not a compact file')
+    assert compact.read(str(foreign)).empty
@@ -0,0 +1,116 @@
+"""Termenul paginii din `prime.data`: sursa blocată sau căzută -> ultimele date bune, o singură cerere în zbor."""
+import threading
+import time
+
+import pytest
+
+from benchmarks.fixtures import make_history, make_info
+from prime import data, metadata, metrics, prefetch, store
+
+FULL = make_history('NVDA')
+STORED = FULL.iloc[:-5]
+
+
+@pytest.fixture
+def source(monkeypatch):
+    """Sursa de istoric/info controlată de test: blochează până la `gate`, sau ridică `error`."""
+    monkeypatch.setattr(data, '_pending', {})
+    monkeypatch.setattr(metrics, 'ENABLED', True)
+    monkeypatch.setattr(metrics, 'REGISTRY', metrics.Registry())
+    monkeypatch.setattr(prefetch, 'ENABLED', False)
+    monkeypatch.setattr(store, 'load_compact', lambda t: STORED)
+
+    class Source:
+        gate = threading.Event()
+        error = None
+        calls = []
+
+        def load(self, kind, value):
+            self.calls.append(kind)
+            self.gate.wait(5)
+            if self.error is not None:
+                raise self.error
+            return value
+
+    src = Source()
+    monkeypatch.setattr(store, 'get_history', lambda t, p, revalidate=None: src.load('history', FULL))
+    cache = metadata.MetaCache(loaders={'info': lambda t: src.load('info', make_info(t)),
+                                        'quote': lambda t: src.load('quote', 101.5)})
+    monkeypatch.setattr(metadata, 'CACHE', cache)
+    yield src
+    src.gate.set()
+
+
+def _exceeded(stage):
+    return metrics.REGISTRY.counters.get(('deadline_exceeded_total', (('stage', stage),)), 0)
+
+
+def _past():
+    return time.monotonic() - 1
+
+
+def test_history_past_deadline_serves_store_and_keeps_one_call(source):
+    assert data.load_history('NVDA', 'max', _past()) is STORED
+    assert data.load_history('nvda', 'max', _past()) is STORED
+    assert source.calls == ['history']
+    assert _exceeded('history') == 2
+    assert data.staleness('NVDA')['syncing']
+
+    # Rerun-ul următor așteaptă aceeași cerere, care între timp a terminat
+    source.gate.set()
+    assert data.load_history('NVDA', 'max') is FULL
+    assert source.calls == ['history']
+    _until_idle()
+    assert data.load_history('NVDA', 'max') is FULL
+    assert source.calls == ['history', 'history']
+
+
+def test_history_source_error_serves_store(source):
+    source.error = OSError("reset")
+    source.gate.set()
+    assert data.load_history('NVDA', 'max') is STORED
+    assert _exceeded('history') == 0
+
+
+def test_info_past_deadline_without_cache_is_empty(source):
+    assert data.load_info('NVDA', _past()) == {}
+    assert _exceeded('info') == 1
+
+    source.gate.set()
+    assert data.load_info('NVDA')['symbol'] == 'NVDA'
+
+
+def test_expired_info_is_served_without_waiting_and_revalidated(source):
+    metadata.CACHE.ttls['info'] = -1
+    metadata.CACHE.put('NVDA', 'info', make_info('NVDA'))
+
+    # Sursa e blocată, dar valoarea veche vine imediat; reîmprospătarea merge în fundal
+    start = time.monotonic()
+    assert data.load_info('NVDA')['symbol'] == 'NVDA'
+    assert time.monotonic() - start < 1 and _exceeded('info') == 0
+    end = time.monotonic() + 5
+    while source.calls != ['info']:
+        assert time.monotonic() < end
+        time.sleep(0.001)
+
+
+def test_quote_past_deadline_is_none_without_a_cached_value(source):
+    assert data.load_quote('NVDA', _past()) is None
+    source.gate.set()
+    assert data.load_quote('NVDA') == 101.5
+
+
+def test_load_stock_data_shares_one_deadline(source):
+    start = time.monotonic()
+    history, info = data.load_stock_data('NVDA', 'max', data.deadline(0.2))
+    assert history is STORED and info == {}
+    assert time.monotonic() - start < 1
+    assert sorted(source.calls) == ['history', 'info']
+
+
+def _until_idle(timeout=5):
+    # Callback-ul care scoate cererea din `_pending` rulează în thread-ul pool-ului
+    end = time.monotonic() + timeout
+    while data._pending:
+        assert time.monotonic() < end
+        time.sleep(0.001)
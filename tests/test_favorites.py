@@ -0,0 +1,71 @@
+"""Store-ul de favorite: o singură conexiune pentru toate thread-urile (rerun-urile Streamlit), scrieri atomice."""
+import threading
+
+import pytest
+
+from prime import favorites
+
+
+@pytest.fixture
+def fav(tmp_path):
+    s = favorites.FavoritesStore(str(tmp_path / 'favorites.db'), legacy_json=None)
+    yield s
+    s.close()
+
+
+def _in_threads(fn, n=8):
+    threads = [threading.Thread(target=fn, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(10)
+
+
+def test_threads_share_one_connection(fav):
+    conns, errors = set(), []
+
+    def rerun(i):
+        try:
+            fav.add(f"T{i}")
+            fav.load()
+            conns.add(id(fav._db))
+        except Exception as e:
+            errors.append(e)
+
+    _in_threads(rerun, 16)
+    assert errors == []
+    assert len(conns) == 1
+    assert sorted(fav.tickers()) == sorted(f"T{i}" for i in range(16))
+    assert fav.version() == 16
+
+
+def test_concurrent_writes_keep_positions_unique(fav):
+    _in_threads(lambda i: [fav.add(f"{i}-{j}", watchlist='Tech') for j in range(10)])
+    tickers = fav.tickers('Tech')
+    assert len(tickers) == len(set(tickers)) == 80
+
+
+def test_failed_write_rolls_back_and_releases(fav):
+    with pytest.raises(RuntimeError):
+        with fav._write() as conn:
+            conn.execute("INSERT INTO watchlists VALUES ('X', 0)")
+            raise RuntimeError
+    assert 'X' not in fav.watchlists()
+
+    # Lock-ul a fost eliberat: alt thread poate scrie
+    t = threading.Thread(target=fav.create_watchlist, args=('Y',))
+    t.start()
+    t.join(5)
+    assert 'Y' in fav.watchlists()
+
+
+def test_close_reopens_on_next_use(fav):
+    fav.add('AAPL', 'Apple Inc.')
+    fav.close()
+    assert fav._db is None
+    assert fav.load() == {'favorites': ['AAPL'], 'names': {'AAPL': 'Apple Inc.'}, 'version': 1}
+
+
+def test_default_list_cannot_be_deleted(fav):
+    with pytest.raises(ValueError):
+        fav.delete_watchlist(favorites.DEFAULT_LIST)
@@ -0,0 +1,105 @@
+"""Instantaneele fundamentalelor: valoarea la o dată (căutare binară) la margini și erorile de scriere numărate."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from prime import fundamentals, metrics
+from prime.fundamentals import FIELDS, FundamentalsStore
+
+D1, D2, D3 = '2026-03-02', '2026-03-09', '2026-03-16'
+
+
+def _info(pe, roe=0.2, **extra):
+    return {'trailingPE': pe, 'returnOnEquity': roe, 'pegRatio': 1.5, 'revenueGrowth': 0.12,
+            'freeCashflow': 1e9, 'totalCash': 5e9, 'totalDebt': 1e9, **extra}
+
+
+@pytest.fixture
+def fs(tmp_path):
+    s = FundamentalsStore(str(tmp_path / 'fund'))
+    # AAA apare de la D1, BBB (după AAA în cheia sortată) abia de la D2
+    s.snapshot({'AAA': _info(20)}, D1)
+    s.snapshot({'AAA': _info(22), 'BBB': _info(30)}, D2)
+    s.snapshot({'AAA': _info(22, roe=None), 'BBB': _info(31)}, D3)
+    return s
+
+
+def _pe(fs, day, tickers=('AAA', 'BBB')):
+    return fs.as_of(day, list(tickers))['trailingPE'].tolist()
+
+
+def test_as_of_before_first_snapshot_is_unknown(fs):
+    table = fs.as_of('2026-03-01', ['AAA', 'BBB'])
+    assert table.isna().all().all()
+    assert list(table.columns) == list(FIELDS)
+
+
+def test_as_of_on_and_between_snapshots(fs):
+    assert _pe(fs, D1) == [20, pytest.approx(np.nan, nan_ok=True)]
+    assert _pe(fs, '2026-03-05') == [20, pytest.approx(np.nan, nan_ok=True)]
+    assert _pe(fs, D2) == [22, 30]
+    assert _pe(fs, '2026-03-15') == [22, 30]
+
+
+def test_as_of_after_last_snapshot_keeps_last_values(fs):
+    assert _pe(fs, D3) == [22, 31]
+    assert _pe(fs, '2030-01-01') == [22, 31]
+
+
+def test_ticker_before_its_first_snapshot_does_not_see_its_neighbour(fs):
+    # Cheia (simbol, câmp, zi) a lui BBB vine imediat după ultimul rând al lui AAA
+    row = fs.as_of(D1, ['BBB']).iloc[0]
+    assert row.isna().all()
+
+
+def test_removed_field_reads_as_missing_from_that_day(fs):
+    roe = fs.as_of(D2, ['AAA'])['returnOnEquity'].iloc[0]
+    assert roe == 0.2
+    assert np.isnan(fs.as_of(D3, ['AAA'])['returnOnEquity'].iloc[0])
+
+
+def test_unknown_ticker_and_case(fs):
+    table = fs.as_of(D3, ['aaa', 'ZZZ'])
+    assert table.loc['AAA', 'trailingPE'] == 22
+    assert table.loc['ZZZ'].isna().all()
+
+
+def test_only_changes_are_written(fs):
+    # D1: 7 câmpuri AAA; D2: 1 schimbat la AAA + 7 noi la BBB; D3: ROE dispărut la AAA + P/E la BBB
+    assert fs.stats()['rows'] == 7 + 8 + 2
+    assert fs.snapshot({'AAA': _info(22, roe=None)}, '2026-03-17') == 0
+
+
+def test_history_matches_as_of_at_every_date(fs):
+    dates = pd.to_datetime(['2026-02-27', D1, '2026-03-05', D2, D3, '2026-12-31'])
+    hist = fs.history('trailingPE', ['AAA', 'BBB'], dates)
+    for d in dates:
+        np.testing.assert_array_equal(hist.loc[d].to_numpy(), fs.as_of(d, ['AAA', 'BBB'])['trailingPE'].to_numpy())
+
+
+def test_compact_keeps_answers(fs):
+    before = {d: fs.as_of(d, ['AAA', 'BBB']) for d in ('2026-03-01', D1, D2, D3, '2030-01-01')}
+    assert fs.compact()
+    assert fs.stats()['files'] == 1
+    for d, table in before.items():
+        pd.testing.assert_frame_equal(fs.as_of(d, ['AAA', 'BBB']), table)
+
+
+def test_points_history_is_nan_before_first_snapshot(fs):
+    pts = fs.points_history(['AAA', 'BBB'], pd.to_datetime(['2026-03-01', D1, D2]))
+    assert pts.iloc[0].isna().all()
+    assert pts.loc[pd.Timestamp(D1), 'AAA'] == 80 and np.isnan(pts.loc[pd.Timestamp(D1), 'BBB'])
+
+
+def test_failed_snapshot_is_counted_and_logged(tmp_path, monkeypatch, capsys):
+    blocker = tmp_path / 'not-a-dir'
+    blocker.write_text('')
+    monkeypatch.setattr(fundamentals, '_store', FundamentalsStore(str(blocker / 'fund')))
+    monkeypatch.setattr(metrics, 'ENABLED', True)
+    monkeypatch.setattr(metrics, 'REGISTRY', metrics.Registry())
+
+    assert fundamentals.snapshot({'AAA': _info(20)}, D1) == 0
+    assert fundamentals.snapshot({'BBB': _info(20)}, D1) == 0
+    counters = metrics.REGISTRY.counters
+    assert counters[('fundamentals_snapshot_errors_total', (('error', 'NotADirectoryError'),))] == 2
+    assert 'instantaneul nu s-a salvat' in capsys.readouterr().err
@@ -0,0 +1,114 @@
+"""Motorul vectorizat din `prime.indicators` față de implementările pandas inițiale (din AAPP.py).
+
+Referințele de mai jos sunt copiate neschimbate din versiunea dinaintea motorului; fiecare coloană
+a matricei trebuie să dea exact ce dau ele pe coloana respectivă, fără NaN-urile de la început.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.fixtures import make_history
+from prime import indicators
+
+
+def ref_rsi(data, window=14):
+    delta = data.diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
+    rs = gain / loss
+    return 100 - (100 / (1 + rs))
+
+
+def ref_risk_metrics(close):
+    daily_ret = close.pct_change().dropna()
+    volatility = daily_ret.std() * np.sqrt(252) * 100
+    max_dd = ((close / close.cummax()) - 1).min() * 100
+    mean_return = daily_ret.mean() * 252
+    std_dev = daily_ret.std() * np.sqrt(252)
+    sharpe = 0 if std_dev == 0 else (mean_return - 0.04) / std_dev
+    return volatility, max_dd, sharpe
+
+
+def ref_sma_trend(close):
+    sma = close.rolling(window=200).mean().iloc[-1] if len(close) > 200 else close.mean()
+    return sma, close.iloc[-1] > sma
+
+
+def _close(ticker, bars):
+    return make_history(ticker, bars)['Close'].rename(ticker)
+
+
+@pytest.fixture
+def closes():
+    """Trei simboluri pe aceleași date: unul complet, unul listat mai târziu, unul cu goluri."""
+    full = _close('AAA', 400)
+    late = _close('BBB', 400)
+    late.iloc[:150] = np.nan
+    gaps = _close('CCC', 400)
+    gaps.iloc[[40, 41, 42, 200, 330]] = np.nan
+    return pd.concat([full, late, gaps], axis=1)
+
+
+def _listed(col):
+    return col.loc[col.first_valid_index():]
+
+
+def test_rsi_matches_reference_per_column(closes):
+    out = indicators.rsi(closes)
+    for name in closes:
+        col = _listed(closes[name])
+        pd.testing.assert_series_equal(out[name].loc[col.index], ref_rsi(col), check_names=False, rtol=1e-9)
+        assert out[name].loc[:col.index[0]].iloc[:-1].isna().all()
+
+
+@pytest.mark.parametrize('bars', [1, 5, 14, 15])
+def test_rsi_shorter_than_window(bars):
+    close = _close('AAA', bars)
+    pd.testing.assert_series_equal(indicators.rsi(close), ref_rsi(close), rtol=1e-9)
+
+
+def test_risk_metrics_match_reference(closes):
+    table = indicators.risk_metrics(closes)
+    for name in closes:
+        expected = ref_risk_metrics(_listed(closes[name]))
+        np.testing.assert_allclose(table.loc[name, ['volatility', 'max_dd', 'sharpe']], expected, rtol=1e-9)
+
+
+@pytest.mark.parametrize('bars', [2, 3, 30])
+def test_risk_metrics_short_series(bars):
+    close = _close('AAA', bars)
+    np.testing.assert_allclose(indicators.risk_metrics(close).iloc[0], ref_risk_metrics(close), rtol=1e-9)
+
+
+def test_risk_metrics_flat_series_has_zero_sharpe():
+    close = pd.Series(10.0, index=pd.bdate_range('2025-01-01', periods=30))
+    m = indicators.risk_metrics(close).iloc[0]
+    assert m['volatility'] == 0 and m['max_dd'] == 0 and m['sharpe'] == 0
+
+
+@pytest.mark.parametrize('bars', [50, 200, 201, 400])
+def test_sma_trend_matches_reference(bars):
+    close = _close('AAA', bars)
+    close.iloc[[10, 25]] = np.nan
+    sma, above = ref_sma_trend(close)
+    trend = indicators.sma_trend(close).iloc[0]
+    np.testing.assert_allclose(trend['sma'], sma, rtol=1e-12)
+    assert trend['above'] == above
+    assert trend['full_window'] == (bars > 200)
+
+
+@pytest.mark.parametrize('window', [30, 90])
+def test_rolling_metrics_match_pandas_rolling(window):
+    close = _close('AAA', 300)
+    close.iloc[:20] = np.nan
+    listed = _listed(close)
+    ret = listed.pct_change()
+
+    vol = ret.rolling(window).std() * np.sqrt(252) * 100
+    mean, std = ret.rolling(window).mean(), ret.rolling(window).std()
+    sharpe = (mean * 252 - 0.04) / (std * np.sqrt(252))
+    dd = (listed / listed.rolling(window + 1).max() - 1) * 100
+
+    pd.testing.assert_series_equal(indicators.rolling_volatility(close, window).loc[listed.index], vol, rtol=1e-7)
+    pd.testing.assert_series_equal(indicators.rolling_sharpe(close, window).loc[listed.index], sharpe, rtol=1e-7)
+    pd.testing.assert_series_equal(indicators.rolling_drawdown(close, window).loc[listed.index], dd, rtol=1e-9)
@@ -0,0 +1,143 @@
+"""Depozitul de istoric: descărcare completă, delta lipită peste disc, reajustări (rebase), felii fără copii."""
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.fixtures import make_history
+from prime import store
+
+FULL = make_history('NVDA', 600)
+
+
+class FakeSource:
+    """`store._download` controlat de test: ce a fost cerut și ce istoric „are” sursa acum."""
+
+    def __init__(self, history):
+        self.history = history
+        self.requests = []
+
+    def __call__(self, ticker, period=None, start=None):
+        self.requests.append({'period': period} if period else {'start': start})
+        if start is not None:
+            return self.history[self.history.index >= pd.Timestamp(start, tz=self.history.index.tz)]
+        return self.history
+
+
+@pytest.fixture
+def source(tmp_path, monkeypatch):
+    monkeypatch.setattr(store, 'STORE_DIR', str(tmp_path))
+    monkeypatch.setattr(store, '_memory', type(store._memory)())
+    src = FakeSource(FULL)
+    monkeypatch.setattr(store, '_download', src)
+    return src
+
+
+def _seed(history):
+    """Scrie `history` în depozit ca sincronizat acum o oră (deci de adus la zi)."""
+    store.save_history('NVDA', history)
+    past = time.time() - 3600
+    os.utime(store._path('NVDA'), (past, past))
+
+
+def test_first_sync_downloads_max_and_writes_both_forms(source):
+    out = store.sync_history('NVDA')
+    pd.testing.assert_frame_equal(out, FULL)
+    assert source.requests == [{'period': 'max'}]
+    pd.testing.assert_frame_equal(store.load_history('NVDA'), FULL)
+    assert len(store.load_compact('NVDA')) == len(FULL)
+
+    # Sincronizat chiar acum: nu mai întrebăm sursa
+    store.sync_history('NVDA')
+    assert len(source.requests) == 1
+
+
+def test_delta_appends_only_new_bars(source):
+    _seed(FULL.iloc[:-20])
+    out = store.sync_history('NVDA')
+
+    assert source.requests == [{'start': store.delta_start(FULL.iloc[:-20])}]
+    pd.testing.assert_frame_equal(out, FULL, check_freq=False)
+    pd.testing.assert_frame_equal(store.load_history('NVDA'), FULL, check_freq=False)
+    assert store.load_compact('NVDA').index[-1] == FULL.index[-1]
+    assert store.is_fresh('NVDA')
+
+
+def test_partial_last_bar_is_replaced_without_rebase(source):
+    stored = FULL.iloc[:-5].copy()
+    stored.iloc[-1, stored.columns.get_loc('Close')] *= 1.03  # bară luată în timpul ședinței
+    _seed(stored)
+    out = store.sync_history('NVDA')
+
+    assert [r for r in source.requests if 'period' in r] == []
+    assert out.loc[stored.index[-1], 'Close'] == FULL.loc[stored.index[-1], 'Close']
+    assert len(out) == len(FULL)
+
+
+def test_adjusted_past_triggers_one_full_rebase(source):
+    _seed(FULL.iloc[:-5])
+    adjusted = FULL.copy()
+    adjusted[['Open', 'High', 'Low', 'Close']] *= 0.5  # split 2:1 aplicat retroactiv
+    source.history = adjusted
+    out = store.sync_history('NVDA')
+
+    assert source.requests[1:] == [{'period': 'max'}]
+    pd.testing.assert_frame_equal(out, adjusted)
+    np.testing.assert_allclose(store.load_compact('NVDA')['Close'], adjusted['Close'], rtol=1e-6)
+
+
+def test_new_dividend_triggers_rebase(source):
+    _seed(FULL.iloc[:-5])
+    with_dividend = FULL.copy()
+    with_dividend.iloc[-2, with_dividend.columns.get_loc('Dividends')] = 0.25
+    source.history = with_dividend
+    store.sync_history('NVDA')
+    assert source.requests[-1] == {'period': 'max'}
+
+
+def test_empty_delta_keeps_store_and_marks_it_synced(source):
+    _seed(FULL)
+    source.history = FULL.iloc[:0]
+    out = store.sync_history('NVDA')
+    pd.testing.assert_frame_equal(out, FULL, check_freq=False)
+    assert store.is_fresh('NVDA')
+
+
+def test_failed_delta_serves_stored_history(source, monkeypatch):
+    _seed(FULL.iloc[:-5])
+
+    def down(ticker, **kwargs):
+        raise OSError("reset")
+    monkeypatch.setattr(store, '_download', down)
+    assert len(store.sync_history('NVDA')) == len(FULL) - 5
+    assert not store.is_fresh('NVDA')
+
+
+def test_load_compact_sees_rewritten_file(source):
+    _seed(FULL.iloc[:-20])
+    before = store.load_compact('NVDA')
+    assert store.load_compact('NVDA') is before  # aceeași vedere mapată, din memorie
+
+    # Sincronizarea rescrie fișierul (alt mtime) -> vedere nouă peste el
+    store.sync_history('NVDA')
+    after = store.load_compact('NVDA')
+    assert after is not before and len(after) == len(FULL)
+
+
+def test_compact_is_rebuilt_from_parquet(source):
+    _seed(FULL)
+    os.remove(store._compact_path('NVDA'))
+    assert len(store.load_compact('NVDA')) == len(FULL)
+    assert os.path.exists(store._compact_path('NVDA'))
+
+
+@pytest.mark.parametrize('period', ['1mo', '1y', 'max'])
+def test_slice_period_is_a_view(source, period):
+    _seed(FULL)
+    view = store.load_compact('NVDA')
+    window = store.slice_period(view, period)
+    cutoff = FULL.index[-1] - store.PERIOD_OFFSETS.get(period, pd.DateOffset(years=100))
+    pd.testing.assert_index_equal(window.index, FULL.index[FULL.index > cutoff])
+    assert np.shares_memory(window['Close'].to_numpy(), view['Close'].to_numpy())
@@ -0,0 +1,289 @@
+"""Comasarea cererilor, limita de rată cu priorități și întrerupătorul, cu un ceas fals (fără rețea, fără sleep)."""
+import threading
+import time
+
+import pytest
+
+from prime import metrics, throttle
+
+
+class FakeClock:
+    """Înlocuiește modulul `time` din `prime.throttle`: timpul avansează doar la `advance()`."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = FakeClock()
+    monkeypatch.setattr(throttle, 'time', c)
+    return c
+
+
+@pytest.fixture
+def counters(monkeypatch):
+    monkeypatch.setattr(metrics, 'ENABLED', True)
+    monkeypatch.setattr(metrics, 'REGISTRY', metrics.Registry())
+    return lambda name, **labels: metrics.REGISTRY.counters.get((name, metrics._labels(labels)), 0)
+
+
+def _until(predicate, timeout=5):
+    # Așteaptă ca un thread să ajungă într-o stare cunoscută; ceasul fals nu avansează între timp
+    end = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < end, "thread-ul nu a ajuns în starea așteptată"
+        time.sleep(0.001)
+
+
+def _thread(fn, *args):
+    t = threading.Thread(target=fn, args=args, daemon=True)
+    t.start()
+    return t
+
+
+# --- SingleFlight ---
+
+def test_single_flight_shares_one_call(counters):
+    sf = throttle.SingleFlight()
+    gate, calls, results = threading.Event(), [], []
+    key = ('info', 'AAPL', ())
+
+    def fn():
+        calls.append(1)
+        gate.wait(5)
+        return {'symbol': 'AAPL'}
+
+    threads = [_thread(lambda: results.append(sf.do(key, fn))) for _ in range(4)]
+    _until(lambda: key in sf._flights and sf._flights[key].followers == 3)
+    gate.set()
+    for t in threads:
+        t.join(5)
+
+    assert len(calls) == 1
+    assert len(results) == 4 and all(r is results[0] for r in results)
+    assert sf.stats() == {'in_flight': 0, 'leaders': 1, 'shared': 3}
+    assert counters('upstream_coalesced_total', method='info') == 3
+
+    # Cererea s-a terminat: următorul apel pleacă din nou la sursă
+    sf.do(key, fn)
+    assert len(calls) == 2
+
+
+def test_single_flight_followers_get_the_leaders_error():
+    sf = throttle.SingleFlight()
+    gate, errors = threading.Event(), []
+    key = ('history', 'AAPL', ())
+
+    def fn():
+        gate.wait(5)
+        raise OSError("reset")
+
+    def caller():
+        try:
+            sf.do(key, fn)
+        except OSError as e:
+            errors.append(e)
+
+    threads = [_thread(caller) for _ in range(3)]
+    _until(lambda: key in sf._flights and sf._flights[key].followers == 2)
+    gate.set()
+    for t in threads:
+        t.join(5)
+
+    assert len(errors) == 3 and all(e is errors[0] for e in errors)
+    assert sf.stats()['in_flight'] == 0
+
+
+# --- RateLimiter ---
+
+def test_rate_limiter_burst_then_refill(clock):
+    lim = throttle.RateLimiter(rate=2, burst=3)
+    assert [lim.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert lim.stats()['tokens'] == 0
+
+    clock.advance(1)
+    assert lim.stats()['tokens'] == 2
+    clock.advance(10)
+    assert lim.stats()['tokens'] == 3  # plafonat la burst
+
+
+def test_rate_limiter_serves_interactive_before_batch(clock):
+    lim = throttle.RateLimiter(rate=1, burst=1)
+    lim.acquire()
+    order, waited = [], {}
+
+    def waiter(level):
+        waited[level] = lim.acquire(level)
+        order.append(level)
+
+    def wake():
+        with lim._cond:
+            lim._cond.notify_all()
+
+    # Batch intră primul la coadă, interactive după el - dar interactive primește primul jeton
+    batch = _thread(waiter, throttle.BATCH)
+    _until(lambda: len(lim._waiters) == 1)
+    interactive = _thread(waiter, throttle.INTERACTIVE)
+    _until(lambda: len(lim._waiters) == 2)
+    assert lim.stats()['queue_depth'] == 2
+
+    clock.advance(1)
+    wake()
+    interactive.join(5)
+    assert order == [throttle.INTERACTIVE]
+    assert batch.is_alive()
+
+    clock.advance(1)
+    wake()
+    batch.join(5)
+    assert order == [throttle.INTERACTIVE, throttle.BATCH]
+    assert waited == {throttle.INTERACTIVE: 1.0, throttle.BATCH: 2.0}
+    stats = lim.stats()
+    assert stats['queue_depth'] == 0 and stats['max_depth'] == 2
+    assert stats['waits']['batch'] == {'count': 1, 'mean': 2.0, 'max': 2.0}
+
+
+def test_rate_limiter_disabled_never_blocks(clock):
+    lim = throttle.RateLimiter(rate=0, burst=0)
+    assert [lim.acquire() for _ in range(100)] == [0.0] * 100
+
+
+# --- CircuitBreaker ---
+
+def test_breaker_opens_half_opens_and_closes(clock, counters):
+    b = throttle.CircuitBreaker('info', failures=3, cooldown=10)
+    b.before()
+    b.failure()
+    b.failure()
+    assert b.stats()['state'] == throttle.CLOSED
+    b.failure()
+    assert b.stats()['state'] == throttle.OPEN
+
+    with pytest.raises(throttle.CircuitOpenError) as exc:
+        b.before()
+    assert exc.value.retry_in == 10
+    clock.advance(4)
+    assert b.retry_in() == 6
+
+    # După cooldown trece o singură cerere de probă
+    clock.advance(6)
+    b.before()
+    assert b.stats()['state'] == throttle.HALF_OPEN
+    with pytest.raises(throttle.CircuitOpenError):
+        b.before()
+
+    # Proba eșuează: circuitul se redeschide imediat, pentru încă un cooldown
+    b.failure()
+    assert b.stats()['state'] == throttle.OPEN and b.retry_in() == 10
+    clock.advance(10)
+    b.before()
+    b.success()
+    assert b.stats() == {'state': throttle.CLOSED, 'errors': 0, 'retry_in': 0.0, 'trips': 2, 'rejected': 2}
+    b.before()
+    assert counters('breaker_trips_total', method='info') == 2
+    assert counters('breaker_rejections_total', method='info') == 2
+
+
+def test_breaker_release_frees_an_interrupted_probe(clock):
+    b = throttle.CircuitBreaker('news', failures=1, cooldown=5)
+    b.failure()
+    clock.advance(5)
+    b.before()
+    b.release()
+    b.before()  # o altă probă are voie să plece
+    assert b.stats()['state'] == throttle.HALF_OPEN
+
+
+def test_success_resets_consecutive_errors(clock):
+    b = throttle.CircuitBreaker('history', failures=2, cooldown=5)
+    b.failure()
+    b.success()
+    b.failure()
+    assert b.stats()['state'] == throttle.CLOSED
+
+
+@pytest.fixture
+def fresh(monkeypatch, clock):
+    # Stare proprie testului: fără limită de rată, întrerupătoare și zboruri noi
+    monkeypatch.setattr(throttle, 'LIMITER', throttle.RateLimiter(rate=0))
+    monkeypatch.setattr(throttle, 'FLIGHTS', throttle.SingleFlight())
+    monkeypatch.setattr(throttle, 'BREAKERS', {})
+    return clock
+
+
+class _HTTPError(Exception):
+    def __init__(self, status):
+        super().__init__(status)
+        self.response = type('R', (), {'status_code': status})()
+
+
+@pytest.mark.parametrize('exc, upstream', [
+    (OSError("reset"), True),
+    (TimeoutError(), True),
+    (_HTTPError(429), True),
+    (_HTTPError(503), True),
+    (_HTTPError(404), False),
+    (ValueError("no data"), False),
+])
+def test_upstream_failure(exc, upstream):
+    assert throttle.upstream_failure(exc) is upstream
+
+
+def test_call_trips_only_on_upstream_failures(fresh):
+    def fail(exc):
+        def fn():
+            raise exc
+        return fn
+
+    for _ in range(throttle.BREAKER_FAILURES + 1):
+        with pytest.raises(ValueError):
+            throttle.call('calendar', 'SPY', {}, fail(ValueError("no calendar")))
+    assert throttle.breaker('calendar').stats()['state'] == throttle.CLOSED
+
+    for _ in range(throttle.BREAKER_FAILURES):
+        with pytest.raises(OSError):
+            throttle.call('info', 'AAPL', {}, fail(OSError("reset")))
+    calls = []
+    with pytest.raises(throttle.CircuitOpenError):
+        throttle.call('info', 'MSFT', {}, lambda: calls.append(1))
+    assert calls == []
+    assert throttle.stats()['breakers']['info']['state'] == throttle.OPEN
+
+    # Circuitul e per metodă: istoricul merge în continuare
+    assert throttle.call('history', 'AAPL', {'start': '2026-01-01'}, lambda: 'bars') == 'bars'
+
+    fresh.advance(throttle.BREAKER_COOLDOWN)
+    assert throttle.call('info', 'MSFT', {}, lambda: {'symbol': 'MSFT'}) == {'symbol': 'MSFT'}
+    assert throttle.breaker('info').stats()['state'] == throttle.CLOSED
+
+
+def test_call_releases_probe_on_base_exception(fresh):
+    b = throttle.breaker('news')
+    for _ in range(throttle.BREAKER_FAILURES):
+        b.failure()
+    fresh.advance(throttle.BREAKER_COOLDOWN)
+
+    def interrupted():
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        throttle.call('news', 'AAPL', {}, interrupted)
+    assert throttle.call('news', 'AAPL', {}, lambda: []) == []
+    assert b.stats()['state'] == throttle.CLOSED
+
+
+def test_bind_carries_priority_into_worker_threads():
+    seen = []
+    with throttle.priority(throttle.BACKGROUND):
+        fn = throttle.bind(lambda: seen.append(throttle.current_priority()))
+    t = _thread(fn)
+    t.join(5)
+    assert seen == [throttle.BACKGROUND]
+    assert throttle.current_priority() == throttle.INTERACTIVE
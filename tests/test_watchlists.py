@@ -0,0 +1,57 @@
+"""Crearea și ștergerea listelor de favorite din sidebar, cu AppTest, pe date sintetice (fără rețea)."""
+import os
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.fixtures import make_history, make_info
+from prime import favorites, metadata, prefetch, store
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "AAPP.py")
+FULL = make_history('NVDA')
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setattr(store, 'get_history', lambda t, p='max', revalidate=None: store.slice_period(FULL, p))
+    monkeypatch.setattr(store, 'sync_history', lambda t: FULL)
+    monkeypatch.setattr(metadata.CACHE, 'loaders', {
+        'info': make_info, 'calendar': lambda t: None, 'insider': lambda t: None,
+        'news': lambda t: [], 'quote': lambda t: 100.0,
+    })
+    monkeypatch.setattr(prefetch, 'ENABLED', False)
+    monkeypatch.setattr(favorites, '_store', favorites.FavoritesStore(str(tmp_path / 'favorites.db'), legacy_json=None))
+
+    at = AppTest.from_file(APP, default_timeout=120)
+    at.secrets['ACCESS_PASSWORD'] = 'x'
+    at.secrets['ADMIN_PASSWORD'] = 'admin'
+    at.session_state['access_granted'] = True
+    at.run()
+    next(t for t in at.sidebar.text_input if t.label == 'Parola Editare').set_value('admin').run()
+    assert not at.exception
+    return at
+
+
+def _button(at, label):
+    return next(b for b in at.sidebar.button if label in b.label)
+
+
+def test_create_watchlist_switches_to_it(app):
+    app.sidebar.text_input(key='new_watchlist').set_value('Dividende')
+    next(b for b in app.button if 'Creează' in b.label).click().run()
+
+    assert not app.exception, [e.value for e in app.exception]
+    assert app.session_state.watchlist == 'Dividende'
+    assert 'Dividende' in favorites.get_store().watchlists()
+    assert app.sidebar.selectbox(key='watchlist').value == 'Dividende'
+
+
+def test_delete_watchlist_returns_to_default(app):
+    favorites.get_store().create_watchlist('Dividende')
+    app.run()
+    app.sidebar.selectbox(key='watchlist').set_value('Dividende').run()
+    _button(app, 'Șterge lista').click().run()
+
+    assert not app.exception, [e.value for e in app.exception]
+    assert app.session_state.watchlist == favorites.DEFAULT_LIST
+    assert 'Dividende' not in favorites.get_store().watchlists()